@@ -1,12 +1,24 @@
 import streamlit as st
 import pandas as pd
-from config.settings import PAGE_TITLE, PAGE_ICON, LAYOUT
+from config.settings import (
+    PAGE_TITLE,
+    PAGE_ICON,
+    LAYOUT,
+    DATASET_CACHE_MAX_MB,
+    TOP_K_RESULTS,
+    CONTEXT_TOKEN_BUDGET,
+    VECTORSTORE_RETENTION_DAYS,
+    ANSWER_CACHE_TTL_SECONDS,
+    CHART_CACHE_TTL_SECONDS
+)
 from components.sidebar import render_sidebar
 from components.data_preview import render_data_preview, render_example_format
 from components.analysis import render_data_analysis
 from components.rag_processor import render_rag_preparation
 from components.chatbot import render_chatbot_interface
-from utils.data_loader import load_csv
+from components.batch_questions import render_batch_questions
+from utils.data_loader import load_csv_with_report
+from utils.dataset_cache import DatasetCache, hash_uploaded_file
 
 
 def load_css(file_name):
@@ -14,6 +26,37 @@ def load_css(file_name):
         st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
 
 
+@st.cache_resource
+def get_dataset_cache() -> DatasetCache:
+    """Tüm oturumlarca paylaşılan veri seti önbelleğini döndürür."""
+    return DatasetCache(DATASET_CACHE_MAX_MB * 1024 ** 2)
+
+
+def load_dataset(uploaded_file):
+    """
+    Yüklenen CSV'yi önbellekten getirir; yoksa parse edip önbelleğe ekler.
+    
+    Aynı yükleme için içerik hash'i oturumda saklanır, böylece her
+    etkileşimde dosya yeniden okunmaz ve hash'lenmez.
+    """
+    file_id = getattr(uploaded_file, 'file_id', None)
+    cached_upload = st.session_state.get('upload_hash')
+    if file_id and cached_upload and cached_upload[0] == file_id:
+        content_hash = cached_upload[1]
+    else:
+        content_hash = hash_uploaded_file(uploaded_file)
+        st.session_state['upload_hash'] = (file_id, content_hash)
+    
+    cache = get_dataset_cache()
+    cached = cache.get(content_hash)
+    if cached is not None:
+        return cached
+    
+    df, load_report = load_csv_with_report(uploaded_file)
+    cache.put(content_hash, df, load_report)
+    return df, load_report
+
+
 def initialize_session_state():
     """Session state'i başlatır."""
     if 'chat_history' not in st.session_state:
@@ -51,7 +94,7 @@ def main():
     with col2:
         st.markdown("### 🤖")
         st.markdown("**AI Chatbot**")
-        st.caption("İlk 100 satır analiz edilir.")
+        st.caption("Kesin hesaplar tüm veriden, yorumlar ilgili satırlardan.")
     
     with col3:
         st.markdown("### 📈")
@@ -65,7 +108,7 @@ def main():
     
     # Önemli notlar - Expander
     with st.expander("⚠️ Önemli Bilgiler ve Limitasyonlar", expanded=False):
-        st.markdown("""
+        st.markdown(f"""
         #### 🎯 Bu Platform Kimin İçin?
         - **Veri bilimciler** ve **analistler** için
         - Elinde **CSV formatında veri seti** olan herkes
@@ -75,9 +118,10 @@ def main():
         
         #### 🤖 Chatbot Hakkında
         Bu proje **deploy edilmiş** ve **ücretsiz** olduğu için:
-        - **Token limiti** nedeniyle chatbot sadece **ilk 100 satırı** analiz eder
-        - Tüm veri setinizi işlemek için **Token limitini** kendiniz ayarlayabilirsiniz.
-        - Daha fazla satır için chatbot yanıtları **tam kesin olmayabilir**
+        - Filtre, sayım, ortalama gibi **kesin hesaplar** sorgu motoruyla **tüm veri setinden** yapılır
+        - Diğer sorularda tüm veri seti indekslenir; soruyla **en ilgili {TOP_K_RESULTS} satır**
+          (anlamsal + kelime araması) **{CONTEXT_TOKEN_BUDGET:,} token** bütçesine sığacak kadar AI'a gönderilir
+        - Bu örneklerden üretilen yorumlar **tam kesin olmayabilir**; limitleri `config/settings.py` içinden ayarlayabilirsiniz
         - **Genel sorular** ve **veri seti hakkında yorumlar** için idealdir
         
         💡 **Örnek kullanım:**  
@@ -101,9 +145,13 @@ def main():
         ---
         
         #### 🔒 Veri Güvenliği
-        - Yüklediğiniz dosyalar **sadece oturum süresince** saklanır
-        - Oturum kapandığında veriler **otomatik silinir**
-        - Sunucuda **kalıcı depolama yapılmaz**
+        - Yüklediğiniz CSV dosyası ve tablo **sadece bellekte** tutulur, diske yazılmaz
+        - Chatbot için hazırlanan indeks sunucuda diskte saklanır (`VECTORSTORE_PERSIST`):
+          **satır metinleri** (vector store dökümanları ve filtre sütunları) ve BM25 kelime indeksi.
+          **{VECTORSTORE_RETENTION_DAYS} gün** güncellenmeyen indeksler bir sonraki indekslemede silinir
+        - Chatbot cevapları, **kaynak satırlarıyla** birlikte **{ANSWER_CACHE_TTL_SECONDS // 3600} saat** saklanır
+        - AI grafik yorumları **{CHART_CACHE_TTL_SECONDS // 86400} gün** saklanır
+        - Embedding önbelleğinde satır metni değil, sadece metin özeti (hash) ve vektörü tutulur
         
         ---
         
@@ -120,19 +168,22 @@ def main():
     # Ana içerik
     if uploaded_file is not None:
         # CSV'yi yükle
-        df = load_csv(uploaded_file)
+        df, load_report = load_dataset(uploaded_file)
         
         # Veri önizleme
-        render_data_preview(df)
+        render_data_preview(df, load_report)
         
         # Veri analizi
         render_data_analysis(df)
         
         # RAG sistemi hazırlığı
-        render_rag_preparation(df)
+        render_rag_preparation(df, dataset_name=uploaded_file.name)
         
         # Chatbot arayüzü
         render_chatbot_interface()
+        
+        # Toplu soru modu
+        render_batch_questions()
     
     else:
         
@@ -1,14 +1,24 @@
 """
 Veri analizi bileşenleri
 """
+import time
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-import os
-from dotenv import load_dotenv
-from openai import OpenAI
-from utils.data_loader import get_column_types, calculate_outliers
+from utils.llm_client import LLMProvider, get_api_key, get_llm_provider, complete_as_completed
+from utils.response_cache import ResponseCache, request_fingerprint
+from config.settings import (
+    ANALYSIS_LLM_MODEL,
+    ANALYSIS_LLM_CONCURRENCY,
+    CHART_CACHE_ENABLED,
+    CHART_CACHE_MAX_ENTRIES,
+    CHART_CACHE_DIR,
+    CHART_CACHE_MAX_DISK_ENTRIES,
+    CHART_CACHE_TTL_SECONDS
+)
+from utils.data_loader import get_column_types
+from utils.analysis_cache import get_analysis_cache
 import numpy as np
 
 def render_statistical_summary(df: pd.DataFrame, numeric_cols: list, categorical_cols: list):
@@ -21,11 +31,12 @@ def render_statistical_summary(df: pd.DataFrame, numeric_cols: list, categorical
         categorical_cols: Kategorik sütunlar
     """
     st.subheader("📊 İstatistiksel Özet")
+    analysis_cache = get_analysis_cache(df)
     
     # Sayısal sütunları belirleyelim.
     if len(numeric_cols) > 0:
         st.write("### 🔢 Sayısal Sütunlar")
-        st.dataframe(df[numeric_cols].describe().T, use_container_width=True)
+        st.dataframe(analysis_cache.describe(numeric_cols), use_container_width=True)
         
         selected_col = st.selectbox(
             "Detaylı analiz için bir sütun seçin:",
@@ -34,25 +45,26 @@ def render_statistical_summary(df: pd.DataFrame, numeric_cols: list, categorical
         )
         
         if selected_col:
+            col_stats = analysis_cache.column_stats(selected_col)
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                st.metric("Ortalama", f"{df[selected_col].mean():.2f}")
+                st.metric("Ortalama", f"{col_stats['mean']:.2f}")
             with col2:
-                st.metric("Medyan", f"{df[selected_col].median():.2f}")
+                st.metric("Medyan", f"{col_stats['median']:.2f}")
             with col3:
-                st.metric("Std Sapma", f"{df[selected_col].std():.2f}")
+                st.metric("Std Sapma", f"{col_stats['std']:.2f}")
             with col4:
-                st.metric("Aralık", f"{df[selected_col].max() - df[selected_col].min():.2f}")
+                st.metric("Aralık", f"{col_stats['max'] - col_stats['min']:.2f}")
             
-            q1 = df[selected_col].quantile(0.25)
-            q2 = df[selected_col].quantile(0.50)
-            q3 = df[selected_col].quantile(0.75)
+            q1 = col_stats['q1']
+            q2 = col_stats['median']
+            q3 = col_stats['q3']
             
             st.write("**Çeyreklik Değerler:**")
             st.write(f"Q1 (25%): {q1:.2f} | Q2 (50%): {q2:.2f} | Q3 (75%): {q3:.2f}")
             
-            outliers, lower_bound, upper_bound = calculate_outliers(df, selected_col)
+            outliers = analysis_cache.outliers(selected_col)
             
             if len(outliers) > 0:
                 st.warning(f"⚠️ **{len(outliers)} aykırı değer tespit edildi!**")
@@ -74,7 +86,7 @@ def render_statistical_summary(df: pd.DataFrame, numeric_cols: list, categorical
         )
         
         if selected_cat:
-            value_counts = df[selected_cat].value_counts()
+            value_counts = analysis_cache.value_counts(selected_cat)
             
             col1, col2 = st.columns(2)
             
@@ -86,11 +98,75 @@ def render_statistical_summary(df: pd.DataFrame, numeric_cols: list, categorical
             
             with col2:
                 st.write("**İstatistikler:**")
-                st.metric("Benzersiz Değer", df[selected_cat].nunique())
+                st.metric("Benzersiz Değer", len(value_counts))
                 st.metric("En Sık Değer", value_counts.index[0])
                 st.metric("Frekans", f"{value_counts.iloc[0]:,}")
 
 
+def build_feature_importance_request(numeric_cols: list, corr_df: pd.DataFrame, corr_matrix: pd.DataFrame) -> dict:
+    """
+    Feature importance (korelasyon) yorumu için LLM isteğini oluşturur.
+    
+    Args:
+        numeric_cols: Sayısal sütunlar
+        corr_df: Mutlak değere göre sıralı korelasyon çiftleri
+        corr_matrix: Korelasyon matrisi
+        
+    Returns:
+        dict: model, messages, temperature, max_tokens
+    """
+    # En güçlü korelasyonları özet olarak hazırla
+    top_corr_summary = "\n".join([
+        f"- {row['Değişken 1']} ↔ {row['Değişken 2']}: {row['Korelasyon']:.3f}"
+        for _, row in corr_df.head(10).iterrows()
+    ])
+    
+    # Ortalama korelasyonları hesapla (her değişkenin genel önemi)
+    avg_corr = corr_matrix.abs().mean().sort_values(ascending=False)
+    importance_summary = "\n".join([
+        f"- {col}: Ortalama korelasyon = {val:.3f}"
+        for col, val in avg_corr.items()
+    ])
+    
+    prompt = f"""
+Sen bir veri bilimcisisin. Aşağıdaki korelasyon analizini değerlendir:
+
+**VERİ SETİ:**
+- Değişkenler: {', '.join(numeric_cols)}
+- Toplam {len(numeric_cols)} sayısal değişken
+
+**EN GÜÇLÜ KORELASYONLAR (İlk 10):**
+{top_corr_summary}
+
+**DEĞİŞKEN ÖNEMLİLİK SIRALAMAS (Ortalama Mutlak Korelasyon):**
+{importance_summary}
+
+**GÖREV:**
+1. **En önemli 3 değişkeni** belirle ve neden önemli olduklarını
+2. **Dikkat edilmesi gereken güçlü ilişkileri** (pozitif/negatif) belirt 
+3. **Multicollinearity (çoklu bağlantı)** riski var mı? Hangi değişkenler arasında?
+4. **Feature selection** için öneriler ver (hangi değişkenler çıkarılabilir?)
+5. **İş/bilim açısından** bu korelasyonlar ne anlama geliyor?
+
+Yanıtını Türkçe, madde madde ve net bir şekilde ver.
+"""
+    return {
+        'model': ANALYSIS_LLM_MODEL,
+        'messages': [
+            {
+                "role": "system",
+                "content": "Sen profesyonel bir veri bilimcisisin. Feature importance ve korelasyon analizi konusunda uzmansın."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        'temperature': 0.7,
+        'max_tokens': 1200
+    }
+
+
 def render_correlation_analysis(df: pd.DataFrame, numeric_cols: list):
     """
     Gelişmiş korelasyon analizi tabını render eder.
@@ -133,7 +209,8 @@ def render_correlation_analysis(df: pd.DataFrame, numeric_cols: list):
         # ═══════════════════════════════════════
         # KORELASYON MATRİSİ HESAPLAMA
         # ═══════════════════════════════════════
-        corr_matrix = df[numeric_cols].corr()
+        analysis_cache = get_analysis_cache(df)
+        corr_matrix = analysis_cache.correlation(numeric_cols)
         
         # ═══════════════════════════════════════
         # DİNAMİK BOYUT HESAPLAMA
@@ -213,19 +290,8 @@ def render_correlation_analysis(df: pd.DataFrame, numeric_cols: list):
         st.divider()
         st.write("### 🔍 En Güçlü Korelasyonlar")
         
-        # Korelasyon çiftlerini oluştur
-        corr_pairs = []
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i+1, len(corr_matrix.columns)):
-                corr_pairs.append({
-                    'Değişken 1': corr_matrix.columns[i],
-                    'Değişken 2': corr_matrix.columns[j],
-                    'Korelasyon': corr_matrix.iloc[i, j]
-                })
-        
-        corr_df = pd.DataFrame(corr_pairs)
-        corr_df['Mutlak'] = corr_df['Korelasyon'].abs()
-        corr_df = corr_df.sort_values('Mutlak', ascending=False)
+        # Korelasyon çiftleri (mutlak değere göre sıralı)
+        corr_df = analysis_cache.correlation_pairs(numeric_cols)
         
         # En güçlü 5 korelasyon
         for idx, row in corr_df.head(5).iterrows():
@@ -280,70 +346,16 @@ def render_correlation_analysis(df: pd.DataFrame, numeric_cols: list):
         if st.button("🧠 Feature Importance Analizi Yap", type="primary", key="feat_importance"):
             with st.spinner("🔍 Korelasyon matrisi analiz ediliyor..."):
                 
-                load_dotenv()
-                api_key = os.getenv("OPENAI_API_KEY")
+                llm = get_llm_provider(get_api_key())
                 
-                if not api_key or api_key == "your_api_key_here":
+                if llm is None:
                     st.error("⚠️ OpenAI API key bulunamadı!")
                 else:
                     try:
-                        
-                        client = OpenAI(api_key=api_key)
-                        
-                        # En güçlü korelasyonları özet olarak hazırla
-                        top_corr_summary = "\n".join([
-                            f"- {row['Değişken 1']} ↔ {row['Değişken 2']}: {row['Korelasyon']:.3f}"
-                            for _, row in corr_df.head(10).iterrows()
-                        ])
-                        
-                        # Ortalama korelasyonları hesapla (her değişkenin genel önemi)
-                        avg_corr = corr_matrix.abs().mean().sort_values(ascending=False)
-                        importance_summary = "\n".join([
-                            f"- {col}: Ortalama korelasyon = {val:.3f}"
-                            for col, val in avg_corr.items()
-                        ])
-                        
-                        prompt = f"""
-Sen bir veri bilimcisisin. Aşağıdaki korelasyon analizini değerlendir:
-
-**VERİ SETİ:**
-- Değişkenler: {', '.join(numeric_cols)}
-- Toplam {len(numeric_cols)} sayısal değişken
-
-**EN GÜÇLÜ KORELASYONLAR (İlk 10):**
-{top_corr_summary}
-
-**DEĞİŞKEN ÖNEMLİLİK SIRALAMAS (Ortalama Mutlak Korelasyon):**
-{importance_summary}
-
-**GÖREV:**
-1. **En önemli 3 değişkeni** belirle ve neden önemli olduklarını
-2. **Dikkat edilmesi gereken güçlü ilişkileri** (pozitif/negatif) belirt 
-3. **Multicollinearity (çoklu bağlantı)** riski var mı? Hangi değişkenler arasında?
-4. **Feature selection** için öneriler ver (hangi değişkenler çıkarılabilir?)
-5. **İş/bilim açısından** bu korelasyonlar ne anlama geliyor?
-
-Yanıtını Türkçe, madde madde ve net bir şekilde ver.
-"""
-                        
-                        response = client.chat.completions.create(
-                            model="gpt-3.5-turbo",
-                            messages=[
-                                {
-                                    "role": "system",
-                                    "content": "Sen profesyonel bir veri bilimcisisin. Feature importance ve korelasyon analizi konusunda uzmansın."
-                                },
-                                {
-                                    "role": "user",
-                                    "content": prompt
-                                }
-                            ],
-                            temperature=0.7,
-                            max_tokens=1200
+                        analysis = llm.complete(
+                            **build_feature_importance_request(numeric_cols, corr_df, corr_matrix)
                         )
                         
-                        analysis = response.choices[0].message.content
-                        
                         st.success("✅ Analiz tamamlandı!")
                         st.markdown(analysis)
                         
@@ -517,28 +529,20 @@ def render_visualizations(df: pd.DataFrame, numeric_cols: list, categorical_cols
 # AI ANALİZ FONKSİYONU - MERKEZI
 # ═══════════════════════════════════════════════════════
 
-def analyze_chart_with_ai(chart_type: str, column: str, data_summary: str, extra_info: str = ""):
+def build_chart_request(chart_type: str, column: str, data_summary: str, extra_info: str = "") -> dict:
     """
-    Herhangi bir grafik için AI analizi yapar.
+    Grafik yorumu için LLM isteğini (llm.complete parametreleri) oluşturur.
     
     Args:
         chart_type: Grafik türü (Histogram, Box Plot, vb.)
         column: Ana sütun adı
         data_summary: Veri özeti
         extra_info: Ekstra bilgi
-    """
-    with st.spinner("🤔 Grafik analiz ediliyor..."):
-        load_dotenv()
-        api_key = os.getenv("OPENAI_API_KEY")
         
-        if not api_key or api_key == "your_api_key_here":
-            st.error("⚠️ OpenAI API key bulunamadı!")
-            return
-        
-        try:
-            client = OpenAI(api_key=api_key)
-            
-            prompt = f"""
+    Returns:
+        dict: model, messages, temperature, max_tokens
+    """
+    prompt = f"""
 Sen bir veri analisti asistanısın. Kullanıcıya {chart_type} grafiğini kısa ve öz açıkla.
 
 **GRAFİK TİPİ:** {chart_type}
@@ -559,32 +563,216 @@ Sadece şu formatı kullan:
 
 SADECE bu formatı kullan. Ekstra açıklama yapma.
 """
+    return {
+        'model': ANALYSIS_LLM_MODEL,
+        'messages': [
+            {
+                "role": "system",
+                "content": "Sen kısa, öz ve net açıklamalar yapan bir veri analistisin. Tam olarak istenen formatı kullanırsın."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        'temperature': 0.7,
+        'max_tokens': 250
+    }
+
+
+@st.cache_resource
+def get_chart_cache() -> ResponseCache:
+    """Tüm oturumların paylaştığı grafik yorumu önbelleğini açar (cache'lenir)."""
+    return ResponseCache(
+        CHART_CACHE_MAX_ENTRIES, CHART_CACHE_DIR, CHART_CACHE_MAX_DISK_ENTRIES, CHART_CACHE_TTL_SECONDS
+    )
+
+
+def chart_cache_key(llm: LLMProvider, chart_type: str, column: str, request: dict) -> str:
+    """Grafik türü, sütun ve istek özetinden (veri özeti + model ayarları) önbellek anahtarı."""
+    return f"{chart_type}\x1f{column}\x1f{request_fingerprint(request, llm.name)}"
+
+
+def analyze_chart_with_ai(chart_type: str, column: str, data_summary: str, extra_info: str = ""):
+    """
+    Herhangi bir grafik için AI analizi yapar.
+    
+    Aynı grafik ve veri özeti için daha önce alınmış yorum önbellekten
+    gösterilir; LLM çağrısı yapılmaz.
+    
+    Args:
+        chart_type: Grafik türü (Histogram, Box Plot, vb.)
+        column: Ana sütun adı
+        data_summary: Veri özeti
+        extra_info: Ekstra bilgi
+    """
+    with st.spinner("🤔 Grafik analiz ediliyor..."):
+        llm = get_llm_provider(get_api_key())
+        
+        if llm is None:
+            st.error("⚠️ OpenAI API key bulunamadı!")
+            return
+        
+        try:
+            request = build_chart_request(chart_type, column, data_summary, extra_info)
+            cache_key = chart_cache_key(llm, chart_type, column, request)
+            analysis = get_chart_cache().get(cache_key) if CHART_CACHE_ENABLED else None
+            from_cache = analysis is not None
             
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Sen kısa, öz ve net açıklamalar yapan bir veri analistisin. Tam olarak istenen formatı kullanırsın."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=250
-            )
-            
-            analysis = response.choices[0].message.content
+            if not from_cache:
+                analysis = llm.complete(**request)
+                if CHART_CACHE_ENABLED:
+                    get_chart_cache().put(cache_key, analysis)
             
-            st.success("✅ Analiz tamamlandı!")
+            st.success("✅ Analiz tamamlandı!" + (" (önbellekten)" if from_cache else ""))
             st.markdown(analysis)
             
         except Exception as e:
             st.error(f"❌ Analiz hatası: {str(e)}")
 
 
+# ═══════════════════════════════════════════════════════
+# VERİ ÖZETLERİ - AI ANALİZİNE GÖNDERİLEN METİNLER
+# ═══════════════════════════════════════════════════════
+
+def histogram_summary(df: pd.DataFrame, column: str, bins: int) -> str:
+    """Histogram için veri özeti."""
+    col_stats = get_analysis_cache(df).column_stats(column)
+    return f"""
+- Ortalama: {col_stats['mean']:.2f}
+- Medyan: {col_stats['median']:.2f}
+- Standart Sapma: {col_stats['std']:.2f}
+- Min: {col_stats['min']:.2f}
+- Max: {col_stats['max']:.2f}
+- Bin sayısı: {bins}
+"""
+
+
+def boxplot_summary(df: pd.DataFrame, column: str) -> str:
+    """Box plot için veri özeti."""
+    analysis_cache = get_analysis_cache(df)
+    col_stats = analysis_cache.column_stats(column)
+    q1, q2, q3 = col_stats['q1'], col_stats['median'], col_stats['q3']
+    iqr = q3 - q1
+    outliers = analysis_cache.outliers(column)
+    return f"""
+- Medyan (Q2): {q2:.2f}
+- Q1 (25%): {q1:.2f}
+- Q3 (75%): {q3:.2f}
+- IQR: {iqr:.2f}
+- Aykırı değer sayısı: {len(outliers)}
+- Aykırı değer oranı: %{len(outliers)/len(df)*100:.1f}
+"""
+
+
+def violinplot_summary(df: pd.DataFrame, column: str) -> str:
+    """Violin plot için veri özeti."""
+    return f"""
+- Ortalama: {df[column].mean():.2f}
+- Medyan: {df[column].median():.2f}
+- Skewness (çarpıklık): {df[column].skew():.2f}
+- Veri sayısı: {len(df[column].dropna())}
+"""
+
+
+def kdeplot_summary(df: pd.DataFrame, column: str) -> str:
+    """KDE plot için veri özeti."""
+    mode = df[column].mode()
+    return f"""
+- Ortalama: {df[column].mean():.2f}
+- Medyan: {df[column].median():.2f}
+- Mod (en sık değer): {mode.values[0] if len(mode) > 0 else 'N/A'}
+- Dağılım tipi: Smooth density curve
+"""
+
+
+def scatterplot_summary(df: pd.DataFrame, x_col: str, y_col: str) -> str:
+    """Scatter plot için veri özeti."""
+    correlation = df[[x_col, y_col]].corr().iloc[0, 1]
+    return f"""
+- X değişkeni ({x_col}): Ort={df[x_col].mean():.2f}
+- Y değişkeni ({y_col}): Ort={df[y_col].mean():.2f}
+- Korelasyon: {correlation:.3f}
+- İlişki yönü: {'Pozitif' if correlation > 0 else 'Negatif'}
+- İlişki gücü: {'Güçlü' if abs(correlation) > 0.7 else 'Orta' if abs(correlation) > 0.3 else 'Zayıf'}
+"""
+
+
+def pairplot_summary(df: pd.DataFrame, columns: list) -> str:
+    """Pair plot için veri özeti."""
+    corr_matrix = df[columns].corr()
+    max_corr = corr_matrix.abs().unstack().sort_values(ascending=False).drop_duplicates()
+    max_corr = max_corr[max_corr < 1.0].head(1)
+    return f"""
+- Analiz edilen değişkenler: {', '.join(columns)}
+- Toplam grafik sayısı: {len(columns) * len(columns)}
+- En güçlü korelasyon: {max_corr.values[0]:.3f} ({max_corr.index[0][0]} vs {max_corr.index[0][1]})
+"""
+
+
+def countplot_summary(df: pd.DataFrame, column: str, max_categories: int) -> str:
+    """Count plot için veri özeti."""
+    all_counts = get_analysis_cache(df).value_counts(column)
+    value_counts = all_counts.head(max_categories)
+    top_category = value_counts.index[0]
+    top_count = value_counts.iloc[0]
+    total = value_counts.sum()
+    return f"""
+- Toplam benzersiz kategori: {len(all_counts)}
+- En sık kategori: {top_category} ({top_count} kez, %{top_count/total*100:.1f})
+- Gösterilen kategori sayısı: {len(value_counts)}
+- Dağılım: {', '.join([f"{k}={v}" for k, v in value_counts.head(3).items()])}
+"""
+
+
+def group_means(df: pd.DataFrame, cat_col: str, num_col: str) -> pd.Series:
+    """Kategoriye göre en yüksek 10 ortalama."""
+    return df.groupby(cat_col, observed=True)[num_col].mean().sort_values(ascending=False).head(10)
+
+
+def grouped_bar_summary(df: pd.DataFrame, cat_col: str, num_col: str) -> str:
+    """Grouped bar chart için veri özeti."""
+    grouped = group_means(df, cat_col, num_col)
+    highest_cat, highest_val = grouped.index[0], grouped.iloc[0]
+    lowest_cat, lowest_val = grouped.index[-1], grouped.iloc[-1]
+    return f"""
+- Kategorik değişken: {cat_col}
+- Sayısal değişken: {num_col} (ortalama)
+- En yüksek: {highest_cat} = {highest_val:.2f}
+- En düşük: {lowest_cat} = {lowest_val:.2f}
+- Fark: {highest_val - lowest_val:.2f}
+"""
+
+
+def piechart_summary(df: pd.DataFrame, column: str, max_slices: int) -> str:
+    """Pie chart için veri özeti."""
+    value_counts = get_analysis_cache(df).value_counts(column).head(max_slices)
+    percentages = (value_counts / value_counts.sum() * 100).round(1)
+    return f"""
+- Kategori: {column}
+- Toplam dilim: {len(value_counts)}
+- Dominant kategori: {percentages.index[0]} (%{percentages.iloc[0]})
+- Dağılım: {', '.join([f"{k}={v}%" for k, v in percentages.head(3).items()])}
+"""
+
+
+def pivot_means(df: pd.DataFrame, cat1: str, cat2: str, num: str) -> pd.DataFrame:
+    """İki kategoriye göre ortalama pivot tablosu (görsellik için ilk 10x10)."""
+    pivot = df.pivot_table(values=num, index=cat1, columns=cat2, aggfunc='mean', observed=True)
+    return pivot.iloc[:10, :10]
+
+
+def heatmap_summary(pivot: pd.DataFrame, cat1: str, cat2: str, num: str) -> str:
+    """Pivot heatmap için veri özeti."""
+    max_idx = pivot.stack().idxmax()
+    return f"""
+- Satır: {cat1}, Sütun: {cat2}, Değer: {num}
+- En yüksek değer: {pivot.max().max():.2f} ({max_idx[0]} - {max_idx[1]})
+- En düşük değer: {pivot.min().min():.2f}
+- Ortalama: {pivot.mean().mean():.2f}
+"""
+
+
 # ═══════════════════════════════════════════════════════
 # YARDIMCI FONKSİYONLAR - HER GRAFİK TİPİ İÇİN
 # ═══════════════════════════════════════════════════════
@@ -607,15 +795,7 @@ def render_histogram(df: pd.DataFrame, numeric_cols: list):
     # AI ANALİZ BUTONU
     st.divider()
     if st.button("🤖 AI ile Bu Grafiği Analiz Et", key=f"ai_hist_{selected_col}"):
-        data_summary = f"""
-- Ortalama: {df[selected_col].mean():.2f}
-- Medyan: {df[selected_col].median():.2f}
-- Standart Sapma: {df[selected_col].std():.2f}
-- Min: {df[selected_col].min():.2f}
-- Max: {df[selected_col].max():.2f}
-- Bin sayısı: {bins}
-"""
-        analyze_chart_with_ai("Histogram", selected_col, data_summary)
+        analyze_chart_with_ai("Histogram", selected_col, histogram_summary(df, selected_col, bins))
 
 
 def render_boxplot(df: pd.DataFrame, numeric_cols: list):
@@ -635,19 +815,7 @@ def render_boxplot(df: pd.DataFrame, numeric_cols: list):
     # AI ANALİZ BUTONU
     st.divider()
     if st.button("🤖 AI ile Bu Grafiği Analiz Et", key=f"ai_box_{selected_col}"):
-        q1, q2, q3 = df[selected_col].quantile([0.25, 0.5, 0.75])
-        iqr = q3 - q1
-        outliers = df[(df[selected_col] < q1-1.5*iqr) | (df[selected_col] > q3+1.5*iqr)]
-        
-        data_summary = f"""
-- Medyan (Q2): {q2:.2f}
-- Q1 (25%): {q1:.2f}
-- Q3 (75%): {q3:.2f}
-- IQR: {iqr:.2f}
-- Aykırı değer sayısı: {len(outliers)}
-- Aykırı değer oranı: %{len(outliers)/len(df)*100:.1f}
-"""
-        analyze_chart_with_ai("Box Plot", selected_col, data_summary)
+        analyze_chart_with_ai("Box Plot", selected_col, boxplot_summary(df, selected_col))
 
 
 def render_violinplot(df: pd.DataFrame, numeric_cols: list):
@@ -666,13 +834,7 @@ def render_violinplot(df: pd.DataFrame, numeric_cols: list):
     # AI ANALİZ BUTONU
     st.divider()
     if st.button("🤖 AI ile Bu Grafiği Analiz Et", key=f"ai_violin_{selected_col}"):
-        data_summary = f"""
-- Ortalama: {df[selected_col].mean():.2f}
-- Medyan: {df[selected_col].median():.2f}
-- Skewness (çarpıklık): {df[selected_col].skew():.2f}
-- Veri sayısı: {len(df[selected_col].dropna())}
-"""
-        analyze_chart_with_ai("Violin Plot", selected_col, data_summary)
+        analyze_chart_with_ai("Violin Plot", selected_col, violinplot_summary(df, selected_col))
 
 
 def render_kdeplot(df: pd.DataFrame, numeric_cols: list):
@@ -692,13 +854,7 @@ def render_kdeplot(df: pd.DataFrame, numeric_cols: list):
     # AI ANALİZ BUTONU
     st.divider()
     if st.button("🤖 AI ile Bu Grafiği Analiz Et", key=f"ai_kde_{selected_col}"):
-        data_summary = f"""
-- Ortalama: {df[selected_col].mean():.2f}
-- Medyan: {df[selected_col].median():.2f}
-- Mod (en sık değer): {df[selected_col].mode().values[0] if len(df[selected_col].mode()) > 0 else 'N/A'}
-- Dağılım tipi: Smooth density curve
-"""
-        analyze_chart_with_ai("KDE Plot", selected_col, data_summary)
+        analyze_chart_with_ai("KDE Plot", selected_col, kdeplot_summary(df, selected_col))
 
 
 def render_scatterplot(df: pd.DataFrame, numeric_cols: list):
@@ -722,15 +878,7 @@ def render_scatterplot(df: pd.DataFrame, numeric_cols: list):
     # AI ANALİZ BUTONU
     st.divider()
     if st.button("🤖 AI ile Bu Grafiği Analiz Et", key=f"ai_scatter_{x_col}_{y_col}"):
-        correlation = df[[x_col, y_col]].corr().iloc[0, 1]
-        data_summary = f"""
-- X değişkeni ({x_col}): Ort={df[x_col].mean():.2f}
-- Y değişkeni ({y_col}): Ort={df[y_col].mean():.2f}
-- Korelasyon: {correlation:.3f}
-- İlişki yönü: {'Pozitif' if correlation > 0 else 'Negatif'}
-- İlişki gücü: {'Güçlü' if abs(correlation) > 0.7 else 'Orta' if abs(correlation) > 0.3 else 'Zayıf'}
-"""
-        analyze_chart_with_ai("Scatter Plot", f"{x_col} vs {y_col}", data_summary)
+        analyze_chart_with_ai("Scatter Plot", f"{x_col} vs {y_col}", scatterplot_summary(df, x_col, y_col))
 
 
 def render_pairplot(df: pd.DataFrame, numeric_cols: list):
@@ -748,16 +896,7 @@ def render_pairplot(df: pd.DataFrame, numeric_cols: list):
     # AI ANALİZ BUTONU
     st.divider()
     if st.button("🤖 AI ile Bu Grafiği Analiz Et", key="ai_pairplot"):
-        corr_matrix = df[cols_to_plot].corr()
-        max_corr = corr_matrix.abs().unstack().sort_values(ascending=False).drop_duplicates()
-        max_corr = max_corr[max_corr < 1.0].head(1)
-        
-        data_summary = f"""
-- Analiz edilen değişkenler: {', '.join(cols_to_plot)}
-- Toplam grafik sayısı: {len(cols_to_plot) * len(cols_to_plot)}
-- En güçlü korelasyon: {max_corr.values[0]:.3f} ({max_corr.index[0][0]} vs {max_corr.index[0][1]})
-"""
-        analyze_chart_with_ai("Pair Plot (Scatter Matrix)", "Tüm değişkenler", data_summary)
+        analyze_chart_with_ai("Pair Plot (Scatter Matrix)", "Tüm değişkenler", pairplot_summary(df, cols_to_plot))
 
 
 def render_countplot(df: pd.DataFrame, categorical_cols: list):
@@ -765,7 +904,7 @@ def render_countplot(df: pd.DataFrame, categorical_cols: list):
     selected_cat = st.selectbox("Kategorik sütun:", categorical_cols, key="count_cat")
     max_categories = st.slider("Maksimum kategori sayısı:", 5, 20, 10, key="count_max")
     
-    value_counts = df[selected_cat].value_counts().head(max_categories)
+    value_counts = get_analysis_cache(df).value_counts(selected_cat).head(max_categories)
     
     fig, ax = plt.subplots(figsize=(10, 6))
     value_counts.plot(kind='bar', ax=ax, color='steelblue', edgecolor='black')
@@ -786,17 +925,7 @@ def render_countplot(df: pd.DataFrame, categorical_cols: list):
     # AI ANALİZ BUTONU
     st.divider()
     if st.button("🤖 AI ile Bu Grafiği Analiz Et", key=f"ai_count_{selected_cat}"):
-        top_category = value_counts.index[0]
-        top_count = value_counts.iloc[0]
-        total = value_counts.sum()
-        
-        data_summary = f"""
-- Toplam benzersiz kategori: {df[selected_cat].nunique()}
-- En sık kategori: {top_category} ({top_count} kez, %{top_count/total*100:.1f})
-- Gösterilen kategori sayısı: {len(value_counts)}
-- Dağılım: {', '.join([f"{k}={v}" for k, v in value_counts.head(3).items()])}
-"""
-        analyze_chart_with_ai("Count Plot (Bar Chart)", selected_cat, data_summary)
+        analyze_chart_with_ai("Count Plot (Bar Chart)", selected_cat, countplot_summary(df, selected_cat, max_categories))
 
 
 def render_grouped_bar(df: pd.DataFrame, categorical_cols: list, numeric_cols: list):
@@ -808,7 +937,7 @@ def render_grouped_bar(df: pd.DataFrame, categorical_cols: list, numeric_cols: l
         num_col = st.selectbox("Sayısal sütun (ortalama):", numeric_cols, key="group_num")
     
     # Kategoriye göre ortalama hesapla
-    grouped = df.groupby(cat_col)[num_col].mean().sort_values(ascending=False).head(10)
+    grouped = group_means(df, cat_col, num_col)
     
     fig, ax = plt.subplots(figsize=(10, 6))
     grouped.plot(kind='bar', ax=ax, color='coral', edgecolor='black')
@@ -829,19 +958,7 @@ def render_grouped_bar(df: pd.DataFrame, categorical_cols: list, numeric_cols: l
     # AI ANALİZ BUTONU
     st.divider()
     if st.button("🤖 AI ile Bu Grafiği Analiz Et", key=f"ai_grouped_{cat_col}_{num_col}"):
-        highest_cat = grouped.index[0]
-        highest_val = grouped.iloc[0]
-        lowest_cat = grouped.index[-1]
-        lowest_val = grouped.iloc[-1]
-        
-        data_summary = f"""
-- Kategorik değişken: {cat_col}
-- Sayısal değişken: {num_col} (ortalama)
-- En yüksek: {highest_cat} = {highest_val:.2f}
-- En düşük: {lowest_cat} = {lowest_val:.2f}
-- Fark: {highest_val - lowest_val:.2f}
-"""
-        analyze_chart_with_ai("Grouped Bar Chart", f"{cat_col} vs {num_col}", data_summary)
+        analyze_chart_with_ai("Grouped Bar Chart", f"{cat_col} vs {num_col}", grouped_bar_summary(df, cat_col, num_col))
 
 
 def render_piechart(df: pd.DataFrame, categorical_cols: list):
@@ -849,7 +966,7 @@ def render_piechart(df: pd.DataFrame, categorical_cols: list):
     selected_cat = st.selectbox("Kategorik sütun:", categorical_cols, key="pie_cat")
     max_slices = st.slider("Maksimum dilim sayısı:", 3, 10, 7, key="pie_max")
     
-    value_counts = df[selected_cat].value_counts().head(max_slices)
+    value_counts = get_analysis_cache(df).value_counts(selected_cat).head(max_slices)
     
     fig, ax = plt.subplots(figsize=(10, 7))
     colors = plt.cm.Set3(range(len(value_counts)))
@@ -869,17 +986,7 @@ def render_piechart(df: pd.DataFrame, categorical_cols: list):
     # AI ANALİZ BUTONU
     st.divider()
     if st.button("🤖 AI ile Bu Grafiği Analiz Et", key=f"ai_pie_{selected_cat}"):
-        percentages = (value_counts / value_counts.sum() * 100).round(1)
-        dominant = percentages.index[0]
-        dominant_pct = percentages.iloc[0]
-        
-        data_summary = f"""
-- Kategori: {selected_cat}
-- Toplam dilim: {len(value_counts)}
-- Dominant kategori: {dominant} (%{dominant_pct})
-- Dağılım: {', '.join([f"{k}={v}%" for k, v in percentages.head(3).items()])}
-"""
-        analyze_chart_with_ai("Pie Chart", selected_cat, data_summary)
+        analyze_chart_with_ai("Pie Chart", selected_cat, piechart_summary(df, selected_cat, max_slices))
 
 
 def render_heatmap_pivot(df: pd.DataFrame, categorical_cols: list, numeric_cols: list):
@@ -899,7 +1006,7 @@ def render_heatmap_pivot(df: pd.DataFrame, categorical_cols: list, numeric_cols:
     
     # Pivot table oluştur
     try:
-        pivot = df.pivot_table(values=num, index=cat1, columns=cat2, aggfunc='mean')
+        pivot = pivot_means(df, cat1, cat2, num)
     except Exception as e:
         st.error(f"❌ Heatmap oluşturulamadı: {str(e)}")
         st.warning("💡 **Olası sebepler:**\n- Aynı kategorik sütun seçilmiş olabilir\n- Farklı kategorik sütunlar seçin")
@@ -910,9 +1017,6 @@ def render_heatmap_pivot(df: pd.DataFrame, categorical_cols: list, numeric_cols:
         st.warning("⚠️ Bu kombinasyon için veri bulunamadı.")
         return
     
-    # İlk 10x10'a sınırla (görsellik için)
-    pivot = pivot.iloc[:10, :10]
-    
     fig, ax = plt.subplots(figsize=(10, 7))
     sns.heatmap(pivot, annot=True, fmt='.2f', cmap='YlOrRd', ax=ax, linewidths=0.5)
     ax.set_title(f'{cat1} vs {cat2} - Ortalama {num}', fontsize=14, fontweight='bold')
@@ -923,41 +1027,22 @@ def render_heatmap_pivot(df: pd.DataFrame, categorical_cols: list, numeric_cols:
     # AI ANALİZ BUTONU
     st.divider()
     if st.button("🤖 AI ile Bu Grafiği Analiz Et", key=f"ai_heat_{cat1}_{cat2}_{num}"):
-        max_val = pivot.max().max()
-        min_val = pivot.min().min()
-        max_idx = pivot.stack().idxmax()
-        
-        data_summary = f"""
-- Satır: {cat1}, Sütun: {cat2}, Değer: {num}
-- En yüksek değer: {max_val:.2f} ({max_idx[0]} - {max_idx[1]})
-- En düşük değer: {min_val:.2f}
-- Ortalama: {pivot.mean().mean():.2f}
-"""
-        analyze_chart_with_ai("Heatmap (Pivot Table)", f"{cat1} vs {cat2}", data_summary)
-def render_ai_insights(df: pd.DataFrame, numeric_cols: list, categorical_cols: list):
+        analyze_chart_with_ai("Heatmap (Pivot Table)", f"{cat1} vs {cat2}", heatmap_summary(pivot, cat1, cat2, num))
+
+
+def build_insights_request(df: pd.DataFrame, numeric_cols: list, categorical_cols: list) -> dict:
     """
-    AI içgörüler tabını render eder.
+    Veri seti içgörüleri için LLM isteğini oluşturur.
     
     Args:
         df: Pandas DataFrame
         numeric_cols: Sayısal sütunlar
         categorical_cols: Kategorik sütunlar
+        
+    Returns:
+        dict: model, messages, temperature, max_tokens
     """
-    st.subheader("💡 AI-Powered İçgörüler")
-    st.write("GPT, veri setinizi analiz ederek otomatik içgörüler ve öneriler üretir.")
-    
-    if st.button("Analiz Et", type="primary", key="ai_insights"):
-        with st.spinner("🔍 Veri seti analiz ediliyor..."):
-            load_dotenv()
-            api_key = os.getenv("OPENAI_API_KEY")
-            
-            if not api_key or api_key == "your_api_key_here":
-                st.error("⚠️ OpenAI API key bulunamadı!")
-            else:
-                try:
-                    client = OpenAI(api_key=api_key)
-                    
-                    summary = f"""
+    summary = f"""
 Veri Seti Özeti:
 - Toplam satır: {len(df):,}
 - Sütunlar: {', '.join(df.columns.tolist())}
@@ -965,22 +1050,21 @@ Veri Seti Özeti:
 - Kategorik sütunlar: {', '.join(categorical_cols) if categorical_cols else 'Yok'}
 
 Sayısal İstatistikler:
-{df[numeric_cols].describe().to_string() if len(numeric_cols) > 0 else 'Yok'}
+{get_analysis_cache(df).describe(numeric_cols).T.to_string() if len(numeric_cols) > 0 else 'Yok'}
 
 İlk 5 Satır:
 {df.head(5).to_string()}
 """
-                    
-                    response = client.chat.completions.create(
-                        model="gpt-3.5-turbo",
-                        messages=[
-                            {
-                                "role": "system",
-                                "content": "Sen profesyonel bir veri analisti asistanısın. Yanıtlarını Türkçe ver."
-                            },
-                            {
-                                "role": "user",
-                                "content": f"""Veri setini analiz et:
+    return {
+        'model': ANALYSIS_LLM_MODEL,
+        'messages': [
+            {
+                "role": "system",
+                "content": "Sen profesyonel bir veri analisti asistanısın. Yanıtlarını Türkçe ver."
+            },
+            {
+                "role": "user",
+                "content": f"""Veri setini analiz et:
 
 1. En önemli 5 içgörüyü belirle
 2. İş/bilim açısından ne anlama geldiğini açıkla
@@ -989,13 +1073,35 @@ Sayısal İstatistikler:
 5- Açıklamalar kısa ve net olsun.
 6- Yanıtı madde madde ver.
 {summary}"""
-                            }
-                        ],
-                        temperature=0.7,
-                        max_tokens=1000
-                    )
+            }
+        ],
+        'temperature': 0.7,
+        'max_tokens': 1000
+    }
+
+
+def render_ai_insights(df: pd.DataFrame, numeric_cols: list, categorical_cols: list):
+    """
+    AI içgörüler tabını render eder.
+    
+    Args:
+        df: Pandas DataFrame
+        numeric_cols: Sayısal sütunlar
+        categorical_cols: Kategorik sütunlar
+    """
+    st.subheader("💡 AI-Powered İçgörüler")
+    st.write("GPT, veri setinizi analiz ederek otomatik içgörüler ve öneriler üretir.")
+    
+    if st.button("Analiz Et", type="primary", key="ai_insights"):
+        with st.spinner("🔍 Veri seti analiz ediliyor..."):
+            llm = get_llm_provider(get_api_key())
+            
+            if llm is None:
+                st.error("⚠️ OpenAI API key bulunamadı!")
+            else:
+                try:
+                    insights = llm.complete(**build_insights_request(df, numeric_cols, categorical_cols))
                     
-                    insights = response.choices[0].message.content
                     st.success("✅ Analiz tamamlandı!")
                     st.markdown(insights)
                     
@@ -1009,6 +1115,213 @@ Sayısal İstatistikler:
                     st.error(f"❌ Hata: {str(e)}")
     else:
         st.info("👆 Butona tıklayarak analiz başlatın.")
+    
+    st.divider()
+    render_full_report(df, numeric_cols, categorical_cols)
+
+
+# ═══════════════════════════════════════════════════════
+# TAM RAPOR - TÜM AI ANALİZLERİ EŞZAMANLI
+# ═══════════════════════════════════════════════════════
+
+def _selected(key: str, options: list, default_index: int = 0):
+    """Widget'ın oturumdaki seçimini döndürür (yoksa veya geçersizse varsayılanı)."""
+    value = st.session_state.get(key)
+    if value in options:
+        return value
+    return options[min(default_index, len(options) - 1)]
+
+
+def collect_chart_summaries(df: pd.DataFrame, numeric_cols: list, categorical_cols: list) -> list:
+    """
+    Veri setine uygun her grafik için (grafik türü, sütun, veri özeti) listesi.
+    
+    Grafikler Görselleştirmeler sekmesindeki seçimlerle (yoksa varsayılan
+    sütunlarla) özetlenir.
+    
+    Returns:
+        list: [(chart_type, column, data_summary), ...]
+    """
+    state = st.session_state
+    builders = {
+        "Histogram": lambda: (
+            "Histogram", _selected("hist_col", numeric_cols),
+            histogram_summary(df, _selected("hist_col", numeric_cols), state.get("hist_bins", 30))
+        ),
+        "Box Plot": lambda: (
+            "Box Plot", _selected("box_col", numeric_cols),
+            boxplot_summary(df, _selected("box_col", numeric_cols))
+        ),
+        "Violin Plot": lambda: (
+            "Violin Plot", _selected("violin_col", numeric_cols),
+            violinplot_summary(df, _selected("violin_col", numeric_cols))
+        ),
+        "KDE Plot": lambda: (
+            "KDE Plot", _selected("kde_col", numeric_cols),
+            kdeplot_summary(df, _selected("kde_col", numeric_cols))
+        ),
+        "Scatter Plot": lambda: (
+            "Scatter Plot",
+            f"{_selected('scatter_x', numeric_cols)} vs {_selected('scatter_y', numeric_cols, 1)}",
+            scatterplot_summary(df, _selected("scatter_x", numeric_cols), _selected("scatter_y", numeric_cols, 1))
+        ),
+        "Pair Plot (Scatter Matrix)": lambda: (
+            "Pair Plot (Scatter Matrix)", "Tüm değişkenler", pairplot_summary(df, numeric_cols[:6])
+        ),
+        "Count Plot": lambda: (
+            "Count Plot (Bar Chart)", _selected("count_cat", categorical_cols),
+            countplot_summary(df, _selected("count_cat", categorical_cols), state.get("count_max", 10))
+        ),
+        "Grouped Bar Chart": lambda: (
+            "Grouped Bar Chart",
+            f"{_selected('group_cat', categorical_cols)} vs {_selected('group_num', numeric_cols)}",
+            grouped_bar_summary(df, _selected("group_cat", categorical_cols), _selected("group_num", numeric_cols))
+        ),
+        "Pie Chart": lambda: (
+            "Pie Chart", _selected("pie_cat", categorical_cols),
+            piechart_summary(df, _selected("pie_cat", categorical_cols), state.get("pie_max", 7))
+        ),
+        "Heatmap (Pivot Table)": lambda: _heatmap_chart_summary(df, categorical_cols, numeric_cols)
+    }
+    
+    summaries = []
+    for chart, (enabled, _) in get_recommended_charts(df, numeric_cols, categorical_cols).items():
+        if not enabled or chart not in builders:
+            continue
+        try:
+            summary = builders[chart]()
+        except Exception:
+            # Özetlenemeyen grafik (ör. tamamen boş sütun) rapordan çıkarılır
+            continue
+        if summary:
+            summaries.append(summary)
+    return summaries
+
+
+def _heatmap_chart_summary(df: pd.DataFrame, categorical_cols: list, numeric_cols: list):
+    """Pivot heatmap özeti; kategoriler aynıysa veya pivot boşsa None."""
+    cat1 = _selected("heat_cat1", categorical_cols)
+    cat2 = _selected("heat_cat2", categorical_cols, 1)
+    num = _selected("heat_num", numeric_cols)
+    if cat1 == cat2:
+        return None
+    pivot = pivot_means(df, cat1, cat2, num)
+    if pivot.empty:
+        return None
+    return "Heatmap (Pivot Table)", f"{cat1} vs {cat2}", heatmap_summary(pivot, cat1, cat2, num)
+
+
+def collect_report_requests(df: pd.DataFrame, numeric_cols: list, categorical_cols: list) -> list:
+    """
+    Tam rapordaki tüm AI analizlerinin (başlık, LLM isteği, grafik) listesi.
+    
+    Returns:
+        list: [(title, request, chart), ...] - içgörüler, feature importance ve grafik
+        yorumları; `chart` grafik yorumları için (grafik türü, sütun), diğerleri için None
+    """
+    requests = [("💡 Veri Seti İçgörüleri", build_insights_request(df, numeric_cols, categorical_cols), None)]
+    
+    if len(numeric_cols) >= 2:
+        analysis_cache = get_analysis_cache(df)
+        requests.append((
+            "🧠 Feature Importance",
+            build_feature_importance_request(
+                numeric_cols,
+                analysis_cache.correlation_pairs(numeric_cols),
+                analysis_cache.correlation(numeric_cols)
+            ),
+            None
+        ))
+    
+    for chart_type, column, data_summary in collect_chart_summaries(df, numeric_cols, categorical_cols):
+        requests.append((
+            f"📊 {chart_type} - {column}",
+            build_chart_request(chart_type, column, data_summary),
+            (chart_type, column)
+        ))
+    
+    return requests
+
+
+def render_full_report(df: pd.DataFrame, numeric_cols: list, categorical_cols: list):
+    """
+    Tüm grafik yorumlarını ve içgörüleri tek tıkla, eşzamanlı olarak üretir.
+    
+    İstekler sınırlı bir iş parçacığı havuzunda aynı anda gönderilir ve
+    her cevap geldiği anda kendi yerine yazılır; rapor süresi en yavaş
+    çağrı kadardır. Önbellekte olan grafik yorumları hemen gösterilir.
+    
+    Args:
+        df: Pandas DataFrame
+        numeric_cols: Sayısal sütunlar
+        categorical_cols: Kategorik sütunlar
+    """
+    st.write("### 📑 Tam Veri Seti Raporu")
+    st.write("İçgörüler, feature importance ve tüm grafik yorumları aynı anda hazırlanır.")
+    
+    fingerprint = get_analysis_cache(df).fingerprint
+    
+    if st.button("🚀 Tümünü Analiz Et", key="ai_full_report"):
+        llm = get_llm_provider(get_api_key())
+        
+        if llm is None:
+            st.error("⚠️ OpenAI API key bulunamadı!")
+            return
+        
+        requests = collect_report_requests(df, numeric_cols, categorical_cols)
+        
+        chart_cache = get_chart_cache() if CHART_CACHE_ENABLED else None
+        cache_keys = [
+            chart_cache_key(llm, chart[0], chart[1], request) if chart and chart_cache else None
+            for _, request, chart in requests
+        ]
+        
+        # Her analiz için yer tutucu; önbellekte olanlar hemen, diğerleri geldikçe doldurulur
+        placeholders, results, pending = [], [""] * len(requests), []
+        for index, (title, _, _) in enumerate(requests):
+            st.markdown(f"#### {title}")
+            placeholder = st.empty()
+            placeholders.append(placeholder)
+            cached = chart_cache.get(cache_keys[index]) if cache_keys[index] else None
+            if cached is not None:
+                placeholder.markdown(cached)
+                results[index] = cached
+            else:
+                placeholder.info("⏳ Analiz ediliyor...")
+                pending.append(index)
+        
+        progress = st.progress(0.0)
+        start_time = time.time()
+        completed = complete_as_completed(llm, [requests[i][1] for i in pending], ANALYSIS_LLM_CONCURRENCY)
+        for done, (position, result) in enumerate(completed, 1):
+            index = pending[position]
+            if isinstance(result, Exception):
+                placeholders[index].error(f"❌ Hata: {str(result)}")
+                results[index] = f"Hata: {result}"
+            else:
+                placeholders[index].markdown(result)
+                results[index] = result
+                if cache_keys[index]:
+                    chart_cache.put(cache_keys[index], result)
+            progress.progress(done / len(pending))
+        progress.empty()
+        
+        st.success(
+            f"✅ {len(requests)} analiz {time.time() - start_time:.1f} saniyede tamamlandı! "
+            f"({len(requests) - len(pending)} tanesi önbellekten)"
+        )
+        report = "\n\n".join(f"## {title}\n\n{text}" for (title, _, _), text in zip(requests, results))
+        st.session_state['full_report'] = (fingerprint, report)
+    
+    saved = st.session_state.get('full_report')
+    if saved and saved[0] == fingerprint:
+        st.download_button(
+            label="📥 Raporu İndir (Markdown)",
+            data=saved[1],
+            file_name="veri_seti_raporu.md",
+            mime="text/markdown",
+            key="download_full_report"
+        )
 
 
 def render_data_analysis(df: pd.DataFrame):
@@ -0,0 +1,262 @@
+"""
+Toplu soru bileşeni - Soru listesini tek seferde cevaplar
+"""
+import io
+import json
+import streamlit as st
+import pandas as pd
+from typing import Dict, List
+from utils.llm_client import LLMProvider, get_api_key, get_llm_provider, requires_api_key, complete_many
+from utils.query_engine import answer_query, extract_filters, is_plain_lookup
+from utils.vector_store import build_where_clause
+from utils.context_builder import CONTEXT_SEPARATOR
+from components.chatbot import (
+    SYSTEM_PROMPT,
+    build_user_prompt,
+    build_question_context,
+    retrieve_rows_batch,
+    get_answer_cache,
+    is_statistical_query,
+    get_statistical_answer
+)
+from config.settings import (
+    LLM_MODEL, LLM_TEMPERATURE, LLM_MAX_TOKENS, LLM_TOP_P,
+    LLM_BATCH_CONCURRENCY, BATCH_QUESTION_LIMIT, ANSWER_CACHE_ENABLED
+)
+
+
+QUESTION_COLUMNS = ('soru', 'question', 'questions', 'sorular')
+
+
+def parse_questions(text: str) -> List[str]:
+    """Her satırı bir soru olarak okur; boş ve tekrar eden satırları atlar."""
+    lines = (line.strip() for line in text.splitlines())
+    return list(dict.fromkeys(line for line in lines if line))
+
+
+def read_question_file(uploaded_file) -> List[str]:
+    """
+    Yüklenen dosyadan soruları okur.
+
+    CSV'de "soru"/"question" adlı sütun (yoksa ilk sütun), diğer
+    dosyalarda her satır bir soru kabul edilir.
+
+    Args:
+        uploaded_file: Streamlit UploadedFile (.csv veya .txt)
+
+    Returns:
+        List[str]: Sorular
+    """
+    content = uploaded_file.getvalue().decode('utf-8-sig', errors='replace')
+    if not uploaded_file.name.lower().endswith('.csv'):
+        return parse_questions(content)
+
+    df = pd.read_csv(io.StringIO(content), dtype=str)
+    column = next(
+        (col for col in df.columns if str(col).strip().lower() in QUESTION_COLUMNS),
+        df.columns[0]
+    )
+    return parse_questions("\n".join(df[column].dropna()))
+
+
+def _result_row(question: str, answer: str, source: str, context_count: int = 0, context_tokens: int = 0) -> Dict:
+    """Sonuç tablosunun bir satırı."""
+    return {
+        'Soru': question,
+        'Cevap': answer,
+        'Kaynak': source,
+        'Kullanılan Veri': context_count,
+        'Context Token': context_tokens
+    }
+
+
+def answer_questions_batch(questions: List[str], llm: LLMProvider, progress_callback=None) -> pd.DataFrame:
+    """
+    Soru listesini cevaplar.
+
+    Sorgu motoru ve hesaplanmış istatistiklerle kesin cevaplanabilen
+    sorular LLM'e gitmez. Kalan sorular tek `encode` çağrısıyla
+    vektörleştirilir, aynı ön filtreye sahip sorular tek collection
+    sorgusunda aranır ve LLM çağrıları sınırlı eşzamanlılıkla yapılır.
+
+    Args:
+        questions: Sorular
+        llm: LLM sağlayıcı
+        progress_callback: LLM çağrıları bittikçe (biten, toplam) ile çağrılır
+
+    Returns:
+        pd.DataFrame: Soru, Cevap, Kaynak, Kullanılan Veri, Context Token
+    """
+    dataset_stats = st.session_state.get('dataset_stats', {})
+    total_records = dataset_stats.get('total_rows', st.session_state.get('document_count', 0))
+    df = st.session_state.get('dataframe')
+    matcher = st.session_state.get('column_matcher')
+    rows: List[Dict] = [None] * len(questions)
+
+    # 1. Kesin cevaplar (sorgu motoru / istatistikler)
+    pending = []
+    for i, question in enumerate(questions):
+        query_answer = answer_query(question, df, matcher) if df is not None else None
+        if query_answer:
+            rows[i] = _result_row(question, query_answer['markdown'], "Sorgu Motoru")
+            continue
+        if (is_statistical_query(question) and dataset_stats
+                and (df is None or is_plain_lookup(question, df, matcher))):
+            stat_answer = get_statistical_answer(question, dataset_stats, matcher)
+            if stat_answer:
+                rows[i] = _result_row(question, stat_answer, "İstatistik")
+                continue
+        pending.append(i)
+
+    if not pending:
+        return pd.DataFrame(rows)
+
+    # 2. Tüm sorular tek encode çağrısıyla
+    embedding_model = st.session_state['embedding_model']
+    embeddings = dict(zip(pending, embedding_model.encode([questions[i] for i in pending])))
+
+    # 3. Sorulardaki ön filtreler (önbellek anahtarının ve aramanın parçası)
+    wheres_by_question = {}
+    for i in pending:
+        filters = extract_filters(questions[i], df, matcher, infer_boolean=False) if df is not None else []
+        wheres_by_question[i] = build_where_clause(filters)
+
+    # 4. Önbellekte aynı filtreyle benzeri olan sorular
+    fingerprint = st.session_state.get('dataset_fingerprint')
+    model_key = f"{llm.name}:{LLM_MODEL}"
+    use_cache = ANSWER_CACHE_ENABLED and bool(fingerprint)
+    answer_cache = get_answer_cache() if use_cache else None
+    if use_cache:
+        remaining = []
+        for i in pending:
+            cached = answer_cache.get(fingerprint, model_key, embeddings[i], where=wheres_by_question[i])
+            if cached:
+                rows[i] = _result_row(
+                    questions[i], cached['answer'], "Önbellek",
+                    cached.get('context_count', 0), cached.get('context_tokens', 0)
+                )
+            else:
+                remaining.append(i)
+        pending = remaining
+
+    # 5. Arama: aynı ön filtreye sahip sorular tek sorguda
+    groups: Dict[str, List[int]] = {}
+    wheres = {}
+    for i in pending:
+        where = wheres_by_question[i]
+        key = json.dumps(where, sort_keys=True, default=str)
+        wheres[key] = where
+        groups.setdefault(key, []).append(i)
+
+    metadatas = {}
+    unfiltered = []
+    for key, indices in groups.items():
+        results = retrieve_rows_batch(
+            [questions[i] for i in indices], [embeddings[i] for i in indices], wheres[key]
+        )
+        for i, found in zip(indices, results['metadatas']):
+            if wheres[key] and not found:
+                # Filtreye uyan satır yoksa filtresiz ara
+                unfiltered.append(i)
+            else:
+                metadatas[i] = found
+    if unfiltered:
+        results = retrieve_rows_batch([questions[i] for i in unfiltered], [embeddings[i] for i in unfiltered])
+        metadatas.update(zip(unfiltered, results['metadatas']))
+
+    # 6. Context ve prompt'lar
+    requests, contexts = [], {}
+    for i in pending:
+        context_docs, context_tokens = build_question_context(questions[i], metadatas[i], df, matcher)
+        if not context_docs:
+            rows[i] = _result_row(questions[i], "Veri setinde bu soruyla alakalı bilgi bulunamadı.", "Yok")
+            continue
+        contexts[i] = (context_docs, context_tokens)
+        user_prompt = build_user_prompt(
+            questions[i], CONTEXT_SEPARATOR.join(context_docs), len(context_docs), total_records, dataset_stats
+        )
+        requests.append({
+            'model': LLM_MODEL,
+            'messages': [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt}
+            ],
+            'temperature': LLM_TEMPERATURE,
+            'max_tokens': LLM_MAX_TOKENS,
+            'top_p': LLM_TOP_P
+        })
+
+    # 7. LLM çağrıları (eşzamanlı, sınırlı)
+    answers = complete_many(llm, requests, LLM_BATCH_CONCURRENCY, progress_callback)
+    for i, answer in zip(list(contexts), answers):
+        context_docs, context_tokens = contexts[i]
+        if isinstance(answer, Exception):
+            rows[i] = _result_row(questions[i], f"Hata: {answer}", "Hata")
+            continue
+        rows[i] = _result_row(questions[i], answer, "RAG", len(context_docs), context_tokens)
+        if use_cache:
+            answer_cache.put(
+                fingerprint, model_key, questions[i], embeddings[i], answer,
+                where=wheres_by_question[i],
+                context_count=len(context_docs),
+                context_tokens=context_tokens,
+                sources=[doc[:400] for doc in context_docs[:5]]
+            )
+
+    return pd.DataFrame(rows)
+
+
+def render_batch_questions():
+    """Toplu soru arayüzünü render eder."""
+    if 'collection' not in st.session_state:
+        return
+
+    with st.expander("📋 Toplu Soru Modu", expanded=False):
+        st.caption(
+            f"Her satıra bir soru yazın veya .txt/.csv dosyası yükleyin "
+            f"(en fazla {BATCH_QUESTION_LIMIT} soru). Cevaplar tablo olarak indirilebilir."
+        )
+        questions_text = st.text_area("Sorular:", key="batch_questions_text", height=150)
+        questions_file = st.file_uploader(
+            "Veya soru dosyası yükleyin:", type=["txt", "csv"], key="batch_questions_file"
+        )
+
+        questions = read_question_file(questions_file) if questions_file else parse_questions(questions_text)
+        if len(questions) > BATCH_QUESTION_LIMIT:
+            st.warning(f"⚠️ İlk {BATCH_QUESTION_LIMIT} soru işlenecek ({len(questions)} soru verildi).")
+            questions = questions[:BATCH_QUESTION_LIMIT]
+
+        api_key = get_api_key() or st.session_state.get('api_key_input')
+        if requires_api_key() and not api_key:
+            st.info("💡 Toplu soru modu için API key gerekli.")
+            return
+
+        if st.button(f"🚀 {len(questions)} Soruyu Cevapla", disabled=not questions, key="batch_questions_submit"):
+            progress = st.progress(0.0)
+            status = st.empty()
+
+            def progress_callback(done, total):
+                progress.progress(done / total)
+                status.text(f"🤖 {done}/{total} LLM cevabı alındı")
+
+            with st.spinner("🤔 Sorular cevaplanıyor..."):
+                try:
+                    st.session_state['batch_results'] = answer_questions_batch(
+                        questions, get_llm_provider(api_key), progress_callback
+                    )
+                except Exception as e:
+                    st.error(f"❌ Bir hata oluştu: {str(e)}")
+            progress.empty()
+            status.empty()
+
+        results = st.session_state.get('batch_results')
+        if results is not None and not results.empty:
+            st.success(f"✅ {len(results)} soru cevaplandı")
+            st.dataframe(results, use_container_width=True)
+            st.download_button(
+                "📥 Sonuçları İndir (CSV)",
+                data=results.to_csv(index=False).encode('utf-8-sig'),
+                file_name="toplu_cevaplar.csv",
+                mime="text/csv",
+                key="batch_results_download"
+            )
@@ -2,10 +2,146 @@
 Chatbot arayüzü bileşeni - DENGELI VERSİYON
 """
 import streamlit as st
-import os
-from openai import OpenAI
-from utils.vector_store import query_collection
-from config.settings import LLM_MODEL, LLM_TEMPERATURE, LLM_MAX_TOKENS, TOP_K_RESULTS
+from utils.llm_client import get_api_key, get_llm_provider, requires_api_key
+from utils.vector_store import query_collection_batch, hybrid_query_batch, build_where_clause
+from utils.data_loader import fetch_rows
+from utils.query_engine import answer_query, extract_filters, describe_filters, is_plain_lookup
+from utils.column_matcher import ColumnMatcher
+from utils.answer_cache import SemanticAnswerCache
+from utils.context_builder import build_context, get_token_counter, CONTEXT_SEPARATOR
+from config.settings import (
+    LLM_MODEL, LLM_TEMPERATURE, LLM_MAX_TOKENS, TOP_K_RESULTS, CONTEXT_TOKEN_BUDGET,
+    HYBRID_CANDIDATES, RRF_K,
+    ANSWER_CACHE_ENABLED, ANSWER_CACHE_THRESHOLD, ANSWER_CACHE_TTL_SECONDS,
+    ANSWER_CACHE_MAX_ENTRIES, ANSWER_CACHE_PATH
+)
+
+
+# Cevap üretici (RAG) için sistem promptu
+SYSTEM_PROMPT = """Sen profesyonel bir veri analistisin. Hem hesaplama yaparsın hem yorumlarsın.
+
+İKİ TÜR SORU VAR:
+
+═══════════════════════════════════════
+📊 TİP 1: HESAPLAMA/İSTATİSTİK SORULARI
+═══════════════════════════════════════
+Örnekler:
+- "Ortalama/toplam/maksimum X nedir?"
+- "Kaç kişi Y özelliğine sahip?"
+- "X ile Y arasındaki fark?"
+
+YAPMAN GEREKEN:
+✅ Verilen kayıtlardan hesapla
+✅ Net rakam ver
+✅ "Bu X kayıttan hesaplandı" de
+✅ Yetersizse: "Kesin sonuç için tüm veriyi işlemek gerek" de
+
+═══════════════════════════════════════
+💡 TİP 2: GENEL/YORUMLAMA SORULARI
+═══════════════════════════════════════
+Örnekler:
+- "Bu veri setini açıkla"
+- "Ne amaçla kullanılır?"
+- "İş dünyasında ne anlama gelir?"
+- "Hangi kararlar alınabilir?"
+
+YAPMAN GEREKEN:
+✅ Veri setinin yapısını açıkla
+✅ Sütunları yorumla
+✅ İş/bilim açısından ne anlama geldiğini söyle
+✅ Kullanım alanlarını öner
+✅ Hangi soruların cevaplanabileceğini belirt
+
+ÖRNEK CEVAP (Sigorta veri seti için):
+"Bu veri seti sigorta şirketlerinin prim belirleme için kullanır. 
+Yaş, BMI, sigara gibi risk faktörleri ile sigorta maliyeti arasındaki 
+ilişkiyi analiz eder. Şirketler bu verileri kullanarak:
+- Risk profili oluşturur
+- Prim fiyatlandırması yapar
+- Yüksek riskli müşterileri tespit eder"
+
+═══════════════════════════════════════
+❌ YASAKLAR (SADECE BUNLAR!)
+═══════════════════════════════════════
+❌ Veri setinde OLMAYAN spesifik bilgileri UYDURMA (isim, adres, vb.)
+❌ Kesin olmayan rakamları kesinmiş gibi sunma
+❌ "Muhtemelen X kişidir" gibi spesifik tahminler yapma
+
+✅ İZİN VERİLENLER
+✅ Genel yorumlar: "Bu veri seti muhtemelen X amacıyla toplanmış"
+✅ İş yorumları: "Bu bilgiler Y için kullanılabilir"
+✅ Öneriler: "Z analizi yapılabilir"
+✅ Hesaplamalar: Verilen kayıtlardan hesapla
+
+CEVAP FORMATI:
+1. Direkt cevap
+2. Detaylı açıklama
+3. Kaynak bilgisi (hesaplama yapıldıysa)"""
+
+
+def build_user_prompt(
+    question: str,
+    context: str,
+    context_count: int,
+    total_records: int,
+    dataset_stats: dict
+) -> str:
+    """
+    RAG cevabı için kullanıcı promptunu oluşturur.
+    
+    Args:
+        question: Kullanıcı sorusu
+        context: Birleştirilmiş veri örnekleri
+        context_count: Context'teki kayıt sayısı
+        total_records: Veri setindeki toplam kayıt
+        dataset_stats: Hazırlık aşamasında hesaplanan istatistikler
+        
+    Returns:
+        str: Kullanıcı promptu
+    """
+    numeric_cols_str = ", ".join(dataset_stats.get('numeric_columns', []))
+    categorical_cols_str = ", ".join(dataset_stats.get('categorical_columns', []))
+    return f"""VERİ SETİ BİLGİLERİ:
+- Toplam: {total_records:,} kayıt
+- Analiz için kullanılan: {context_count} en alakalı kayıt
+- Sayısal sütunlar: {numeric_cols_str or "Yok"}
+- Kategorik sütunlar: {categorical_cols_str or "Yok"}
+
+═══════════════════════════════════════
+VERİ ÖRNEKLERİ (İlk {context_count} kayıt):
+═══════════════════════════════════════
+{context}
+
+═══════════════════════════════════════
+KULLANICI SORUSU:
+═══════════════════════════════════════
+{question}
+
+═══════════════════════════════════════
+TALİMATLAR:
+═══════════════════════════════════════
+1. Soru HESAPLAMA gerektiriyorsa → Kayıtlardan hesapla + "X kayıttan hesaplandı" de
+2. Soru GENEL/YORUM gerektiriyorsa → Veri yapısını yorumla, kullanım alanlarını söyle
+3. SPESİFİK bilgi yoksa → "Bu bilgi veri setinde yok" de
+4. Türkçe sütun adı varsa → İngilizce karşılığını bul ve kullan
+
+CEVAP VER:"""
+
+
+@st.cache_resource
+def get_answer_cache() -> SemanticAnswerCache:
+    """
+    Tüm oturumların paylaştığı anlamsal cevap önbelleğini açar (cache'lenir).
+    
+    Returns:
+        SemanticAnswerCache: Önbellek instance
+    """
+    return SemanticAnswerCache(
+        threshold=ANSWER_CACHE_THRESHOLD,
+        ttl_seconds=ANSWER_CACHE_TTL_SECONDS,
+        max_entries=ANSWER_CACHE_MAX_ENTRIES,
+        persist_path=ANSWER_CACHE_PATH
+    )
 
 
 def render_chat_history():
@@ -20,21 +156,82 @@ def render_chat_history():
         st.divider()
 
 
-def get_api_key():
-    """API key'i alır."""
-    try:
-        return st.secrets["OPENAI_API_KEY"]
-    except:
-        pass
+def retrieve_rows_batch(questions: list, query_embeddings, where: dict = None) -> dict:
+    """
+    Sorularla en alakalı satırları tek sorguda getirir (BM25 indeksi varsa hibrit arama).
     
-    from dotenv import load_dotenv
-    load_dotenv()
+    Args:
+        questions: Kullanıcı soruları
+        query_embeddings: Soruların embedding'leri (aynı sırada)
+        where: Metadata ön filtresi (Chroma `where` ifadesi, tüm sorulara uygulanır)
+        
+    Returns:
+        dict: query_collection_batch formatında sonuçlar (soru başına bir liste)
+    """
+    collection = st.session_state['collection']
+    lexical_index = st.session_state.get('lexical_index')
+    if lexical_index is not None:
+        # Vektör + BM25 (kategorik değerler, kodlar gibi tam eşleşmeler için)
+        return hybrid_query_batch(
+            collection, query_embeddings, lexical_index, questions,
+            n_results=TOP_K_RESULTS, candidates=HYBRID_CANDIDATES, rrf_k=RRF_K,
+            where=where
+        )
+    return query_collection_batch(
+        collection, query_embeddings, TOP_K_RESULTS, where=where
+    )
+
+
+def retrieve_rows(question: str, query_embedding, where: dict = None) -> dict:
+    """
+    Soruyla en alakalı satırları getirir (tek soruluk retrieve_rows_batch).
     
-    api_key = os.getenv("OPENAI_API_KEY")
-    if api_key and api_key != "your_api_key_here":
-        return api_key
+    Args:
+        question: Kullanıcı sorusu
+        query_embedding: Sorunun embedding'i
+        where: Metadata ön filtresi (Chroma `where` ifadesi)
+        
+    Returns:
+        dict: query_collection formatında sonuçlar
+    """
+    return retrieve_rows_batch([question], [query_embedding], where)
+
+
+def build_question_context(question: str, metadatas: list, df=None, matcher: ColumnMatcher = None) -> tuple:
+    """
+    Arama sonuçlarından token bütçesine göre context oluşturur
+    (tekrarlar ve gereksiz sütunlar çıkarılır).
     
-    return None
+    Args:
+        question: Kullanıcı sorusu
+        metadatas: Sorgu sonucundaki metadata'lar (benzerlik sırasıyla)
+        df: Veri seti (verilirse satırların tamamı buradan okunur)
+        matcher: Veri setinin sütun eşleştiricisi
+        
+    Returns:
+        tuple: (context dökümanları, kullanılan token sayısı)
+    """
+    columns = list(df.columns) if df is not None else []
+    # Metadata sadece filtre sütunlarını içerir; satırların tamamı DataFrame'den okunur
+    rows = fetch_rows(df, metadatas) if df is not None else metadatas
+    return build_context(
+        rows,
+        question,
+        columns,
+        CONTEXT_TOKEN_BUDGET,
+        count_tokens=get_token_counter(LLM_MODEL),
+        matcher=matcher
+    )
+
+
+def render_sources(context_docs: list):
+    """Cevapta kullanılan ilk 5 veri kaynağını gösterir."""
+    with st.expander(f"📚 Kullanılan {min(len(context_docs), 5)} Veri Kaynağı"):
+        for i, doc in enumerate(context_docs[:5], 1):
+            st.markdown(f"**📄 Kaynak {i}:**")
+            st.code(doc[:400] + ("..." if len(doc) > 400 else ""), language="text")
+            if i < 5:
+                st.divider()
 
 
 def is_statistical_query(question: str) -> bool:
@@ -52,15 +249,31 @@ def is_statistical_query(question: str) -> bool:
     return any(keyword in question.lower() for keyword in stat_keywords)
 
 
-def get_statistical_answer(question: str, dataset_stats: dict) -> str:
-    """İstatistiksel soruya dataset_stats'tan direkt cevap üretir."""
+def get_statistical_answer(question: str, dataset_stats: dict, matcher: ColumnMatcher = None) -> str:
+    """
+    İstatistiksel soruya dataset_stats'tan direkt cevap üretir.
+    
+    Args:
+        question: Kullanıcı sorusu
+        dataset_stats: Hazırlık aşamasında hesaplanan istatistikler
+        matcher: Veri setinin sütun eşleştiricisi (yoksa sütun adlarından derlenir)
+        
+    Returns:
+        str: Markdown cevap veya None
+    """
     question_lower = question.lower()
+    numeric_stats = dataset_stats.get('numeric_stats', {})
+    categorical_stats = dataset_stats.get('categorical_stats', {})
+    
+    if matcher is None:
+        matcher = ColumnMatcher(list(numeric_stats) + list(categorical_stats))
+    mentioned = matcher.find_columns(question)
     
     # Sayısal sütunlar için
-    for col, stats in dataset_stats.get('numeric_stats', {}).items():
-        col_lower = col.lower()
+    for col in mentioned:
+        stats = numeric_stats.get(col)
         
-        if col_lower in question_lower:
+        if stats is not None:
             response = f"### 📊 {col.upper()} İstatistikleri\n\n"
             response += f"**Kaynak:** Tüm {dataset_stats['total_rows']:,} kayıttan hesaplandı\n\n"
             
@@ -88,10 +301,10 @@ def get_statistical_answer(question: str, dataset_stats: dict) -> str:
             return response
     
     # Kategorik sütunlar için
-    for col, stats in dataset_stats.get('categorical_stats', {}).items():
-        col_lower = col.lower()
+    for col in mentioned:
+        stats = categorical_stats.get(col)
         
-        if col_lower in question_lower:
+        if stats is not None:
             response = f"### 🏷️ {col.upper()} Dağılımı\n\n"
             response += f"**Kaynak:** Tüm {dataset_stats['total_rows']:,} kayıttan hesaplandı\n\n"
             
@@ -142,12 +355,12 @@ def render_chatbot_interface():
     # API Key kontrolü
     api_key = get_api_key()
     
-    if not api_key:
+    if not api_key and requires_api_key():
         st.error("❌ OpenAI API key bulunamadı!")
         st.info("💡 Lütfen Streamlit Secrets'a veya .env dosyasına API key'inizi ekleyin.")
         api_key = st.text_input("Veya buraya API key girin:", type="password", key="api_key_input")
     
-    if api_key:
+    if api_key or not requires_api_key():
         # Soru input
         user_question = st.text_input(
             "❓ Sorunuzu yazın:",
@@ -169,12 +382,40 @@ def process_user_question(user_question: str, api_key: str):
     """Kullanıcı sorusunu işler ve cevap üretir."""
     with st.spinner("🤔 Analiz ediyorum..."):
         try:
+            llm = get_llm_provider(api_key)
             dataset_stats = st.session_state.get('dataset_stats', {})
-            total_records = dataset_stats.get('total_rows', len(st.session_state.get('documents', [])))
+            total_records = dataset_stats.get('total_rows', st.session_state.get('document_count', 0))
+            
+            # 1. Filtreli/gruplu toplama sorusu mu? (tüm veri üzerinde kesin sonuç)
+            df = st.session_state.get('dataframe')
+            matcher = st.session_state.get('column_matcher')
+            query_answer = answer_query(user_question, df, matcher) if df is not None else None
             
-            # 1. İstatistiksel soru mu kontrol et
-            if is_statistical_query(user_question) and dataset_stats:
-                stat_answer = get_statistical_answer(user_question, dataset_stats)
+            if query_answer:
+                st.success("✅ **KESİN Analiz Sonucu (Tüm Veri Setinden):**")
+                st.markdown(query_answer['markdown'])
+                
+                st.session_state['chat_history'].append({
+                    'question': user_question,
+                    'answer': query_answer['markdown']
+                })
+                
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("📊 Veri Kaynağı", "Sorgu Motoru")
+                with col2:
+                    st.metric("🔎 Eşleşen Veri", f"{query_answer['matched_rows']:,}/{total_records:,}")
+                with col3:
+                    st.metric("⚡ Güvenilirlik", "100%")
+                
+                st.info("💡 Bu cevap **TÜM** veri seti üzerinde çalıştırılan sorgudan hesaplanmıştır.")
+                return
+            
+            # 2. İstatistiksel soru mu kontrol et (filtre/kısıt içeren sorular
+            # hesaplanmış tüm veri istatistikleriyle cevaplanamaz)
+            if (is_statistical_query(user_question) and dataset_stats
+                    and (df is None or is_plain_lookup(user_question, df, matcher))):
+                stat_answer = get_statistical_answer(user_question, dataset_stats, matcher)
                 
                 if stat_answer:
                     st.success("✅ **KESİN Analiz Sonucu (Tüm Veri Setinden):**")
@@ -196,14 +437,55 @@ def process_user_question(user_question: str, api_key: str):
                     st.info("💡 Bu cevap **TÜM** veri setinden hesaplanan kesin istatistiklere dayanmaktadır.")
                     return
             
-            # 2. RAG kullan
+            # 3. RAG kullan
             embedding_model = st.session_state['embedding_model']
             query_embedding = embedding_model.encode([user_question])[0]
             
-            collection = st.session_state['collection']
-            results = query_collection(collection, query_embedding, TOP_K_RESULTS)
+            # Sorudaki sütun/değer kısıtları Chroma where filtresi olarak aramaya iner
+            filters = extract_filters(user_question, df, matcher, infer_boolean=False) if df is not None else []
+            where = build_where_clause(filters)
+            # Önbellek anahtarı sorunun kendi filtresidir (filtresiz aramaya düşülse de)
+            question_where = where
+            
+            # Daha önce aynı filtreyle sorulmuş benzer bir soru varsa önbellekten cevapla
+            fingerprint = st.session_state.get('dataset_fingerprint')
+            if ANSWER_CACHE_ENABLED and fingerprint:
+                answer_cache = get_answer_cache()
+                cached = answer_cache.get(
+                    fingerprint, f"{llm.name}:{LLM_MODEL}", query_embedding, where=question_where
+                )
+                if cached:
+                    st.success("✅ **Analiz Sonucu (Önbellekten):**")
+                    st.markdown(cached['answer'])
+                    
+                    st.session_state['chat_history'].append({
+                        'question': user_question,
+                        'answer': cached['answer']
+                    })
+                    
+                    col1, col2, col3, col4 = st.columns(4)
+                    with col1:
+                        st.metric("🤖 Model", LLM_MODEL)
+                    with col2:
+                        st.metric("📊 Kullanılan Veri", f"{cached.get('context_count', 0)}/{total_records:,}")
+                    with col3:
+                        st.metric("🧮 Context Token", f"{cached.get('context_tokens', 0):,}/{CONTEXT_TOKEN_BUDGET:,}")
+                    with col4:
+                        st.metric("🎯 Benzerlik", f"%{cached['similarity'] * 100:.1f}")
+                    
+                    st.info(f"💡 Bu cevap benzer bir önceki sorudan alındı: *{cached['question']}*")
+                    render_sources(cached.get('sources', []))
+                    return
+            
+            results = retrieve_rows(user_question, query_embedding, where)
+            if where and not results['ids'][0]:
+                # Filtreye uyan satır yoksa filtresiz ara
+                filters, where = [], None
+                results = retrieve_rows(user_question, query_embedding)
             
-            context_docs = results['documents'][0]
+            context_docs, context_tokens = build_question_context(
+                user_question, results['metadatas'][0], df, matcher
+            )
             
             if not context_docs:
                 st.error("❌ **Üzgünüm, bu soruyu cevaplayamıyorum.**")
@@ -211,148 +493,69 @@ def process_user_question(user_question: str, api_key: str):
                 st.info("💡 **Önerim:** Daha genel bir soru sorun veya farklı kelimeler kullanın.")
                 return
             
-            context = "\n\n---\n\n".join(context_docs)
-            
-            # 3. DENGELI PROMPT
-            has_numeric = len(dataset_stats.get('numeric_columns', [])) > 0
-            has_categorical = len(dataset_stats.get('categorical_columns', [])) > 0
-            
-            numeric_cols_str = ", ".join(dataset_stats.get('numeric_columns', []))
-            categorical_cols_str = ", ".join(dataset_stats.get('categorical_columns', []))
+            context = CONTEXT_SEPARATOR.join(context_docs)
             
-            system_prompt = """Sen profesyonel bir veri analistisin. Hem hesaplama yaparsın hem yorumlarsın.
-
-İKİ TÜR SORU VAR:
-
-═══════════════════════════════════════
-📊 TİP 1: HESAPLAMA/İSTATİSTİK SORULARI
-═══════════════════════════════════════
-Örnekler:
-- "Ortalama/toplam/maksimum X nedir?"
-- "Kaç kişi Y özelliğine sahip?"
-- "X ile Y arasındaki fark?"
-
-YAPMAN GEREKEN:
-✅ Verilen kayıtlardan hesapla
-✅ Net rakam ver
-✅ "Bu X kayıttan hesaplandı" de
-✅ Yetersizse: "Kesin sonuç için tüm veriyi işlemek gerek" de
-
-═══════════════════════════════════════
-💡 TİP 2: GENEL/YORUMLAMA SORULARI
-═══════════════════════════════════════
-Örnekler:
-- "Bu veri setini açıkla"
-- "Ne amaçla kullanılır?"
-- "İş dünyasında ne anlama gelir?"
-- "Hangi kararlar alınabilir?"
-
-YAPMAN GEREKEN:
-✅ Veri setinin yapısını açıkla
-✅ Sütunları yorumla
-✅ İş/bilim açısından ne anlama geldiğini söyle
-✅ Kullanım alanlarını öner
-✅ Hangi soruların cevaplanabileceğini belirt
-
-ÖRNEK CEVAP (Sigorta veri seti için):
-"Bu veri seti sigorta şirketlerinin prim belirleme için kullanır. 
-Yaş, BMI, sigara gibi risk faktörleri ile sigorta maliyeti arasındaki 
-ilişkiyi analiz eder. Şirketler bu verileri kullanarak:
-- Risk profili oluşturur
-- Prim fiyatlandırması yapar
-- Yüksek riskli müşterileri tespit eder"
-
-═══════════════════════════════════════
-❌ YASAKLAR (SADECE BUNLAR!)
-═══════════════════════════════════════
-❌ Veri setinde OLMAYAN spesifik bilgileri UYDURMA (isim, adres, vb.)
-❌ Kesin olmayan rakamları kesinmiş gibi sunma
-❌ "Muhtemelen X kişidir" gibi spesifik tahminler yapma
-
-✅ İZİN VERİLENLER
-✅ Genel yorumlar: "Bu veri seti muhtemelen X amacıyla toplanmış"
-✅ İş yorumları: "Bu bilgiler Y için kullanılabilir"
-✅ Öneriler: "Z analizi yapılabilir"
-✅ Hesaplamalar: Verilen kayıtlardan hesapla
-
-CEVAP FORMATI:
-1. Direkt cevap
-2. Detaylı açıklama
-3. Kaynak bilgisi (hesaplama yapıldıysa)"""
-
-            user_prompt = f"""VERİ SETİ BİLGİLERİ:
-- Toplam: {total_records:,} kayıt
-- Analiz için kullanılan: {len(context_docs)} en alakalı kayıt
-- Sayısal sütunlar: {numeric_cols_str or "Yok"}
-- Kategorik sütunlar: {categorical_cols_str or "Yok"}
-
-═══════════════════════════════════════
-VERİ ÖRNEKLERİ (İlk {len(context_docs)} kayıt):
-═══════════════════════════════════════
-{context}
-
-═══════════════════════════════════════
-KULLANICI SORUSU:
-═══════════════════════════════════════
-{user_question}
-
-═══════════════════════════════════════
-TALİMATLAR:
-═══════════════════════════════════════
-1. Soru HESAPLAMA gerektiriyorsa → Kayıtlardan hesapla + "X kayıttan hesaplandı" de
-2. Soru GENEL/YORUM gerektiriyorsa → Veri yapısını yorumla, kullanım alanlarını söyle
-3. SPESİFİK bilgi yoksa → "Bu bilgi veri setinde yok" de
-4. Türkçe sütun adı varsa → İngilizce karşılığını bul ve kullan
-
-CEVAP VER:"""
+            # 4. DENGELI PROMPT
+            user_prompt = build_user_prompt(
+                user_question, context, len(context_docs), total_records, dataset_stats
+            )
             
-            # 4. LLM çağrısı
-            client = OpenAI(api_key=api_key)
-            response = client.chat.completions.create(
+            # 5. LLM çağrısı (streaming)
+            stream = llm.stream(
                 model=LLM_MODEL,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=LLM_TEMPERATURE,
                 max_tokens=LLM_MAX_TOKENS,
                 top_p=0.9
             )
-            answer = response.choices[0].message.content
             
-            # 5. Cevap gösterimi
+            # 6. Cevap gösterimi (token'lar geldikçe yazılır)
             st.success("✅ **Analiz Sonucu:**")
-            st.markdown(answer)
+            answer = st.write_stream(stream)
             
             st.session_state['chat_history'].append({
                 'question': user_question,
                 'answer': answer
             })
             
-            # 6. Meta bilgiler
-            col1, col2, col3 = st.columns(3)
+            # 7. Meta bilgiler
+            col1, col2, col3, col4 = st.columns(4)
             with col1:
                 st.metric("🤖 Model", LLM_MODEL)
             with col2:
                 st.metric("📊 Kullanılan Veri", f"{len(context_docs)}/{total_records:,}")
             with col3:
+                st.metric("🧮 Context Token", f"{context_tokens:,}/{CONTEXT_TOKEN_BUDGET:,}")
+            with col4:
                 reliability = int((len(context_docs) / total_records) * 100)
                 st.metric("⚡ Kapsam", f"~{reliability}%")
             
-            # 7. UYARI (sadece hesaplama sorularında)
+            # 8. UYARI (sadece hesaplama sorularında)
             if is_statistical_query(user_question):
+                numeric_cols = dataset_stats.get('numeric_columns', [])
                 st.warning(f"""⚠️ **NOT:** Bu hesaplama {len(context_docs)} kayıttan yapıldı.
 
 **Kesin istatistik için:**
-Sütun isimlerini kullanın: `{numeric_cols_str.split(',')[0] if numeric_cols_str else 'N/A'}`""")
+Sütun isimlerini kullanın: `{numeric_cols[0] if numeric_cols else 'N/A'}`""")
+            
+            if filters:
+                st.caption(f"🔎 Arama ön filtresi: `{describe_filters(filters)}`")
+            
+            # 9. Kaynaklar
+            render_sources(context_docs)
             
-            # 8. Kaynaklar
-            with st.expander(f"📚 Kullanılan {min(len(context_docs), 5)} Veri Kaynağı"):
-                for i, doc in enumerate(context_docs[:5], 1):
-                    st.markdown(f"**📄 Kaynak {i}:**")
-                    st.code(doc[:400] + ("..." if len(doc) > 400 else ""), language="text")
-                    if i < 5:
-                        st.divider()
+            # 10. Önbelleğe yaz
+            if ANSWER_CACHE_ENABLED and fingerprint:
+                answer_cache.put(
+                    fingerprint, f"{llm.name}:{LLM_MODEL}", user_question, query_embedding, answer,
+                    where=question_where,
+                    context_count=len(context_docs),
+                    context_tokens=context_tokens,
+                    sources=[doc[:400] for doc in context_docs[:5]]
+                )
         
         except Exception as e:
             st.error(f"❌ Bir hata oluştu: {str(e)}")
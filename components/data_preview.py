@@ -5,12 +5,13 @@ import streamlit as st
 import pandas as pd
 
 
-def render_data_preview(df: pd.DataFrame):
+def render_data_preview(df: pd.DataFrame, load_report: dict = None):
     """
     Veri setinin önizlemesini gösterir.
     
     Args:
         df: Pandas DataFrame
+        load_report: CSV yükleme bellek raporu (load_csv_with_report)
     """
     # Veri seti bilgileri
     st.subheader("📊 Veri Seti Bilgileri")
@@ -38,6 +39,23 @@ def render_data_preview(df: pd.DataFrame):
         st.write(df.dtypes)
         st.write("**Eksik Değerler:**")
         st.write(df.isnull().sum())
+        
+        if load_report:
+            st.write("**Bellek Kullanımı:**")
+            col1, col2, col3 = st.columns(3)
+            before_mb = load_report['memory_before'] / 1024 ** 2
+            after_mb = load_report['memory_after'] / 1024 ** 2
+            with col1:
+                st.metric("Varsayılan Tipler", f"{before_mb:.1f} MB")
+            with col2:
+                st.metric(
+                    "Optimize Tipler",
+                    f"{after_mb:.1f} MB",
+                    delta=f"{after_mb - before_mb:.1f} MB",
+                    delta_color="inverse"
+                )
+            with col3:
+                st.metric("CSV Motoru", load_report['engine'])
 
 
 def render_example_format():
@@ -1,33 +1,150 @@
 """
 RAG işleme bileşeni - Embedding ve Vector Store hazırlığı
 """
+import os
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import time
 import pandas as pd
-from utils.data_loader import prepare_documents, get_column_types
-from utils.embeddings import load_embedding_model, create_embeddings_batch
+from utils.data_loader import (
+    iter_document_chunks,
+    get_column_types
+)
+from utils.analysis_cache import AnalysisCache, get_analysis_cache
+from utils.column_matcher import build_column_matcher
+from utils.lexical_index import BM25Builder, BM25Index
+from utils.embeddings import (
+    load_embedding_model,
+    get_embedding_cache,
+    create_embeddings_batch,
+    create_embeddings_cached,
+    resolve_worker_count
+)
 from utils.vector_store import (
-    create_chroma_client,
+    create_vector_client,
+    resolve_vector_backend,
     create_or_reset_collection,
-    add_documents_to_collection
+    dataset_collection_name,
+    open_dataset_collection,
+    sync_dataset_collection,
+    finalize_dataset_collection,
+    delete_superseded_collections,
+    delete_collection_if_exists,
+    hnsw_metadata
 )
 from config.settings import (
     EMBEDDING_MODEL,
+    EMBEDDING_CACHE_ENABLED,
     BATCH_SIZE,
-    COLLECTION_NAME
+    EMBEDDING_WORKERS,
+    DOCUMENT_CHUNK_SIZE,
+    COLLECTION_NAME,
+    VECTORSTORE_PERSIST,
+    VECTORSTORE_DIR,
+    VECTORSTORE_RETENTION_DAYS,
+    HNSW_SPACE,
+    HNSW_M,
+    HNSW_EF_CONSTRUCTION,
+    HNSW_EF_SEARCH,
+    VECTOR_BACKEND,
+    NUMPY_BACKEND_MAX_ROWS,
+    NUMPY_VECTOR_DTYPE,
+    NUMPY_RERANK_FACTOR,
+    HYBRID_SEARCH_ENABLED,
+    BM25_K1,
+    BM25_B
 )
 
 
-def calculate_dataset_statistics(df: pd.DataFrame) -> dict:
+def create_backend_client(backend: str, persist_directory: str = None):
+    """Ayarlardaki NumPy seçenekleriyle backend client'ı oluşturur."""
+    return create_vector_client(
+        backend,
+        persist_directory=persist_directory,
+        quantization=NUMPY_VECTOR_DTYPE,
+        rerank_factor=NUMPY_RERANK_FACTOR
+    )
+
+
+@st.cache_resource
+def get_persistent_vector_client(backend: str):
+    """Backend'in kalıcı client'ını oluşturur (süreç boyunca cache'lenir)."""
+    if backend == "chroma":
+        return create_backend_client(backend, VECTORSTORE_DIR)
+    return create_backend_client(backend, os.path.join(VECTORSTORE_DIR, backend))
+
+
+def lexical_index_path(collection_name: str) -> str:
+    """Collection'ın kalıcı BM25 indeks dosyasının yolunu döndürür."""
+    return os.path.join(VECTORSTORE_DIR, "lexical", f"{collection_name}.npz")
+
+
+def get_dataset_owner() -> str:
+    """
+    Kalıcı collection'ların sahibini döndürür.
+    
+    Giriş yapılmışsa kullanıcının e-postası (oturumlar arasında sabit),
+    değilse Streamlit oturum id'si kullanılır.
+    
+    Returns:
+        str: Sahip anahtarı
+    """
+    try:
+        if st.user.is_logged_in:
+            return st.user.email
+    except (AttributeError, KeyError):
+        pass
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else "local"
+
+
+def cleanup_superseded_collections(backend: str, collection_name: str):
+    """
+    Kullanımdaki collection dışında artık geçersiz olan kopyaları siler.
+    
+    Eski düzendeki (parmak izi adlı) collection'lar ve saklama süresini
+    (`VECTORSTORE_RETENTION_DAYS`) aşanlar, BM25 dosyalarıyla birlikte
+    silinir. Backend otomatik seçiliyorsa veri seti satır sayısı eşiği
+    geçince diğer backend'e taşınır; oradaki eski kopyası da silinir.
+    
+    Args:
+        backend: Kullanımdaki backend
+        collection_name: Kullanımdaki collection adı
+    """
+    max_age_seconds = VECTORSTORE_RETENTION_DAYS * 24 * 3600
+    try:
+        deleted = delete_superseded_collections(
+            get_persistent_vector_client(backend), COLLECTION_NAME,
+            keep_name=collection_name, max_age_seconds=max_age_seconds
+        )
+        if VECTOR_BACKEND == "auto":
+            other_client = get_persistent_vector_client("chroma" if backend == "numpy" else "numpy")
+            deleted += delete_superseded_collections(
+                other_client, COLLECTION_NAME, max_age_seconds=max_age_seconds
+            )
+            delete_collection_if_exists(other_client, collection_name)
+        for name in deleted:
+            path = lexical_index_path(name)
+            if os.path.exists(path):
+                os.remove(path)
+    except Exception as e:
+        st.warning(f"⚠️ Eski collection'lar silinemedi: {str(e)}")
+
+
+def calculate_dataset_statistics(df: pd.DataFrame, analysis_cache: AnalysisCache = None) -> dict:
     """
     Veri setinin istatistiklerini önceden hesaplar.
     
     Args:
         df: Pandas DataFrame
+        analysis_cache: Verilirse analiz sekmeleriyle ortak sonuçlar kullanılır
         
     Returns:
         dict: Hesaplanmış tüm istatistikler
     """
+    if analysis_cache is None:
+        analysis_cache = AnalysisCache(df, fingerprint=None)
+    
     numeric_cols, categorical_cols = get_column_types(df)
     
     stats = {
@@ -39,42 +156,46 @@ def calculate_dataset_statistics(df: pd.DataFrame) -> dict:
         'categorical_stats': {}
     }
     
-    # Sayısal sütunlar için istatistikler
-    for col in numeric_cols:
+    # Sayısal sütunlar için istatistikler (tek vektörel geçiş)
+    numeric_summary = analysis_cache.numeric_summary(numeric_cols)
+    total_rows = max(len(df), 1)
+    for col, row in numeric_summary.iterrows():
         stats['numeric_stats'][col] = {
-            'mean': float(df[col].mean()),
-            'median': float(df[col].median()),
-            'std': float(df[col].std()),
-            'min': float(df[col].min()),
-            'max': float(df[col].max()),
-            'q1': float(df[col].quantile(0.25)),
-            'q3': float(df[col].quantile(0.75)),
-            'missing': int(df[col].isna().sum()),
-            'missing_pct': float(df[col].isna().sum() / len(df) * 100)
+            'mean': float(row['mean']),
+            'median': float(row['median']),
+            'std': float(row['std']),
+            'min': float(row['min']),
+            'max': float(row['max']),
+            'q1': float(row['q1']),
+            'q3': float(row['q3']),
+            'missing': int(row['missing']),
+            'missing_pct': float(row['missing'] / total_rows * 100)
         }
     
-    # Kategorik sütunlar için istatistikler
+    # Kategorik sütunlar için istatistikler (sütun başına tek value_counts)
     for col in categorical_cols:
-        value_counts = df[col].value_counts()
+        summary = analysis_cache.categorical_summary(col)
+        value_counts = summary['counts']
         stats['categorical_stats'][col] = {
-            'unique_count': int(df[col].nunique()),
+            'unique_count': int(len(value_counts)),
             'most_common': str(value_counts.index[0]) if len(value_counts) > 0 else None,
             'most_common_count': int(value_counts.iloc[0]) if len(value_counts) > 0 else 0,
-            'most_common_pct': float(value_counts.iloc[0] / len(df) * 100) if len(value_counts) > 0 else 0,
+            'most_common_pct': float(value_counts.iloc[0] / total_rows * 100) if len(value_counts) > 0 else 0,
             'distribution': {str(k): int(v) for k, v in value_counts.head(10).items()},
-            'missing': int(df[col].isna().sum()),
-            'missing_pct': float(df[col].isna().sum() / len(df) * 100)
+            'missing': summary['missing'],
+            'missing_pct': float(summary['missing'] / total_rows * 100)
         }
     
     return stats
 
 
-def render_rag_preparation(df):
+def render_rag_preparation(df, dataset_name: str = None):
     """
     RAG sistemi hazırlık bölümünü render eder.
     
     Args:
         df: Pandas DataFrame
+        dataset_name: Yüklenen dosyanın adı (kalıcı collection kimliği için)
     """
     st.divider()
     st.subheader("🧠 RAG Sistemi Hazırlığı")
@@ -87,14 +208,17 @@ def render_rag_preparation(df):
             # ═══════════════════════════════════════
             # ADIM 0: İSTATİSTİK HESAPLAMA (YENİ!)
             # ═══════════════════════════════════════
-            main_status.markdown("### 🔄 Adım 0/5: İstatistikler hesaplanıyor...")
+            main_status.markdown("### 🔄 Adım 0/3: İstatistikler hesaplanıyor...")
             step0_progress = st.progress(0)
             step0_status = st.empty()
             
             step0_status.text("📊 Veri seti analiz ediliyor...")
             step0_progress.progress(0.3)
             
-            dataset_stats = calculate_dataset_statistics(df)
+            analysis_cache = get_analysis_cache(df)
+            dataset_stats = analysis_cache.cached(
+                ('dataset_statistics',), lambda: calculate_dataset_statistics(df, analysis_cache)
+            )
             
             step0_progress.progress(1.0)
             step0_status.empty()
@@ -102,146 +226,208 @@ def render_rag_preparation(df):
             st.success(f"✅ Adım 0 tamamlandı: {len(df):,} satır ve {len(df.columns)} sütun analiz edildi")
             main_progress.progress(0.15)
             
-            time.sleep(0.3)
-            
             # ═══════════════════════════════════════
-            # ADIM 1/5: VERİ HAZIRLAMA
+            # ADIM 1/3: EMBEDDING MODEL YÜKLEME
             # ═══════════════════════════════════════
-            main_status.markdown("### 🔄 Adım 1/5: Veri hazırlanıyor...")
+            main_status.markdown("### 🔄 Adım 1/3: Embedding modeli yükleniyor...")
             step1_progress = st.progress(0)
             step1_status = st.empty()
             
-            documents = prepare_documents(df)
-            total_rows = len(df)
+            step1_status.text("📥 Model indiriliyor...")
+            step1_progress.progress(0.3)
             
-            for idx in range(total_rows):
-                if idx % 100 == 0 or idx == total_rows - 1:
-                    progress = (idx + 1) / total_rows
-                    step1_progress.progress(progress)
-                    step1_status.text(f"📊 {idx + 1:,}/{total_rows:,} satır işlendi")
+            embedding_model = load_embedding_model(EMBEDDING_MODEL)
             
             step1_progress.progress(1.0)
             step1_status.empty()
             step1_progress.empty()
-            st.success(f"✅ Adım 1 tamamlandı: {len(documents):,} döküman oluşturuldu")
-            main_progress.progress(0.30)
-            
-            with st.expander("🔍 Örnek Dökümanlar (İlk 3)"):
-                for i in range(min(3, len(documents))):
-                    st.code(documents[i]['text'][:200] + "...", language="text")
-            
-            time.sleep(0.3)
-            
-            # ═══════════════════════════════════════
-            # ADIM 2/5: EMBEDDING MODEL YÜKLEME
-            # ═══════════════════════════════════════
-            main_status.markdown("### 🔄 Adım 2/5: Embedding modeli yükleniyor...")
-            step2_progress = st.progress(0)
-            step2_status = st.empty()
-            
-            step2_status.text("📥 Model indiriliyor...")
-            step2_progress.progress(0.3)
-            
-            embedding_model = load_embedding_model(EMBEDDING_MODEL)
-            
-            step2_progress.progress(1.0)
-            step2_status.empty()
-            step2_progress.empty()
-            st.success(f"✅ Adım 2 tamamlandı: Model yüklendi ({EMBEDDING_MODEL})")
-            main_progress.progress(0.45)
-            
-            time.sleep(0.3)
+            st.success(f"✅ Adım 1 tamamlandı: Model yüklendi ({EMBEDDING_MODEL})")
+            main_progress.progress(0.25)
             
             # ═══════════════════════════════════════
-            # ADIM 3/5: EMBEDDING OLUŞTURMA
+            # KALICI VECTOR STORE KONTROLÜ
             # ═══════════════════════════════════════
-            main_status.markdown("### 🔄 Adım 3/5: Embeddings oluşturuluyor...")
-            step3_progress = st.progress(0)
-            step3_status = st.empty()
-            
-            texts = [doc['text'] for doc in documents]
-            start_time = time.time()
-            
-            def progress_callback(current, total, progress, remaining):
-                step3_progress.progress(progress)
-                step3_status.text(
-                    f"📊 {current:,}/{total:,} döküman ({progress*100:.1f}%) | "
-                    f"Kalan: ~{int(remaining/60)}dk {int(remaining%60)}sn"
-                )
-            
-            embeddings = create_embeddings_batch(
-                texts,
-                embedding_model,
-                batch_size=BATCH_SIZE,
-                progress_callback=progress_callback
-            )
-            
-            total_time = time.time() - start_time
-            
-            step3_progress.progress(1.0)
-            step3_status.empty()
-            step3_progress.empty()
-            st.success(
-                f"✅ Adım 3 tamamlandı: {len(embeddings):,} embedding oluşturuldu "
-                f"({int(total_time/60)}dk {int(total_time%60)}sn)"
+            # Collection veri setinin kimliğiyle (sahip + dosya adı) adlandırılır:
+            # client tüm oturumlarda ortak olduğundan sahip, aynı adlı dosyaları
+            # ayırır; dosya düzenlenip tekrar yüklenince aynı collection artımlı
+            # güncellenir. İçerik parmak izi metadata'da tutulur; aynı içerik
+            # daha önce indekslendiyse embedding ve kaydetme atlanır
+            fingerprint = analysis_cache.fingerprint
+            total_rows = len(df)
+            # Küçük veri setlerinde brute-force NumPy araması Chroma'dan hızlıdır
+            backend = resolve_vector_backend(total_rows, VECTOR_BACKEND, NUMPY_BACKEND_MAX_ROWS)
+            index_params = (
+                hnsw_metadata(HNSW_SPACE, HNSW_M, HNSW_EF_CONSTRUCTION, HNSW_EF_SEARCH)
+                if backend == "chroma" else None
             )
-            st.info(f"📐 Embedding boyutu: {embeddings.shape[0]:,} × {embeddings.shape[1]} boyut")
-            main_progress.progress(0.70)
+            if VECTORSTORE_PERSIST:
+                client = get_persistent_vector_client(backend)
+                collection_name = dataset_collection_name(
+                    COLLECTION_NAME, f"{get_dataset_owner()}\x1f{dataset_name or 'dataset'}"
+                )
+                collection, already_indexed = open_dataset_collection(
+                    client,
+                    collection_name,
+                    fingerprint=fingerprint,
+                    columns=list(df.columns),
+                    expected_count=total_rows,
+                    index_params=index_params
+                )
+            else:
+                client = create_backend_client(backend)
+                collection = create_or_reset_collection(
+                    client, COLLECTION_NAME, index_params=index_params
+                )
+                already_indexed = False
             
-            time.sleep(0.3)
+            # Veri seti hazırsa BM25 indeksi de diskten açılır; dökümanlar hiç oluşturulmaz
+            lexical_path = lexical_index_path(collection_name) if VECTORSTORE_PERSIST else None
+            lexical_index = None
+            if already_indexed and HYBRID_SEARCH_ENABLED:
+                lexical_index = BM25Index.load(lexical_path, fingerprint, k1=BM25_K1, b=BM25_B)
+            needs_documents = not already_indexed or (HYBRID_SEARCH_ENABLED and lexical_index is None)
             
             # ═══════════════════════════════════════
-            # ADIM 4/5: VECTOR STORE KAYDETME
+            # ADIM 2/3: DÖKÜMAN → EMBEDDING → VECTOR STORE (AKIŞ HALİNDE)
             # ═══════════════════════════════════════
-            main_status.markdown("### 🔄 Adım 4/5: Vector store'a kaydediliyor...")
-            step4_progress = st.progress(0)
-            step4_status = st.empty()
-            
-            step4_status.text("🔧 ChromaDB başlatılıyor...")
-            step4_progress.progress(0.2)
-            client = create_chroma_client()
-            
-            step4_status.text("📦 Collection oluşturuluyor...")
-            step4_progress.progress(0.4)
-            collection = create_or_reset_collection(client, COLLECTION_NAME)
-            
-            step4_status.text("💾 Veriler kaydediliyor...")
-            step4_progress.progress(0.6)
-            add_documents_to_collection(collection, documents, embeddings, texts)
-            
-            step4_progress.progress(1.0)
-            step4_status.empty()
-            step4_progress.empty()
-            st.success("✅ Adım 4 tamamlandı: Vector store hazır")
+            # Her parça oluşturulur oluşturulmaz embedding'e çevrilip yazılır;
+            # bellekte tüm dökümanlar yerine yalnızca tek parça ve id/hash'ler durur
+            sample_texts = []
+            if not needs_documents:
+                st.success(
+                    f"✅ Adım 2 atlandı: Bu veri seti daha önce indekslenmiş "
+                    f"({collection.count():,} embedding diskten yüklendi)"
+                )
+            else:
+                main_status.markdown("### 🔄 Adım 2/3: Dökümanlar embedding'e çevrilip kaydediliyor...")
+                step2_progress = st.progress(0)
+                step2_status = st.empty()
+                
+                lexical_builder = BM25Builder() if HYBRID_SEARCH_ENABLED else None
+                processed = {'rows': 0, 'cached': 0}
+                workers = resolve_worker_count(EMBEDDING_WORKERS)
+                embedding_cache = get_embedding_cache(EMBEDDING_MODEL) if EMBEDDING_CACHE_ENABLED else None
+                start_time = time.time()
+                
+                def embed_texts(texts):
+                    if embedding_cache is not None:
+                        embeddings, cached_count = create_embeddings_cached(
+                            texts,
+                            embedding_model,
+                            embedding_cache,
+                            batch_size=BATCH_SIZE,
+                            workers=workers
+                        )
+                        processed['cached'] += cached_count
+                        return embeddings
+                    return create_embeddings_batch(
+                        texts,
+                        embedding_model,
+                        batch_size=BATCH_SIZE,
+                        workers=workers
+                    )
+                
+                def on_chunk(chunk, written):
+                    if lexical_builder is not None:
+                        # Hibrit arama için BM25 indeksi (collection ile aynı id'ler)
+                        lexical_builder.add([doc['id'] for doc in chunk], [doc['text'] for doc in chunk])
+                    if len(sample_texts) < 3:
+                        sample_texts.extend(doc['text'] for doc in chunk[:3 - len(sample_texts)])
+                    processed['rows'] += len(chunk)
+                    progress = processed['rows'] / max(total_rows, 1)
+                    elapsed = time.time() - start_time
+                    remaining = (elapsed / progress) - elapsed if progress > 0 else 0
+                    step2_progress.progress(progress)
+                    step2_status.text(
+                        f"📊 {processed['rows']:,}/{total_rows:,} satır ({progress*100:.1f}%) | "
+                        f"Kalan: ~{int(remaining/60)}dk {int(remaining%60)}sn"
+                    )
+                
+                chunks = iter_document_chunks(df, chunk_size=DOCUMENT_CHUNK_SIZE)
+                if already_indexed:
+                    # Embedding'ler hazır, sadece BM25 dosyası eksik: metinler onun için dolaşılır
+                    for chunk in chunks:
+                        on_chunk(chunk, 0)
+                    sync_result = {'rows': total_rows, 'upserted': 0, 'deleted': 0}
+                else:
+                    sync_result = sync_dataset_collection(collection, chunks, embed_texts, on_chunk)
+                    if embedding_cache is not None:
+                        # Önbellek index'i parça başına değil, çalışma sonunda bir kez yazılır
+                        embedding_cache.flush()
+                    if VECTORSTORE_PERSIST:
+                        finalize_dataset_collection(collection, fingerprint)
+                
+                if lexical_builder is not None:
+                    lexical_index = lexical_builder.build(k1=BM25_K1, b=BM25_B)
+                    if lexical_path:
+                        lexical_index.save(lexical_path, fingerprint)
+                total_time = time.time() - start_time
+                
+                step2_progress.progress(1.0)
+                step2_status.empty()
+                step2_progress.empty()
+                if already_indexed:
+                    st.success(
+                        f"✅ Adım 2 tamamlandı: Embedding'ler diskten yüklendi, "
+                        f"BM25 indeksi oluşturuldu ({collection.count():,} döküman)"
+                    )
+                else:
+                    st.success(
+                        f"✅ Adım 2 tamamlandı: {sync_result['rows']:,} döküman, "
+                        f"{sync_result['upserted']:,} embedding yazıldı "
+                        f"({int(total_time/60)}dk {int(total_time%60)}sn, {backend})"
+                    )
+                    if sync_result['upserted'] < sync_result['rows'] or sync_result['deleted']:
+                        st.info(
+                            f"🔁 Artımlı güncelleme: {sync_result['upserted']:,} yeni/değişen, "
+                            f"{sync_result['deleted']:,} silinen satır"
+                        )
+                    if processed['cached'] > 0:
+                        st.info(
+                            f"💾 {processed['cached']:,} embedding önbellekten alındı, "
+                            f"{sync_result['upserted'] - processed['cached']:,} yeni satır işlendi"
+                        )
+            
+            if VECTORSTORE_PERSIST:
+                cleanup_superseded_collections(backend, collection_name)
             main_progress.progress(0.90)
             
-            time.sleep(0.3)
+            if sample_texts:
+                with st.expander("🔍 Örnek Dökümanlar (İlk 3)"):
+                    for text in sample_texts:
+                        st.code(text[:200] + "...", language="text")
             
             # ═══════════════════════════════════════
-            # ADIM 5/5: SESSION STATE'E KAYDETME (YENİ!)
+            # ADIM 3/3: SESSION STATE'E KAYDETME (YENİ!)
             # ═══════════════════════════════════════
-            main_status.markdown("### 🔄 Adım 5/5: Sistem hazırlanıyor...")
-            step5_progress = st.progress(0)
-            step5_status = st.empty()
+            main_status.markdown("### 🔄 Adım 3/3: Sistem hazırlanıyor...")
+            step3_progress = st.progress(0)
+            step3_status = st.empty()
+            
+            step3_status.text("🔤 Sütun eşleştirici derleniyor...")
+            column_matcher = build_column_matcher(df)
+            step3_progress.progress(0.3)
             
-            step5_status.text("💾 Veriler hafızaya kaydediliyor...")
-            step5_progress.progress(0.5)
+            step3_status.text("💾 Veriler hafızaya kaydediliyor...")
+            step3_progress.progress(0.5)
             
             # Session state'e kaydet
             st.session_state['collection'] = collection
             st.session_state['embedding_model'] = embedding_model
-            st.session_state['documents'] = documents
+            st.session_state['document_count'] = total_rows
             st.session_state['dataset_stats'] = dataset_stats  # ← YENİ!
             st.session_state['dataframe'] = df  # ← YENİ! (Chatbot için)
+            st.session_state['dataset_fingerprint'] = fingerprint
+            st.session_state['column_matcher'] = column_matcher
+            st.session_state['lexical_index'] = lexical_index
+            st.session_state.pop('batch_results', None)
             
-            step5_progress.progress(1.0)
-            step5_status.empty()
-            step5_progress.empty()
-            st.success("✅ Adım 5 tamamlandı: Tüm veriler hafızada")
+            step3_progress.progress(1.0)
+            step3_status.empty()
+            step3_progress.empty()
+            st.success("✅ Adım 3 tamamlandı: Tüm veriler hafızada")
             main_progress.progress(1.0)
             
-            time.sleep(0.5)
-            
             # Ana progress temizle
             main_progress.empty()
             main_status.empty()
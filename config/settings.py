@@ -14,17 +14,76 @@ LAYOUT = "wide"
 # 🤖 YAPAY ZEKA MODEL AYARLARI
 # ═══════════════════════════════════════════
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"    # Metin vektörleştirme modeli
+LLM_PROVIDER = "openai"                 # "openai" veya "stub" (API'siz yerel test/benchmark)
 LLM_MODEL = "gpt-4o"                    # Cevap üretici AI modeli
+ANALYSIS_LLM_MODEL = "gpt-3.5-turbo"    # Grafik yorumları ve içgörüler için model
 LLM_TEMPERATURE = 0.1                   # ✅ 0.3 → 0.1 (daha az uydurma)
 LLM_MAX_TOKENS = 1500                   # Maksimum cevap uzunluğu
 LLM_TOP_P = 0.9                         # Kelime çeşitliliği kontrolü
+LLM_TIMEOUT_SECONDS = 60                # İstek zaman aşımı (okuma/yazma)
+LLM_CONNECT_TIMEOUT_SECONDS = 10        # Bağlantı kurma zaman aşımı
+LLM_MAX_RETRIES = 3                     # Geçici hatalarda tekrar deneme (üstel bekleme)
+LLM_MAX_CONNECTIONS = 20                # HTTP bağlantı havuzu boyutu
+LLM_KEEPALIVE_CONNECTIONS = 10          # Açık tutulan (keep-alive) bağlantı sayısı
+LLM_KEEPALIVE_EXPIRY_SECONDS = 60       # Boşta bağlantının açık kalma süresi
+LLM_STUB_LATENCY_SECONDS = 0.5          # Stub: ilk cevaba kadar bekleme
+LLM_STUB_TOKEN_LATENCY_SECONDS = 0.01   # Stub: kelime başına bekleme
+LLM_BATCH_CONCURRENCY = 5               # Toplu soru modunda aynı anda açık LLM isteği
+BATCH_QUESTION_LIMIT = 100              # Toplu soru modunda tek seferde maksimum soru
+ANALYSIS_LLM_CONCURRENCY = 6            # "Tümünü Analiz Et" modunda aynı anda açık LLM isteği
+
+# ═══════════════════════════════════════════
+# 📥 CSV YÜKLEME AYARLARI
+# ═══════════════════════════════════════════
+CSV_CHUNK_SIZE = 50_000                 # Tip çıkarımı için parça parça okuma boyutu (satır)
+CSV_OPTIMIZE_DTYPES = True              # int/float küçültme + category dönüşümü
+CSV_ENGINE = "c"                        # "c" veya "pyarrow" (kuruluysa)
+DATASET_CACHE_MAX_MB = 1024             # Parse edilmiş veri setleri için bellek sınırı (tüm oturumlar)
 
 # ═══════════════════════════════════════════
 # 🔍 RAG SİSTEM AYARLARI
 # ═══════════════════════════════════════════
-BATCH_SIZE = 100                        # Veri işleme toplu boyutu
-TOP_K_RESULTS = 100                     # Her aramada getirilen sonuç sayısı
+BATCH_SIZE = 256                        # Maksimum embedding batch boyutu (adaptif)
+EMBEDDING_WORKERS = 1                   # Embedding işlem sayısı (1 = tek işlem, 0 = tüm çekirdekler)
+EMBEDDING_MULTIPROCESS_MIN_ROWS = 20_000  # Çok işlemli mod için minimum satır sayısı
+DOCUMENT_CHUNK_SIZE = 5000              # Döküman oluşturma parça boyutu (satır)
+TOP_K_RESULTS = 20                      # Her aramada getirilen sonuç sayısı (hibrit sıralama sonrası)
+HYBRID_SEARCH_ENABLED = True            # Vektör + BM25 aramasını RRF ile birleştir
+HYBRID_CANDIDATES = 50                  # Hibrit aramada her yöntemden alınan aday sayısı
+RRF_K = 60                              # Reciprocal Rank Fusion sabiti
+BM25_K1 = 1.5                           # BM25 terim frekansı doyumu
+BM25_B = 0.75                           # BM25 döküman uzunluğu normalizasyonu
+CONTEXT_TOKEN_BUDGET = 6000             # LLM'e gönderilen veri örnekleri için token bütçesi
 COLLECTION_NAME = "user_dataset"        # Dinamik veri koleksiyonu
+VECTORSTORE_PERSIST = True              # Collection'ları diske kaydet (sahip + dosya adına göre)
+VECTORSTORE_DIR = "vectorstore"         # Kalıcı vector store dizini
+VECTORSTORE_RETENTION_DAYS = 7          # Bu kadar gün güncellenmeyen collection'lar silinir (0 = süresiz)
+HNSW_SPACE = "cosine"                   # Vektör mesafe fonksiyonu
+HNSW_M = 16                             # HNSW düğüm başına komşu sayısı
+HNSW_EF_CONSTRUCTION = 200              # İndeks kurulum isabeti (yüksek = yavaş kurulum, iyi graf)
+HNSW_EF_SEARCH = 100                    # Sorgu isabeti (yüksek = yavaş, daha isabetli arama)
+VECTOR_BACKEND = "auto"                 # "auto", "chroma" veya "numpy" (brute-force, kesin sonuç)
+NUMPY_BACKEND_MAX_ROWS = 50_000         # "auto" modunda bu satır sayısına kadar NumPy backend'i
+NUMPY_VECTOR_DTYPE = "float32"          # NumPy taraması için vektör tipi (float32 / float16 / int8)
+NUMPY_RERANK_FACTOR = 4                 # float16/int8 taramasından sonra tam puanlanan aday çarpanı
+
+# ═══════════════════════════════════════════
+# 💾 ÖNBELLEK AYARLARI
+# ═══════════════════════════════════════════
+EMBEDDING_CACHE_ENABLED = True          # Embedding'leri diskte önbellekle
+EMBEDDING_CACHE_DIR = "vectorstore/embedding_cache"  # Önbellek dizini
+EMBEDDING_CACHE_MAX_ENTRIES = 200_000   # LRU ile tutulacak maksimum embedding sayısı
+EMBEDDING_CACHE_DTYPE = "float16"       # Diskteki vektör tipi (float16 / float32)
+ANSWER_CACHE_ENABLED = True             # Benzer sorulara önbellekten cevap ver
+ANSWER_CACHE_THRESHOLD = 0.95           # Soru embedding'leri için minimum kosinüs benzerliği
+ANSWER_CACHE_TTL_SECONDS = 24 * 3600    # Cevapların geçerlilik süresi (0 = süresiz)
+ANSWER_CACHE_MAX_ENTRIES = 500          # LRU ile tutulacak maksimum cevap sayısı
+ANSWER_CACHE_PATH = "vectorstore/answer_cache.json"  # Kalıcı önbellek dosyası (None = sadece bellek)
+CHART_CACHE_ENABLED = True              # AI grafik yorumlarını önbellekle
+CHART_CACHE_MAX_ENTRIES = 256           # Bellekte LRU ile tutulacak yorum sayısı
+CHART_CACHE_DIR = "vectorstore/chart_cache"  # Disk katmanı dizini (None = sadece bellek)
+CHART_CACHE_MAX_DISK_ENTRIES = 2000     # Diskte tutulacak yorum sayısı (en eskiler silinir)
+CHART_CACHE_TTL_SECONDS = 7 * 24 * 3600  # Yorumların saklanma süresi (0 = süresiz)
 
 # ═══════════════════════════════════════════
 # 📊 VERİ ANALİZİ AYARLARI
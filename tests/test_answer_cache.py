@@ -0,0 +1,23 @@
+"""
+Anlamsal cevap önbelleği testleri
+"""
+import numpy as np
+from utils.answer_cache import SemanticAnswerCache
+
+
+def test_answers_are_keyed_by_filter():
+    cache = SemanticAnswerCache(threshold=0.9)
+    embedding = np.array([1.0, 0.0, 0.0])
+    over_30 = {'age': {'$gt': 30}}
+    cache.put("fp", "model", "yaşı 30'dan büyük olanların ortalama masrafı?", embedding, "A", where=over_30)
+
+    assert cache.get("fp", "model", embedding, where={'age': {'$gt': 30}})['answer'] == "A"
+    assert cache.get("fp", "model", embedding, where={'age': {'$gt': 60}}) is None
+    assert cache.get("fp", "model", embedding) is None
+
+
+def test_filter_key_ignores_dict_order():
+    first = {'$and': [{'region': {'$eq': 'northeast'}}, {'age': {'$lt': 30, '$gt': 20}}]}
+    second = {'$and': [{'region': {'$eq': 'northeast'}}, {'age': {'$gt': 20, '$lt': 30}}]}
+    assert SemanticAnswerCache.filter_key(first) == SemanticAnswerCache.filter_key(second)
+    assert SemanticAnswerCache.filter_key(None) == SemanticAnswerCache.filter_key({})
@@ -0,0 +1,44 @@
+"""
+Sütun eşleştirici testleri
+"""
+import pytest
+from utils.column_matcher import ColumnMatcher
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return ColumnMatcher(
+        ['age', 'city', 'month', 'name', 'quantity', 'children', 'region'],
+        {'region': ['southwest', 'northeast']}
+    )
+
+
+@pytest.mark.parametrize("question", [
+    "ile",
+    "istanbul ile ankara",
+    "aya göre",
+    "bu ay",
+    "ada",
+    "ads",
+    "kaç adet var",
+])
+def test_short_words_are_not_columns(matcher, question):
+    assert matcher.find_columns(question) == {}
+
+
+@pytest.mark.parametrize("question, column", [
+    ("yaşı 30'dan büyük", 'age'),
+    ("şehirler", 'city'),
+    ("average age", 'age'),
+    ("çocuk sayısı", 'children'),
+    ("bölgeye göre", 'region'),
+    ("months", 'month'),
+    ("isimler", 'name'),
+    ("miktarı", 'quantity'),
+])
+def test_column_mentions(matcher, question, column):
+    assert list(matcher.find_columns(question)) == [column]
+
+
+def test_values_are_found(matcher):
+    assert matcher.find_values("charges in the Southwest") == {'region': ['southwest']}
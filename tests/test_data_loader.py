@@ -0,0 +1,38 @@
+"""
+Döküman metni üretimi testleri
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from utils.data_loader import build_document_texts, iter_document_chunks
+
+
+def iterrows_texts(df):
+    """Eski satır satır döküman metni üretimi (referans)."""
+    return [
+        " | ".join(f"{col}: {row[col]}" for col in df.columns)
+        for _, row in df.iterrows()
+    ]
+
+
+@pytest.mark.parametrize("df", [
+    pd.DataFrame({'age': [19, 33], 'bmi': [27.9, np.nan], 'children': [0, 3]}),
+    pd.DataFrame({'age': np.array([19, 33], dtype='int8'), 'bmi': np.array([27.9, 22.7], dtype='float32')}),
+    pd.DataFrame({'age': [19, 33], 'children': [0, 3]}),
+    pd.DataFrame({'age': [19, 33], 'region': ['southwest', None], 'smoker': [True, False]}),
+    pd.DataFrame({'region': pd.Categorical(['southwest', 'northeast']), 'charges': [16884.924, 1725.5523]}),
+    pd.DataFrame({'date': pd.to_datetime(['2020-01-01', '2021-02-03'])}),
+    pd.DataFrame({'age': pd.array([19, None], dtype='Int64'), 'bmi': [27.9, 22.7]}),
+], ids=["int-float", "compact", "all-int", "mixed", "category", "datetime", "nullable"])
+def test_texts_match_iterrows(df):
+    assert build_document_texts(df) == iterrows_texts(df)
+
+
+def test_chunks_cover_all_rows():
+    df = pd.DataFrame({'age': range(7), 'bmi': np.linspace(20, 30, 7)})
+    chunks = list(iter_document_chunks(df, chunk_size=3))
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    docs = [doc for chunk in chunks for doc in chunk]
+    assert [doc['id'] for doc in docs] == [f"doc_{i}" for i in range(7)]
+    assert [doc['text'] for doc in docs] == iterrows_texts(df)
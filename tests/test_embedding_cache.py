@@ -0,0 +1,35 @@
+"""
+Embedding önbelleği testleri
+"""
+import os
+import numpy as np
+from utils.embedding_cache import INDEX_FILE, EmbeddingCache
+
+
+def vectors(*values):
+    return np.repeat(np.asarray(values, dtype=np.float32)[:, None], 4, axis=1)
+
+
+def test_index_is_written_on_flush_not_per_batch(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model", max_entries=10, flush_interval=3600)
+    index_path = os.path.join(cache.directory, INDEX_FILE)
+    for i in range(3):
+        cache.put_many([f"text-{i}"], vectors(i))
+    assert not os.path.exists(index_path)
+
+    cache.flush()
+    embeddings, hits = EmbeddingCache(str(tmp_path), "model", max_entries=10).get_many(["text-1", "text-2"])
+    assert hits.all()
+    np.testing.assert_allclose(embeddings[:, 0], [1, 2])
+
+
+def test_reused_slot_behind_stale_index_is_a_miss(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model", max_entries=2, flush_interval=3600)
+    cache.put_many(["a", "b"], vectors(1, 2))
+    cache.flush()
+    # "a"nın slotu "c"ye verilir; diskteki index hâlâ "a"yı gösterir
+    cache.put_many(["c"], vectors(3))
+
+    embeddings, hits = EmbeddingCache(str(tmp_path), "model", max_entries=2).get_many(["a", "b"])
+    assert hits.tolist() == [False, True]
+    assert embeddings[1, 0] == 2
@@ -0,0 +1,40 @@
+"""
+BM25 indeksi testleri
+"""
+import numpy as np
+from utils.lexical_index import BM25Builder, BM25Index
+
+
+TEXTS = [
+    "age: 19 | region: southwest | smoker: yes",
+    "age: 33 | region: northwest | smoker: no",
+    "age: 46 | region: southeast | smoker: no",
+    "age: 19 | region: northeast | smoker: yes",
+    "",
+]
+IDS = [f"doc_{i}" for i in range(len(TEXTS))]
+
+
+def test_builder_matches_single_pass():
+    builder = BM25Builder()
+    builder.add(IDS[:2], TEXTS[:2])
+    builder.add(IDS[2:], TEXTS[2:])
+    chunked = builder.build()
+    single = BM25Index(IDS, TEXTS)
+
+    assert chunked.ids == single.ids
+    for key in ("postings", "term_freqs", "offsets", "idf", "length_norm"):
+        np.testing.assert_allclose(getattr(chunked, key), getattr(single, key))
+    assert chunked.search("southwest smoker") == single.search("southwest smoker")
+
+
+def test_saved_index_is_reused_only_for_same_fingerprint(tmp_path):
+    path = str(tmp_path / "lexical" / "dataset.npz")
+    index = BM25Index(IDS, TEXTS)
+    index.save(path, "fp-1")
+
+    loaded = BM25Index.load(path, "fp-1")
+    assert loaded.search_ids("northeast yes") == index.search_ids("northeast yes")
+    assert BM25Index.load(path, "fp-2") is None
+    assert BM25Index.load(path, "fp-1", k1=1.2) is None
+    assert BM25Index.load(str(tmp_path / "missing.npz"), "fp-1") is None
@@ -0,0 +1,110 @@
+"""
+Sorgu motoru testleri (sigorta benzeri örnek veri seti)
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from utils.column_matcher import build_column_matcher
+from utils.query_engine import answer_query, extract_filters, is_plain_lookup, parse_query
+
+
+@pytest.fixture(scope="module")
+def insurance():
+    rng = np.random.default_rng(0)
+    n = 200
+    df = pd.DataFrame({
+        'age': rng.integers(18, 65, n),
+        'sex': rng.choice(['male', 'female'], n),
+        'bmi': rng.normal(30, 6, n).round(1),
+        'children': rng.integers(0, 5, n),
+        'smoker': rng.choice(['yes', 'no'], n),
+        'region': rng.choice(['southwest', 'southeast', 'northwest', 'northeast'], n),
+        'charges': rng.gamma(2, 6000, n).round(2)
+    })
+    return df, build_column_matcher(df)
+
+
+@pytest.mark.parametrize("question", [
+    "average bmi of people with no children",
+    "en az 2 çocuğu olan kişilerin ortalama charges değeri",
+    "average charges for smokers vs non-smokers",
+    "which region has the highest average charges",
+    "average age of people aged between 30 and 40",
+    "average age of people with 2 children",
+    "erkeklerin ortalama yaşı",
+    "total charges of women",
+    "average age and bmi",
+    "hangi bölgenin ortalama masrafı en yüksek",
+])
+def test_unparsed_constraints_fall_through(insurance, question):
+    df, matcher = insurance
+    assert parse_query(question, df, matcher) is None
+    assert answer_query(question, df, matcher) is None
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("average charges", ('mean', 'charges', [], None)),
+    ("what is the average age", ('mean', 'age', [], None)),
+    ("max charges", ('max', 'charges', [], None)),
+    ("en yüksek masraf", ('max', 'charges', [], None)),
+    ("average charges by region", ('mean', 'charges', [], 'region')),
+    ("bölgeye göre ortalama masraf", ('mean', 'charges', [], 'region')),
+    ("average charges of smokers", ('mean', 'charges', [('smoker', '==', 'yes')], None)),
+    ("average charges for non-smokers", ('mean', 'charges', [('smoker', '==', 'no')], None)),
+    ("sigara içmeyenlerin ortalama masrafı", ('mean', 'charges', [('smoker', '==', 'no')], None)),
+    ("average charges where age > 50", ('mean', 'charges', [('age', '>', 50.0)], None)),
+    ("yaşı 30'dan büyük olanların ortalama bmi değeri", ('mean', 'bmi', [('age', '>', 30.0)], None)),
+    ("average bmi for age between 30 and 40",
+     ('mean', 'bmi', [('age', '>=', 30.0), ('age', '<=', 40.0)], None)),
+    ("average charges in the southwest", ('mean', 'charges', [('region', '==', 'southwest')], None)),
+    ("average charges for male smokers",
+     ('mean', 'charges', [('sex', '==', 'male'), ('smoker', '==', 'yes')], None)),
+    ("count of smokers in the northeast",
+     ('count', None, [('smoker', '==', 'yes'), ('region', '==', 'northeast')], None)),
+    ("number of people by region", ('count', None, [], 'region')),
+])
+def test_parsed_queries(insurance, question, expected):
+    df, matcher = insurance
+    query = parse_query(question, df, matcher)
+    assert query is not None
+    assert (query['aggregation'], query['target'], query['filters'], query['group_by']) == expected
+
+
+def test_answer_uses_filters(insurance):
+    df, matcher = insurance
+    answer = answer_query("average charges where age > 50", df, matcher)
+    assert answer['matched_rows'] == int((df['age'] > 50).sum())
+    assert answer['result'] == pytest.approx(df.loc[df['age'] > 50, 'charges'].mean())
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("bmi ortalaması", True),
+    ("en fazla region", True),
+    ("average bmi of people with no children", False),
+    ("average charges of smokers", False),
+    ("average charges by region", False),
+    ("average charges where age > 50", False),
+    ("average charges in the southwest", False),
+    ("erkeklerin ortalama yaşı", False),
+])
+def test_plain_lookup(insurance, question, expected):
+    df, matcher = insurance
+    assert is_plain_lookup(question, df, matcher) is expected
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("what is the bmi of people with no children", []),
+    ("yes, show me charges in the southwest", [('region', '==', 'southwest')]),
+    ("charges where smoker = yes", [('smoker', '==', 'yes')]),
+    ("smoker: no, region northeast", [('smoker', '==', 'no'), ('region', '==', 'northeast')]),
+    ("non-smokers in the southwest", [('region', '==', 'southwest')]),
+])
+def test_search_filters_need_column_next_to_boolean_values(insurance, question, expected):
+    df, matcher = insurance
+    assert extract_filters(question, df, matcher, infer_boolean=False) == expected
+
+
+def test_boolean_value_next_to_column_is_a_filter(insurance):
+    df, matcher = insurance
+    query = parse_query("average charges where smoker = yes", df, matcher)
+    assert query['filters'] == [('smoker', '==', 'yes')]
@@ -0,0 +1,52 @@
+"""
+LLM cevap önbelleği testleri
+"""
+import os
+from utils.response_cache import ResponseCache
+
+
+def test_disk_tier_is_capped(tmp_path):
+    cache = ResponseCache(max_entries=2, persist_dir=str(tmp_path), max_disk_entries=3)
+    for i in range(6):
+        cache.put(f"key-{i}", f"value-{i}")
+        os.utime(cache._path(f"key-{i}"), (i, i))
+
+    assert len(os.listdir(tmp_path)) == 3
+    reopened = ResponseCache(max_entries=2, persist_dir=str(tmp_path), max_disk_entries=3)
+    assert reopened.get("key-0") is None
+    assert reopened.get("key-5") == "value-5"
+
+
+def test_disk_hit_survives_pruning(tmp_path):
+    cache = ResponseCache(max_entries=1, persist_dir=str(tmp_path), max_disk_entries=2)
+    cache.put("old", "a")
+    os.utime(cache._path("old"), (1, 1))
+    cache.put("new", "b")
+    os.utime(cache._path("new"), (2, 2))
+
+    # Diskten okunan kayıt en son kullanılan olur; sıradaki yazmada "new" silinir
+    assert ResponseCache(max_entries=1, persist_dir=str(tmp_path)).get("old") == "a"
+    cache.put("newest", "c")
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        os.path.basename(cache._path(key)) for key in ("old", "newest")
+    )
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    memory_only = ResponseCache(max_entries=2, ttl_seconds=60)
+    memory_only.put("old", "a")
+    memory_only._entries["old"] = ("a", 0)
+    assert memory_only.get("old") is None
+
+    # Diskteki kayıt da yazılma zamanına göre süresi dolmuş sayılır ve silinir
+    cache = ResponseCache(max_entries=2, persist_dir=str(tmp_path), ttl_seconds=60)
+    reopened = ResponseCache(max_entries=2, persist_dir=str(tmp_path), ttl_seconds=60)
+    with open(reopened._path("old"), "w", encoding="utf-8") as f:
+        f.write('{"key": "old", "value": "a", "created_at": 0}')
+    assert reopened.get("old") is None
+    assert not os.path.exists(reopened._path("old"))
+
+    cache.put("stale", "b")
+    os.utime(cache._path("stale"), (1, 1))
+    cache.put("fresh", "c")
+    assert os.listdir(tmp_path) == [os.path.basename(cache._path("fresh"))]
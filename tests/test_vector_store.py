@@ -0,0 +1,121 @@
+"""
+Vector store yardımcıları testleri (NumPy backend üzerinde)
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from utils.data_loader import compute_dataset_fingerprint, iter_document_chunks
+from utils.lexical_index import BM25Index
+from utils.numpy_store import NumpyCollection, NumpyVectorClient
+from utils.vector_store import (
+    dataset_collection_name,
+    delete_superseded_collections,
+    finalize_dataset_collection,
+    hybrid_query_batch,
+    open_dataset_collection,
+    sync_dataset_collection
+)
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    rng = np.random.default_rng(0)
+    n = 400
+    ages = rng.integers(18, 65, n)
+    regions = rng.choice(['southwest', 'northeast'], n)
+    ids = [f"row_{i}" for i in range(n)]
+    texts = [f"age: {age} | region: {region} | charges: {i}" for i, (age, region) in enumerate(zip(ages, regions))]
+    collection = NumpyCollection("test")
+    collection.upsert(
+        ids=ids,
+        embeddings=rng.normal(size=(n, 16)).astype(np.float32),
+        documents=texts,
+        metadatas=[{'age': int(age), 'region': str(region)} for age, region in zip(ages, regions)]
+    )
+    return collection, BM25Index(ids, texts), rng.normal(size=(2, 16)).astype(np.float32)
+
+
+@pytest.mark.parametrize("where", [
+    {'age': {'$gt': 50}},
+    {'$and': [{'region': {'$eq': 'northeast'}}, {'age': {'$lt': 30}}]},
+])
+def test_hybrid_results_are_filled_after_filtering(dataset, where):
+    collection, lexical_index, queries = dataset
+    questions = ["charges of people with age over 50", "region northeast charges"]
+    results = hybrid_query_batch(
+        collection, queries, lexical_index, questions, n_results=20, candidates=50, where=where
+    )
+    expected = collection.get(where=where)
+    for ids, metadatas in zip(results['ids'], results['metadatas']):
+        assert len(ids) == min(20, len(expected['ids']))
+        assert all(doc_id in expected['ids'] for doc_id in ids)
+        assert len(metadatas) == len(ids)
+
+
+def fake_embed(texts):
+    return np.stack([
+        np.random.default_rng(abs(hash(text)) % 2**32).normal(size=16) for text in texts
+    ]).astype(np.float32)
+
+
+def index_dataset(client, df):
+    collection, up_to_date = open_dataset_collection(
+        client,
+        dataset_collection_name("user_dataset", "owner\x1finsurance.csv"),
+        fingerprint=compute_dataset_fingerprint(df),
+        columns=list(df.columns),
+        expected_count=len(df)
+    )
+    result = None
+    if not up_to_date:
+        result = sync_dataset_collection(collection, iter_document_chunks(df, chunk_size=4), fake_embed)
+        finalize_dataset_collection(collection, compute_dataset_fingerprint(df))
+    return collection, result
+
+
+def test_reupload_updates_the_same_collection(tmp_path):
+    client = NumpyVectorClient(str(tmp_path))
+    df = pd.DataFrame({'age': range(10), 'region': ['southwest', 'northeast'] * 5})
+    first, result = index_dataset(client, df)
+    assert result == {'rows': 10, 'upserted': 10, 'deleted': 0}
+
+    # Aynı içerik: collection hazır, hiçbir şey yazılmaz
+    assert index_dataset(client, df) == (first, None)
+
+    edited = df.iloc[:-1].copy()
+    edited.loc[3, 'region'] = 'northwest'
+    second, result = index_dataset(client, edited)
+
+    assert second.name == first.name
+    assert [info.name for info in client.list_collections()] == [first.name]
+    assert result == {'rows': 9, 'upserted': 1, 'deleted': 1}
+    assert second.count() == 9
+    assert second.get(ids=['doc_3'])['documents'] == ['age: 3 | region: northwest']
+    assert second.get(ids=['doc_9'])['ids'] == []
+
+
+def test_legacy_collections_are_deleted(tmp_path):
+    client = NumpyVectorClient(str(tmp_path))
+    legacy = client.create_collection("user_dataset_0123456789abcdef", metadata={'fingerprint': 'x'})
+    legacy.persist()
+    current, _ = index_dataset(client, pd.DataFrame({'age': [1, 2]}))
+    client.create_collection("other_collection")
+
+    deleted = delete_superseded_collections(client, "user_dataset", keep_name=current.name)
+
+    assert deleted == ["user_dataset_0123456789abcdef"]
+    assert sorted(info.name for info in client.list_collections()) == sorted([current.name, "other_collection"])
+
+
+def test_collections_past_retention_are_deleted(tmp_path):
+    client = NumpyVectorClient(str(tmp_path))
+    current, _ = index_dataset(client, pd.DataFrame({'age': [1, 2]}))
+    stale = client.create_collection("user_dataset_stale", metadata={'updated_at': 1})
+    stale.persist()
+
+    deleted = delete_superseded_collections(
+        client, "user_dataset", keep_name=current.name, max_age_seconds=3600
+    )
+
+    assert deleted == ["user_dataset_stale"]
+    assert [info.name for info in client.list_collections()] == [current.name]
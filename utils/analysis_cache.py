@@ -0,0 +1,135 @@
+"""
+Veri seti başına analiz sonuçları önbelleği
+"""
+import streamlit as st
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, Tuple
+from utils.data_loader import compute_dataset_fingerprint
+from utils.statistics import (
+    summarize_numeric,
+    summarize_categorical,
+    outlier_bounds,
+    describe_table
+)
+
+
+class AnalysisCache:
+    """
+    Bir veri setine ait analiz sonuçlarını tembel (lazy) olarak hesaplar ve saklar.
+
+    Her sonuç ilk kullanımda hesaplanır; aynı veri seti için sonraki
+    çağrılar (sekme/widget değişimleri, chatbot) önbellekten döner.
+    Veri seti parmak izi değişince yeni bir instance oluşturulur.
+    """
+
+    def __init__(self, df: pd.DataFrame, fingerprint: str):
+        self.df = df
+        self.fingerprint = fingerprint
+        self._results: Dict[Tuple, object] = {}
+
+    def _memo(self, key: Tuple, compute: Callable):
+        """Sonucu anahtarına göre önbellekten döndürür, yoksa hesaplar."""
+        if key not in self._results:
+            self._results[key] = compute()
+        return self._results[key]
+
+    def cached(self, key: Tuple, compute: Callable):
+        """Bu modül dışında hesaplanan bir sonucu (örn. RAG istatistikleri) saklar."""
+        return self._memo(('external',) + tuple(key), compute)
+
+    def numeric_summary(self, numeric_cols: List[str]) -> pd.DataFrame:
+        """Sayısal sütun istatistikleri (bkz. summarize_numeric)."""
+        return self._memo(
+            ('numeric_summary', tuple(numeric_cols)),
+            lambda: summarize_numeric(self.df, numeric_cols)
+        )
+
+    def describe(self, numeric_cols: List[str]) -> pd.DataFrame:
+        """`df.describe().T` formatında özet tablo."""
+        return self._memo(
+            ('describe', tuple(numeric_cols)),
+            lambda: describe_table(self.numeric_summary(numeric_cols))
+        )
+
+    def column_stats(self, column: str) -> pd.Series:
+        """Tek bir sayısal sütunun istatistikleri (mean, median, q1, q3, ...)."""
+        # Sütunu içeren bir özet zaten hesaplandıysa onu kullan
+        for key, value in self._results.items():
+            if key[0] == 'numeric_summary' and column in key[1]:
+                return value.loc[column]
+        return self.numeric_summary([column]).loc[column]
+
+    def outlier_bounds(self, column: str) -> Tuple[float, float]:
+        """IQR aykırı değer sınırları."""
+        stats = self.column_stats(column)
+        return self._memo(
+            ('outlier_bounds', column),
+            lambda: outlier_bounds(stats['q1'], stats['q3'])
+        )
+
+    def outliers(self, column: str) -> pd.DataFrame:
+        """Aykırı değer satırları."""
+        def compute():
+            lower_bound, upper_bound = self.outlier_bounds(column)
+            values = self.df[column]
+            return self.df[(values < lower_bound) | (values > upper_bound)]
+        return self._memo(('outliers', column), compute)
+
+    def categorical_summary(self, column: str) -> Dict:
+        """Kategorik sütun frekansları ve eksik değer sayısı."""
+        return self._memo(
+            ('categorical_summary', column),
+            lambda: summarize_categorical(self.df, [column])[column]
+        )
+
+    def value_counts(self, column: str) -> pd.Series:
+        """Azalan sıralı frekanslar (NaN hariç)."""
+        return self.categorical_summary(column)['counts']
+
+    def correlation(self, numeric_cols: List[str]) -> pd.DataFrame:
+        """Pearson korelasyon matrisi."""
+        return self._memo(
+            ('correlation', tuple(numeric_cols)),
+            lambda: self.df[numeric_cols].corr()
+        )
+
+    def correlation_pairs(self, numeric_cols: List[str]) -> pd.DataFrame:
+        """Korelasyon çiftleri, mutlak değere göre azalan sıralı."""
+        def compute():
+            corr_matrix = self.correlation(numeric_cols)
+            rows, cols = np.triu_indices(len(corr_matrix.columns), k=1)
+            corr_df = pd.DataFrame({
+                'Değişken 1': corr_matrix.columns[rows],
+                'Değişken 2': corr_matrix.columns[cols],
+                'Korelasyon': corr_matrix.values[rows, cols]
+            })
+            corr_df['Mutlak'] = corr_df['Korelasyon'].abs()
+            return corr_df.sort_values('Mutlak', ascending=False)
+        return self._memo(('correlation_pairs', tuple(numeric_cols)), compute)
+
+
+def get_analysis_cache(df: pd.DataFrame) -> AnalysisCache:
+    """
+    Oturumun analiz önbelleğini döndürür; veri seti değiştiyse yeniler.
+
+    Aynı DataFrame nesnesi için parmak izi yeniden hesaplanmaz.
+
+    Args:
+        df: Pandas DataFrame
+
+    Returns:
+        AnalysisCache: Veri setine ait önbellek
+    """
+    cache = st.session_state.get('analysis_cache')
+    if cache is not None and cache.df is df:
+        return cache
+
+    fingerprint = compute_dataset_fingerprint(df)
+    if cache is not None and cache.fingerprint == fingerprint:
+        cache.df = df
+        return cache
+
+    cache = AnalysisCache(df, fingerprint)
+    st.session_state['analysis_cache'] = cache
+    return cache
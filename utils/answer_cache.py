@@ -0,0 +1,199 @@
+"""
+Chatbot cevapları için anlamsal (semantic) önbellek
+"""
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+import numpy as np
+
+
+class SemanticAnswerCache:
+    """
+    Veri seti parmak izi + arama filtresi + soru embedding'i ile anahtarlanan
+    cevap önbelleği.
+
+    Aynı veri seti, model ve filtre için, soru embedding'i önceki bir soruya
+    `threshold` kosinüs benzerliğinden daha yakınsa kayıtlı cevap döner;
+    böylece tekrar eden veya farklı kelimelerle sorulan sorular LLM
+    çağrısı yapılmadan cevaplanır. Kayıtlar `ttl_seconds` sonra geçersiz
+    olur, kapasite dolunca en uzun süre kullanılmayan kayıt çıkarılır.
+    `persist_path` verilirse önbellek JSON olarak diske yazılır.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        ttl_seconds: float = 86_400,
+        max_entries: int = 500,
+        persist_path: Optional[str] = None
+    ):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.persist_path = persist_path
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, Dict]" = OrderedDict()
+        self._next_id = 0
+        self._load()
+
+    # ───────────────────────────────────────
+    # Disk işlemleri
+    # ───────────────────────────────────────
+    def _load(self):
+        """Kalıcı önbelleği diskten okur (varsa)."""
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path, encoding="utf-8") as f:
+                records = json.load(f)
+            for record in records:
+                record['embedding'] = np.asarray(record['embedding'], dtype=np.float32)
+                self._entries[self._next_id] = record
+                self._next_id += 1
+        except (OSError, ValueError, KeyError, TypeError):
+            # Bozuk önbellek: sıfırdan başla
+            self._entries = OrderedDict()
+            self._next_id = 0
+        if self._evict_expired():
+            self._save()
+
+    def _save(self):
+        """Önbelleği diske atomik olarak yazar."""
+        if not self.persist_path:
+            return
+        records = [
+            {**entry, 'embedding': entry['embedding'].tolist()}
+            for entry in self._entries.values()
+        ]
+        directory = os.path.dirname(self.persist_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.persist_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False)
+        os.replace(tmp_path, self.persist_path)
+
+    # ───────────────────────────────────────
+    # Yardımcılar
+    # ───────────────────────────────────────
+    @staticmethod
+    def filter_key(where: Optional[Dict]) -> str:
+        """
+        Arama filtresinin normalize anahtarı.
+
+        Embedding'leri çok yakın ama filtreleri farklı sorular ("yaşı 30'dan
+        büyük" / "yaşı 60'tan büyük") aynı cevabı paylaşmasın diye filtre
+        önbellek anahtarının parçasıdır.
+        """
+        return json.dumps(where or None, sort_keys=True, ensure_ascii=False, default=str)
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        """Embedding'i birim uzunluğa getirir (kosinüs = iç çarpım)."""
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _evict_expired(self) -> int:
+        """Süresi dolan kayıtları siler; silinen kayıt sayısını döndürür."""
+        if not self.ttl_seconds:
+            return 0
+        cutoff = time.time() - self.ttl_seconds
+        expired = [i for i, e in self._entries.items() if e['created_at'] < cutoff]
+        for entry_id in expired:
+            del self._entries[entry_id]
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ───────────────────────────────────────
+    # Okuma / yazma
+    # ───────────────────────────────────────
+    def get(
+        self,
+        fingerprint: str,
+        model: str,
+        question_embedding,
+        where: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """
+        Soruya yeterince benzeyen önceki bir sorunun cevabını döndürür.
+
+        Args:
+            fingerprint: Veri seti parmak izi
+            model: Cevabı üreten LLM modeli
+            question_embedding: Sorunun embedding'i
+            where: Sorudan çıkarılan arama filtresi (aynı filtreli kayıtlar eşleşir)
+
+        Returns:
+            Optional[Dict]: {'question', 'answer', 'similarity', ...} veya None
+        """
+        query = self._normalize(question_embedding)
+        filter_key = self.filter_key(where)
+        with self._lock:
+            if self._evict_expired():
+                # Süresi dolan cevaplar (ve kaynak satırları) diskten de silinir
+                self._save()
+            candidates = [
+                (entry_id, entry) for entry_id, entry in self._entries.items()
+                if entry['fingerprint'] == fingerprint and entry['model'] == model
+                and entry.get('filter') == filter_key
+                and entry['embedding'].shape == query.shape
+            ]
+            if not candidates:
+                return None
+
+            matrix = np.stack([entry['embedding'] for _, entry in candidates])
+            similarities = matrix @ query
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+
+            entry_id, entry = candidates[best]
+            self._entries.move_to_end(entry_id)
+            result = {k: v for k, v in entry.items() if k != 'embedding'}
+            result['similarity'] = float(similarities[best])
+            return result
+
+    def put(
+        self,
+        fingerprint: str,
+        model: str,
+        question: str,
+        question_embedding,
+        answer: str,
+        where: Optional[Dict] = None,
+        **extra
+    ):
+        """
+        Cevabı önbelleğe ekler, gerekirse en eski kaydı çıkarır.
+
+        Args:
+            fingerprint: Veri seti parmak izi
+            model: Cevabı üreten LLM modeli
+            question: Kullanıcı sorusu
+            question_embedding: Sorunun embedding'i
+            answer: LLM cevabı
+            where: Sorudan çıkarılan arama filtresi
+            **extra: Cevapla birlikte saklanacak ek bilgiler (JSON uyumlu)
+        """
+        with self._lock:
+            self._entries[self._next_id] = {
+                **extra,
+                'fingerprint': fingerprint,
+                'model': model,
+                'filter': self.filter_key(where),
+                'question': question,
+                'answer': answer,
+                'embedding': self._normalize(question_embedding),
+                'created_at': time.time()
+            }
+            self._next_id += 1
+            self._evict_expired()
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
@@ -0,0 +1,262 @@
+"""
+Sorulardaki sütun adlarını ve kategorik değerleri bulan ön-derlenmiş eşleştirici
+"""
+import re
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from utils.data_loader import get_column_types
+
+
+# Türkçe büyük harfler (str.lower() 'İ' için iki karakter üretir)
+TURKISH_LOWER = str.maketrans({'İ': 'i', 'I': 'ı'})
+# ASCII katlama: uzunluk korunur, böylece konumlar orijinal metinle aynı kalır
+ASCII_FOLD = str.maketrans({
+    'ı': 'i', 'ş': 's', 'ğ': 'g', 'ü': 'u', 'ö': 'o', 'ç': 'c',
+    'â': 'a', 'î': 'i', 'û': 'u'
+})
+
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+CAMEL_CASE_PATTERN = re.compile(r'(?<=[a-z0-9])(?=[A-Z])')
+
+# Kelime sonundaki ekler (uzundan kısaya; katlanmış halde)
+SUFFIXES = sorted([
+    's', 'es', 'lar', 'ler', 'i', 'u', 'si', 'su', 'in', 'un', 'nin', 'nun',
+    'a', 'e', 'ya', 'ye', 'da', 'de', 'ta', 'te', 'dan', 'den', 'tan', 'ten',
+    'yi', 'yu', 'nda', 'nde', 'li', 'lu'
+], key=len, reverse=True)
+MIN_STEM_LENGTH = 3  # "ile" → "il", "aya" → "ay", "ads" → "ad" gibi kısa kökler sütun sayılmaz
+
+# Türkçe/İngilizce eş anlamlı sütun adları (katlanmamış, okunabilir halde)
+COLUMN_SYNONYMS = [
+    {'age', 'yaş'},
+    {'sex', 'gender', 'cinsiyet'},
+    {'bmi', 'vki', 'vücut kitle indeksi', 'body mass index'},
+    {'children', 'child', 'çocuk', 'çocuk sayısı'},
+    {'smoker', 'smoking', 'sigara', 'sigara içen'},
+    {'region', 'bölge'},
+    {'charges', 'charge', 'cost', 'masraf', 'ücret', 'maliyet'},
+    {'price', 'fiyat'},
+    {'salary', 'wage', 'maaş'},
+    {'income', 'gelir'},
+    {'revenue', 'hasılat', 'ciro'},
+    {'sales', 'satış'},
+    {'quantity', 'amount', 'miktar'},
+    {'city', 'şehir'},
+    {'country', 'ülke'},
+    {'date', 'tarih'},
+    {'year', 'yıl'},
+    {'name', 'isim'},
+    {'weight', 'ağırlık', 'kilo'},
+    {'height', 'boy'},
+    {'score', 'puan', 'skor'},
+    {'category', 'kategori'},
+    {'product', 'ürün'},
+    {'customer', 'müşteri'},
+    {'status', 'durum'},
+    {'rating', 'değerlendirme', 'puanlama'},
+    {'duration', 'süre'},
+    {'distance', 'mesafe'},
+    {'temperature', 'sıcaklık'},
+    {'department', 'departman', 'bölüm'},
+    {'experience', 'deneyim', 'tecrübe'},
+    {'education', 'eğitim'}
+]
+
+MAX_CATALOG_VALUES = 1000
+
+
+def fold(text: str) -> str:
+    """
+    Metni Türkçe kurallarıyla küçük harfe çevirip ASCII'ye katlar.
+
+    Uzunluk korunur ("İSTANBUL" → "istanbul", "Yaşı" → "yasi").
+    """
+    return str(text).translate(TURKISH_LOWER).lower().translate(ASCII_FOLD)
+
+
+def _name_phrases(column: str) -> List[Tuple[str, ...]]:
+    """Sütun adının eşleşebilecek token dizileri (snake_case, camelCase, bitişik)."""
+    name = str(column)
+    split = CAMEL_CASE_PATTERN.sub(' ', name)
+    phrases = {
+        tuple(TOKEN_PATTERN.findall(fold(split))),
+        tuple(TOKEN_PATTERN.findall(fold(name)))
+    }
+    joined = "".join(TOKEN_PATTERN.findall(fold(name)))
+    if joined:
+        phrases.add((joined,))
+    return [phrase for phrase in phrases if phrase]
+
+
+def stem_variants(token: str) -> List[str]:
+    """Token'ın kendisi ve bilinen ekleri atılmış halleri."""
+    stems = [token]
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+            stems.append(token[:-len(suffix)])
+    return stems
+
+
+class ColumnMatcher:
+    """
+    Veri seti başına bir kez derlenen sütun/değer eşleştirici.
+
+    Sütun adları (snake_case/camelCase parçaları, eş anlamlıları) ve
+    kategorik değerler token dizisi → hedef sözlüğünde tutulur. Soru bir
+    kez token'lara ayrılır ve her konumda en uzun eşleşme aranır; maliyet
+    sütun sayısından bağımsız, soru uzunluğuyla doğrusaldır. Eşleşme
+    token sınırında yapıldığından "age" "average" içinde bulunmaz.
+    """
+
+    def __init__(self, columns: List[str], value_catalog: Optional[Dict[str, List]] = None):
+        self.columns = list(columns)
+        self.value_catalog = value_catalog or {}
+        self._column_index: Dict[Tuple[str, ...], List[str]] = {}
+        self._value_index: Dict[Tuple[str, ...], List[Tuple[str, object]]] = {}
+
+        synonym_groups = [
+            {tuple(TOKEN_PATTERN.findall(fold(word))) for word in group}
+            for group in COLUMN_SYNONYMS
+        ]
+        name_phrases = {col: _name_phrases(col) for col in self.columns}
+        for col, phrases in name_phrases.items():
+            for phrase in phrases:
+                self._add(self._column_index, phrase, col)
+        exact_keys = set(self._column_index)
+
+        # Eş anlamlılar: önce adı tam olarak gruptaki sütunlar, yoksa son
+        # parçası gruptaki sütunlar ("patient_age" → "yaş"). Başka bir sütunun
+        # kendi adı olan kelimeler ("age") o sütunda kalır.
+        for group in synonym_groups:
+            targets = [col for col, phrases in name_phrases.items() if set(phrases) & group]
+            if not targets:
+                targets = [
+                    col for col, phrases in name_phrases.items()
+                    if {phrase[-1:] for phrase in phrases} & group
+                ]
+            for col in targets:
+                for phrase in group - exact_keys:
+                    self._add(self._column_index, phrase, col)
+
+        for col, values in self.value_catalog.items():
+            for value in values:
+                text = str(value)
+                if len(text) < 2 or text.replace('.', '').replace('-', '').isdigit():
+                    continue
+                phrase = tuple(TOKEN_PATTERN.findall(fold(text)))
+                if phrase:
+                    self._add(self._value_index, phrase, (col, value))
+
+        self._max_phrase = max(
+            [len(key) for key in self._column_index] + [len(key) for key in self._value_index] + [1]
+        )
+
+    @staticmethod
+    def _add(index: Dict, key: Tuple[str, ...], target):
+        targets = index.setdefault(key, [])
+        if target not in targets:
+            targets.append(target)
+
+    def _scan(self, question: str, index: Dict) -> List[Tuple[object, Tuple[int, int]]]:
+        """Katlanmış soruda indeksteki en uzun eşleşmeleri (hedef, konum) olarak bulur."""
+        tokens = [(m.group(), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(fold(question))]
+        found = []
+        i = 0
+        while i < len(tokens):
+            matched = False
+            for length in range(min(self._max_phrase, len(tokens) - i), 0, -1):
+                head = tuple(token for token, _, _ in tokens[i:i + length - 1])
+                for last in stem_variants(tokens[i + length - 1][0]):
+                    targets = index.get(head + (last,))
+                    if targets:
+                        span = (tokens[i][1], tokens[i + length - 1][2])
+                        found += [(target, span) for target in targets]
+                        matched = True
+                        break
+                if matched:
+                    i += length
+                    break
+            if not matched:
+                i += 1
+        return found
+
+    def find_column_spans(self, question: str) -> List[Tuple[str, Tuple[int, int]]]:
+        """
+        Soruda geçen sütunları her geçişiyle birlikte bulur.
+
+        Args:
+            question: Kullanıcı sorusu
+
+        Returns:
+            List[Tuple[str, Tuple[int, int]]]: (sütun, (başlangıç, bitiş)) listesi;
+            konumlar `fold(question)` üzerindedir
+        """
+        return self._scan(question, self._column_index)
+
+    def find_value_spans(self, question: str) -> List[Tuple[str, object, Tuple[int, int]]]:
+        """
+        Soruda geçen kategorik değerleri her geçişiyle birlikte bulur.
+
+        Args:
+            question: Kullanıcı sorusu
+
+        Returns:
+            List[Tuple[str, object, Tuple[int, int]]]: (sütun, değer, (başlangıç, bitiş)) listesi
+        """
+        return [(col, value, span) for (col, value), span in self._scan(question, self._value_index)]
+
+    def find_columns(self, question: str) -> Dict[str, Tuple[int, int]]:
+        """
+        Soruda geçen sütunları bulur.
+
+        Args:
+            question: Kullanıcı sorusu
+
+        Returns:
+            Dict[str, Tuple[int, int]]: {sütun: (başlangıç, bitiş)}, soruda geçiş
+            sırasıyla; konumlar `fold(question)` üzerindedir
+        """
+        columns = {}
+        for col, span in self.find_column_spans(question):
+            columns.setdefault(col, span)
+        return columns
+
+    def find_values(self, question: str) -> Dict[str, List]:
+        """
+        Soruda geçen kategorik değerleri bulur.
+
+        Args:
+            question: Kullanıcı sorusu
+
+        Returns:
+            Dict[str, List]: {sütun: [değerler]}
+        """
+        values: Dict[str, List] = {}
+        for col, value, _ in self.find_value_spans(question):
+            if value not in values.setdefault(col, []):
+                values[col].append(value)
+        return values
+
+
+def build_column_matcher(df: pd.DataFrame, max_values: int = MAX_CATALOG_VALUES) -> ColumnMatcher:
+    """
+    Veri seti için eşleştiriciyi derler (hazırlık aşamasında bir kez).
+
+    Args:
+        df: Pandas DataFrame
+        max_values: Değer kataloğuna alınacak sütunlar için maksimum benzersiz değer
+
+    Returns:
+        ColumnMatcher: Derlenmiş eşleştirici
+    """
+    _, categorical_cols = get_column_types(df)
+    value_catalog = {}
+    for col in categorical_cols:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            values = list(series.cat.categories)
+        else:
+            values = list(series.dropna().unique())
+        if len(values) <= max_values:
+            value_catalog[col] = values
+    return ColumnMatcher(list(df.columns), value_catalog)
@@ -0,0 +1,113 @@
+"""
+Token bütçeli LLM context oluşturucu
+"""
+import math
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+CHARS_PER_TOKEN = 4
+CONTEXT_SEPARATOR = "\n\n---\n\n"
+
+
+@lru_cache(maxsize=4)
+def get_token_counter(model_name: str) -> Callable[[str], int]:
+    """
+    Model için yerel token sayacı döndürür.
+
+    tiktoken kuruluysa modelin tokenizer'ı kullanılır; değilse
+    ~4 karakter = 1 token yaklaşımına düşülür.
+
+    Args:
+        model_name: LLM model adı
+
+    Returns:
+        Callable[[str], int]: Metin → token sayısı
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return lambda text: math.ceil(len(text) / CHARS_PER_TOKEN)
+
+    try:
+        encoding = tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        encoding = tiktoken.get_encoding("cl100k_base")
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def find_mentioned_columns(question: str, columns: List[str]) -> List[str]:
+    """
+    Soruda adı geçen sütunları bulur.
+
+    Args:
+        question: Kullanıcı sorusu
+        columns: Veri setindeki sütunlar
+
+    Returns:
+        List[str]: Soruda geçen sütunlar (veri setindeki sırayla)
+    """
+    question_lower = question.lower()
+    return [col for col in columns if str(col).lower() in question_lower]
+
+
+def format_row(row: Dict, columns: List[str]) -> str:
+    """Satırı döküman formatında (`col: value | ...`) yazar; eksik alanları atlar."""
+    return " | ".join(f"{col}: {row[col]}" for col in columns if col in row)
+
+
+def build_context(
+    rows: List[Dict],
+    question: str,
+    columns: List[str],
+    token_budget: int,
+    count_tokens: Optional[Callable[[str], int]] = None,
+    matcher=None
+) -> Tuple[List[str], int]:
+    """
+    Arama sonuçlarından token bütçesini aşmayan context oluşturur.
+
+    Satırlar benzerlik sırasıyla eklenir. Soruda sütun adı geçiyorsa
+    sadece o sütunlar yazılır (hiçbiri geçmiyorsa tümü). Sütun kırpması
+    sonrası aynı metne düşen satırlar bir kez eklenir. Sıradaki satır
+    bütçeyi aşacaksa durulur.
+
+    Args:
+        rows: Satır sözlükleri (sorgu sonucundaki metadatas), benzerlik sırasıyla
+        question: Kullanıcı sorusu
+        columns: Veri setindeki sütunlar
+        token_budget: Context için maksimum token
+        count_tokens: Token sayacı (varsayılan: karakter/4 yaklaşımı)
+        matcher: Sütun eşleştirici (ColumnMatcher); verilirse soruda geçen
+            sütunlar onunla bulunur
+
+    Returns:
+        Tuple[List[str], int]: (context dökümanları, kullanılan token sayısı)
+    """
+    if count_tokens is None:
+        count_tokens = lambda text: math.ceil(len(text) / CHARS_PER_TOKEN)
+
+    if matcher is not None:
+        mentioned = matcher.find_columns(question)
+        selected_columns = [col for col in columns if col in mentioned]
+    else:
+        selected_columns = find_mentioned_columns(question, columns)
+    selected_columns = selected_columns or list(columns)
+    separator_tokens = count_tokens(CONTEXT_SEPARATOR)
+
+    docs, seen = [], set()
+    tokens_used = 0
+    for row in rows:
+        text = format_row(row, selected_columns)
+        if not text or text in seen:
+            continue
+
+        cost = count_tokens(text) + (separator_tokens if docs else 0)
+        if tokens_used + cost > token_budget:
+            break
+
+        seen.add(text)
+        docs.append(text)
+        tokens_used += cost
+
+    return docs, tokens_used
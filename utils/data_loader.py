@@ -1,8 +1,160 @@
 """
 Veri yükleme ve işleme fonksiyonları
 """
+import hashlib
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterator, Optional
+from utils.statistics import outlier_bounds
+from config.settings import CSV_CHUNK_SIZE, CSV_OPTIMIZE_DTYPES, CSV_ENGINE
+
+
+ROW_KEY = "_row"                # Metadata'da satırın DataFrame'deki konumu
+MAX_FILTER_CATEGORIES = 1000    # Metadata'ya alınacak kategorik sütunlar için benzersiz değer sınırı
+
+
+def _rewind(uploaded_file):
+    """Dosya nesnesini başa sarar (dosya yolu ise bir şey yapmaz)."""
+    if hasattr(uploaded_file, "seek"):
+        uploaded_file.seek(0)
+
+
+def _smallest_int_dtype(min_value: int, max_value: int) -> str:
+    """Değer aralığını (ve farkını) taşıyabilen en küçük integer tipini seçer."""
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        # max - min gibi işlemler taşmasın diye aralık da sığmalı
+        if info.min <= min_value and max_value <= info.max and max_value - min_value <= info.max:
+            return np.dtype(dtype).name
+    return "int64"
+
+
+def infer_compact_dtypes(
+    uploaded_file,
+    chunksize: int = 50_000,
+    max_categories: int = 1000,
+    max_category_ratio: float = 0.5
+) -> Tuple[Dict, int]:
+    """
+    CSV'yi parça parça okuyarak (ilk geçiş) kompakt sütun tiplerini belirler.
+    
+    - Integer sütunlar değer aralığına göre int8/int16/int32'ye küçültülür
+    - Float sütunlar sadece kayıpsızsa float32'ye küçültülür
+    - Az sayıda benzersiz değeri olan metin sütunları `category` olur
+    
+    Args:
+        uploaded_file: Streamlit file uploader object veya dosya yolu
+        chunksize: Parça başına satır sayısı
+        max_categories: Category için maksimum benzersiz değer sayısı
+        max_category_ratio: Category için maksimum benzersiz/satır oranı
+        
+    Returns:
+        Tuple[Dict, int]: ({sütun: dtype}, varsayılan tiplerle tahmini bellek (byte))
+    """
+    _rewind(uploaded_file)
+    kinds, minimums, maximums, float32_ok, uniques = {}, {}, {}, {}, {}
+    total_rows = 0
+    default_memory = 0
+    
+    for chunk in pd.read_csv(uploaded_file, chunksize=chunksize):
+        total_rows += len(chunk)
+        default_memory += int(chunk.memory_usage(deep=True, index=False).sum())
+        
+        for col in chunk.columns:
+            series = chunk[col]
+            kind = series.dtype.kind
+            previous = kinds.setdefault(col, kind)
+            if previous != kind:
+                # int + float (örn. sonraki parçada NaN) → float, diğer karışımlar → dokunma
+                kinds[col] = "f" if {previous, kind} == {"i", "f"} else "mixed"
+                float32_ok[col] = False
+            
+            if kind in "if":
+                values = series.to_numpy()
+                if len(values) and not np.isnan(values.astype(np.float64)).all():
+                    minimums[col] = min(minimums.get(col, np.inf), np.nanmin(values))
+                    maximums[col] = max(maximums.get(col, -np.inf), np.nanmax(values))
+                if kind == "f":
+                    lossless = np.array_equal(
+                        values, values.astype(np.float32).astype(np.float64), equal_nan=True
+                    )
+                    float32_ok[col] = float32_ok.get(col, True) and lossless
+            elif kind == "O":
+                seen = uniques.setdefault(col, set())
+                if len(seen) <= max_categories:
+                    seen.update(series.dropna().unique().tolist())
+    
+    dtypes = {}
+    for col, kind in kinds.items():
+        if kind == "i" and col in minimums:
+            dtypes[col] = _smallest_int_dtype(int(minimums[col]), int(maximums[col]))
+        elif kind == "f":
+            dtypes[col] = "float32" if float32_ok.get(col) else "float64"
+        elif kind == "O":
+            seen = uniques.get(col, set())
+            if (len(seen) <= max_categories
+                    and len(seen) <= max_category_ratio * max(total_rows, 1)):
+                dtypes[col] = pd.CategoricalDtype(categories=sorted(seen, key=str))
+    
+    return dtypes, default_memory
+
+
+def _read_with_pyarrow(uploaded_file, dtypes: Dict) -> Optional[pd.DataFrame]:
+    """pyarrow motoru ile okur; pyarrow yoksa veya başarısızsa None döner."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    
+    try:
+        _rewind(uploaded_file)
+        return pd.read_csv(uploaded_file, engine="pyarrow", dtype=dtypes)
+    except Exception:
+        return None
+
+
+def load_csv_with_report(
+    uploaded_file,
+    optimize_dtypes: bool = CSV_OPTIMIZE_DTYPES,
+    engine: str = CSV_ENGINE,
+    chunksize: int = CSV_CHUNK_SIZE
+) -> Tuple[pd.DataFrame, Dict]:
+    """
+    CSV dosyasını kompakt tiplerle yükler ve bellek raporu üretir.
+    
+    Args:
+        uploaded_file: Streamlit file uploader object
+        optimize_dtypes: Tip küçültme yapılsın mı
+        engine: "c" veya "pyarrow" (pyarrow yoksa "c"ye düşülür)
+        chunksize: Tip çıkarımı geçişinde parça başına satır sayısı
+        
+    Returns:
+        Tuple[pd.DataFrame, Dict]: (veri, {'memory_before', 'memory_after', 'engine', 'dtypes'})
+    """
+    if not optimize_dtypes:
+        _rewind(uploaded_file)
+        df = pd.read_csv(uploaded_file)
+        memory = int(df.memory_usage(deep=True, index=False).sum())
+        return df, {'memory_before': memory, 'memory_after': memory, 'engine': 'c', 'dtypes': {}}
+    
+    dtypes, memory_before = infer_compact_dtypes(uploaded_file, chunksize=chunksize)
+    
+    df = _read_with_pyarrow(uploaded_file, dtypes) if engine == "pyarrow" else None
+    used_engine = "pyarrow"
+    if df is None:
+        # Tek geçişte kompakt tiplerle okunur: parçaları listeleyip birleştirmek
+        # birleştirme anında veriyi bellekte iki kez tutardı
+        _rewind(uploaded_file)
+        df = pd.read_csv(uploaded_file, dtype=dtypes)
+        used_engine = "c"
+    
+    report = {
+        'memory_before': memory_before,
+        'memory_after': int(df.memory_usage(deep=True, index=False).sum()),
+        'engine': used_engine,
+        'dtypes': {col: str(dtype) for col, dtype in dtypes.items()}
+    }
+    return df, report
 
 
 def load_csv(uploaded_file) -> pd.DataFrame:
@@ -15,7 +167,8 @@ def load_csv(uploaded_file) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Yüklenen veri
     """
-    return pd.read_csv(uploaded_file)
+    df, _ = load_csv_with_report(uploaded_file)
+    return df
 
 
 def get_column_types(df: pd.DataFrame) -> Tuple[List[str], List[str]]:
@@ -28,30 +181,173 @@ def get_column_types(df: pd.DataFrame) -> Tuple[List[str], List[str]]:
     Returns:
         Tuple[List[str], List[str]]: (numeric_cols, categorical_cols)
     """
-    numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns.tolist()
+    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
     categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
     return numeric_cols, categorical_cols
 
 
-def prepare_documents(df: pd.DataFrame) -> List[Dict]:
+def compute_dataset_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Veri setinin içerik hash'ini (parmak izi) hesaplar.
+    
+    Sütun adları ve tüm hücre değerleri hash'e dahildir; aynı içerik her
+    oturumda aynı parmak izini verir.
+    
+    Args:
+        df: Pandas DataFrame
+        
+    Returns:
+        str: Hex formatında SHA-256 parmak izi
+    """
+    hasher = hashlib.sha256()
+    hasher.update("\x1f".join(map(str, df.columns)).encode("utf-8"))
+    hasher.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return hasher.hexdigest()
+
+
+def compute_row_hashes(df: pd.DataFrame) -> List[str]:
     """
-    DataFrame'i döküman listesine çevirir.
+    Her satırın içerik hash'ini hesaplar (index hariç).
     
     Args:
         df: Pandas DataFrame
         
     Returns:
-        List[Dict]: Döküman listesi
+        List[str]: Satır başına 16 karakterlik hex hash
+    """
+    hashes = pd.util.hash_pandas_object(df, index=False).values
+    return [f"{value:016x}" for value in hashes.tolist()]
+
+
+def build_document_texts(df: pd.DataFrame) -> List[str]:
+    """
+    DataFrame satırlarını toplu olarak döküman metnine çevirir.
+    
+    Her satır için `col: value | col: value | ...` formatında metin üretir.
+    Değerler `df.iterrows()` ile aynı satır dtype'ıyla stringe çevrilir
+    (örn. int + float sütunlu tabloda tamsayılar `1.0` olarak yazılır);
+    böylece eski satır satır üretilen metinlerle birebir aynı sonuç çıkar.
+    
+    Args:
+        df: Pandas DataFrame
+        
+    Returns:
+        List[str]: Satır başına bir döküman metni
+    """
+    if len(df.columns) == 0:
+        return [""] * len(df)
+    
+    # to_numpy() satırların ortak dtype'ını iterrows gibi seçer; tek tip
+    # tarih/süre sütunlarında ise iterrows Timestamp/Timedelta döndürür
+    values = df.to_numpy()
+    if values.dtype.kind in "mM":
+        values = df.astype(object).to_numpy()
+    
+    parts = [
+        [f"{col}: {value}" for value in values[:, j]]
+        for j, col in enumerate(df.columns)
+    ]
+    return [" | ".join(row_parts) for row_parts in zip(*parts)]
+
+
+def get_filterable_columns(df: pd.DataFrame, max_categories: int = MAX_FILTER_CATEGORIES) -> List[str]:
+    """
+    Metadata'da tutulacak (filtrelenebilir) sütunları seçer.
+    
+    Sayısal ve bool sütunlar ile en fazla `max_categories` benzersiz değere
+    sahip kategorik sütunlar seçilir. Serbest metin / ID gibi yüksek
+    kardinaliteli sütunlar sadece döküman metninde kalır.
+    
+    Args:
+        df: Pandas DataFrame
+        max_categories: Kategorik sütunlar için benzersiz değer sınırı
+        
+    Returns:
+        List[str]: Filtrelenebilir sütunlar
+    """
+    columns = df.select_dtypes(include=['number', 'bool']).columns.tolist()
+    for col in df.select_dtypes(include=['object', 'category']).columns:
+        if df[col].nunique(dropna=True) <= max_categories:
+            columns.append(col)
+    return [col for col in df.columns if col in columns]
+
+
+def build_metadatas(df: pd.DataFrame, columns: List[str], start: int = 0) -> List[Dict]:
+    """
+    Satırlar için kompakt, tipli Chroma metadata'sı oluşturur.
+    
+    Her kayıt satırın konumunu (ROW_KEY) ve sadece verilen sütunları
+    Python skaler tipleriyle (int/float/str/bool) içerir; eksik değerler
+    yazılmaz.
+    
+    Args:
+        df: DataFrame dilimi
+        columns: Metadata'ya alınacak sütunlar
+        start: Dilimin ilk satırının tüm veri setindeki konumu
+        
+    Returns:
+        List[Dict]: Satır başına metadata
+    """
+    metadatas = [{ROW_KEY: start + i} for i in range(len(df))]
+    for col in columns:
+        series = df[col]
+        present = series.notna().to_numpy()
+        if series.dtype == object:
+            series = series.astype(str)
+        for metadata, value, keep in zip(metadatas, series.tolist(), present):
+            if keep:
+                metadata[col] = value
+    return metadatas
+
+
+def fetch_rows(df: pd.DataFrame, metadatas: List[Dict]) -> List[Dict]:
+    """
+    Arama sonuçlarındaki satırların tamamını DataFrame'den getirir.
+    
+    Args:
+        df: Pandas DataFrame
+        metadatas: Sorgu sonucundaki metadata listesi (ROW_KEY içerir)
+        
+    Returns:
+        List[Dict]: Tüm sütunlarıyla satırlar (sonuç sırasıyla)
+    """
+    positions = [metadata.get(ROW_KEY) for metadata in metadatas]
+    if not positions or any(position is None for position in positions):
+        return list(metadatas)
+    return df.iloc[positions].to_dict('records')
+
+
+def _build_documents(df: pd.DataFrame, start: int = 0, metadata_columns: Optional[List[str]] = None) -> List[Dict]:
+    """Verilen DataFrame dilimi için döküman listesini toplu olarak oluşturur."""
+    if metadata_columns is None:
+        metadata_columns = get_filterable_columns(df)
+    texts = build_document_texts(df)
+    metadatas = build_metadatas(df, metadata_columns, start)
+    row_hashes = compute_row_hashes(df)
+    return [
+        {'id': f'doc_{idx}', 'text': text, 'metadata': metadata, 'row_hash': row_hash}
+        for idx, text, metadata, row_hash in zip(df.index, texts, metadatas, row_hashes)
+    ]
+
+
+def iter_document_chunks(df: pd.DataFrame, chunk_size: int = 1000) -> Iterator[List[Dict]]:
+    """
+    Dökümanları parça parça üretir (generator).
+    
+    Bir sonraki parçanın metinleri, tüketici önceki parçayı işleyene
+    (örn. embedding'e çevirene) kadar oluşturulmaz.
+    
+    Args:
+        df: Pandas DataFrame
+        chunk_size: Parça başına satır sayısı
+        
+    Yields:
+        List[Dict]: Parçadaki döküman listesi ({'id', 'text', 'metadata', 'row_hash'};
+        metadata sadece satır konumu ve filtrelenebilir sütunları içerir)
     """
-    documents = []
-    for idx, row in df.iterrows():
-        text = " | ".join([f"{col}: {row[col]}" for col in df.columns])
-        documents.append({
-            'id': f'doc_{idx}',
-            'text': text,
-            'metadata': row.to_dict()
-        })
-    return documents
+    metadata_columns = get_filterable_columns(df)
+    for start in range(0, len(df), chunk_size):
+        yield _build_documents(df.iloc[start:start + chunk_size], start, metadata_columns)
 
 
 def calculate_outliers(df: pd.DataFrame, column: str) -> Tuple[pd.DataFrame, float, float]:
@@ -65,10 +361,7 @@ def calculate_outliers(df: pd.DataFrame, column: str) -> Tuple[pd.DataFrame, flo
     Returns:
         Tuple[pd.DataFrame, float, float]: (outliers, lower_bound, upper_bound)
     """
-    q1 = df[column].quantile(0.25)
-    q3 = df[column].quantile(0.75)
-    iqr = q3 - q1
-    lower_bound = q1 - 1.5 * iqr
-    upper_bound = q3 + 1.5 * iqr
+    q1, q3 = df[column].quantile([0.25, 0.75])
+    lower_bound, upper_bound = outlier_bounds(q1, q3)
     outliers = df[(df[column] < lower_bound) | (df[column] > upper_bound)]
     return outliers, lower_bound, upper_bound
\ No newline at end of file
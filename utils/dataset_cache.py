@@ -0,0 +1,79 @@
+"""
+Yüklenen veri setleri için bellek sınırlı önbellek
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import pandas as pd
+
+
+def hash_uploaded_file(uploaded_file) -> str:
+    """
+    Yüklenen dosyanın içerik hash'ini hesaplar.
+
+    Args:
+        uploaded_file: Streamlit file uploader object
+
+    Returns:
+        str: Hex formatında SHA-256 hash
+    """
+    return hashlib.sha256(uploaded_file.getbuffer()).hexdigest()
+
+
+class DatasetCache:
+    """
+    İçerik hash'i ile anahtarlanan, parse edilmiş DataFrame önbelleği.
+
+    Toplam bellek (DataFrame'lerin deep memory kullanımı) `max_bytes`'ı
+    aştığında en uzun süre kullanılmayan veri setleri çıkarılır. Tüm
+    oturumlar aynı instance'ı paylaşır.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[pd.DataFrame, Dict, int]]" = OrderedDict()
+        self._total_bytes = 0
+
+    def get(self, key: str) -> Optional[Tuple[pd.DataFrame, Dict]]:
+        """
+        Önbellekteki veri setini döndürür.
+
+        Args:
+            key: Dosya içerik hash'i
+
+        Returns:
+            Optional[Tuple[pd.DataFrame, Dict]]: (veri, yükleme raporu) veya None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0], entry[1]
+
+    def put(self, key: str, df: pd.DataFrame, report: Dict):
+        """
+        Veri setini önbelleğe ekler, gerekirse eski kayıtları çıkarır.
+
+        Args:
+            key: Dosya içerik hash'i
+            df: Parse edilmiş veri
+            report: Yükleme raporu
+        """
+        nbytes = int(report.get('memory_after') or df.memory_usage(deep=True).sum())
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[2]
+            self._entries[key] = (df, report, nbytes)
+            self._total_bytes += nbytes
+
+            # En yeni kayıt tek başına sınırı aşsa bile tutulur
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, _, evicted_bytes) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_bytes
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
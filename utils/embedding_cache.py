@@ -0,0 +1,236 @@
+"""
+Kalıcı embedding önbelleği (disk üzerinde, içerik adresli)
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Tuple, Optional
+import numpy as np
+
+
+INDEX_FILE = "index.json"
+VECTORS_FILE = "vectors.dat"
+SLOT_KEYS_FILE = "slot_keys.dat"  # Her slottaki vektörün anahtar özeti (uint64)
+
+
+def _safe_name(name: str) -> str:
+    """Model adını dizin adı olarak kullanılabilir hale getirir."""
+    return "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in name)
+
+
+class EmbeddingCache:
+    """
+    Döküman metni + model adı ile anahtarlanan, disk üzerinde tutulan
+    embedding önbelleği.
+
+    Vektörler memory-mapped tek bir dosyada (varsayılan float16) saklanır,
+    anahtar → slot eşlemesi LRU sırasıyla `index.json` içinde tutulur.
+    Kapasite dolduğunda en uzun süre kullanılmayan kayıtların slotları
+    yeniden kullanılır.
+
+    `put_many` index'i her çağrıda yazmaz; index en fazla
+    `flush_interval` saniyede bir ve çalışmanın sonunda `flush()` ile
+    yazılır. Diskteki index eski kalsa bile her slotun anahtar özeti
+    vektörün yanında tutulduğundan, başka bir metne verilmiş slot
+    okunurken tespit edilip kaçırılmış sayılır.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        model_name: str,
+        max_entries: int = 200_000,
+        dtype: str = "float16",
+        flush_interval: float = 30.0
+    ):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.dtype = np.dtype(dtype)
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        self.directory = os.path.join(cache_dir, _safe_name(model_name))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._free_slots: List[int] = []
+        self._high_water = 0
+        self._dim: Optional[int] = None
+        self._vectors: Optional[np.memmap] = None
+        self._slot_keys: Optional[np.memmap] = None
+        self._load()
+
+    # ───────────────────────────────────────
+    # Anahtar ve dosya yönetimi
+    # ───────────────────────────────────────
+    def key(self, text: str) -> str:
+        """Metin ve model adından içerik anahtarı üretir."""
+        return hashlib.sha1(f"{self.model_name}\n{text}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _key_digest(key: str) -> int:
+        """Anahtarın slot doğrulaması için 64 bitlik özeti."""
+        return int(key[:16], 16)
+
+    def _load(self):
+        """Index'i ve vektör dosyasını diskten açar (varsa)."""
+        index_path = os.path.join(self.directory, INDEX_FILE)
+        vectors_path = os.path.join(self.directory, VECTORS_FILE)
+        slot_keys_path = os.path.join(self.directory, SLOT_KEYS_FILE)
+        if not all(map(os.path.exists, (index_path, vectors_path, slot_keys_path))):
+            return
+
+        try:
+            with open(index_path, encoding="utf-8") as f:
+                index = json.load(f)
+            if (index.get("dtype") != self.dtype.name
+                    or index.get("capacity") != self.max_entries):
+                return
+
+            self._dim = int(index["dim"])
+            self._vectors = np.memmap(
+                vectors_path, dtype=self.dtype, mode="r+",
+                shape=(self.max_entries, self._dim)
+            )
+            self._slot_keys = np.memmap(
+                slot_keys_path, dtype=np.uint64, mode="r+", shape=(self.max_entries,)
+            )
+            self._entries = OrderedDict((key, int(slot)) for key, slot in index["entries"])
+        except (OSError, ValueError, KeyError):
+            # Bozuk önbellek: sıfırdan başla
+            self._dim = None
+            self._vectors = None
+            self._slot_keys = None
+            self._entries = OrderedDict()
+            return
+
+        used = set(self._entries.values())
+        self._high_water = max(used) + 1 if used else 0
+        self._free_slots = [slot for slot in range(self._high_water) if slot not in used]
+
+    def _create_storage(self, dim: int):
+        """Verilen boyut için boş vektör dosyasını oluşturur."""
+        os.makedirs(self.directory, exist_ok=True)
+        self._dim = dim
+        self._vectors = np.memmap(
+            os.path.join(self.directory, VECTORS_FILE),
+            dtype=self.dtype, mode="w+",
+            shape=(self.max_entries, dim)
+        )
+        self._slot_keys = np.memmap(
+            os.path.join(self.directory, SLOT_KEYS_FILE),
+            dtype=np.uint64, mode="w+",
+            shape=(self.max_entries,)
+        )
+        self._entries = OrderedDict()
+        self._free_slots = []
+        self._high_water = 0
+
+    def _allocate_slot(self) -> int:
+        """Yeni kayıt için slot ayırır, gerekirse LRU kaydı çıkarır."""
+        if self._free_slots:
+            return self._free_slots.pop()
+        if self._high_water < self.max_entries:
+            self._high_water += 1
+            return self._high_water - 1
+        _, slot = self._entries.popitem(last=False)
+        return slot
+
+    def flush(self):
+        """Vektörleri ve index'i diske yazar."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if self._vectors is None:
+                return
+            self._vectors.flush()
+            self._slot_keys.flush()
+            index = {
+                "model": self.model_name,
+                "dim": self._dim,
+                "dtype": self.dtype.name,
+                "capacity": self.max_entries,
+                "entries": list(self._entries.items())
+            }
+            index_path = os.path.join(self.directory, INDEX_FILE)
+            tmp_path = index_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(tmp_path, index_path)
+
+    # ───────────────────────────────────────
+    # Okuma / yazma
+    # ───────────────────────────────────────
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, texts: List[str]) -> Tuple[Optional[np.ndarray], np.ndarray]:
+        """
+        Metinlerin önbellekteki embedding'lerini getirir.
+
+        Args:
+            texts: Metin listesi
+
+        Returns:
+            Tuple[Optional[np.ndarray], np.ndarray]: (float32 embedding array, hit maskesi).
+            Önbellek boşsa array None döner; bulunmayan satırlar sıfırdır.
+        """
+        hit_mask = np.zeros(len(texts), dtype=bool)
+        with self._lock:
+            if self._vectors is None or not self._entries:
+                return None, hit_mask
+
+            rows, slots = [], []
+            for i, text in enumerate(texts):
+                key = self.key(text)
+                slot = self._entries.get(key)
+                if slot is None:
+                    continue
+                if int(self._slot_keys[slot]) != self._key_digest(key):
+                    # Index son yazımdan sonra yeniden kullanılmış bir slotu gösteriyor
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                rows.append(i)
+                slots.append(slot)
+
+            result = np.zeros((len(texts), self._dim), dtype=np.float32)
+            if rows:
+                result[rows] = self._vectors[slots]
+                hit_mask[rows] = True
+        return result, hit_mask
+
+    def put_many(self, texts: List[str], embeddings: np.ndarray):
+        """
+        Metinlerin embedding'lerini önbelleğe yazar.
+
+        Index, son yazımdan `flush_interval` saniye geçtiyse diske yazılır;
+        çalışma sonunda `flush()` çağrılmalıdır.
+
+        Args:
+            texts: Metin listesi
+            embeddings: (len(texts), dim) boyutunda embedding array
+        """
+        if len(texts) == 0:
+            return
+        with self._lock:
+            dim = embeddings.shape[1]
+            if self._vectors is None or self._dim != dim:
+                self._create_storage(dim)
+
+            slots, digests = [], []
+            for text in texts:
+                key = self.key(text)
+                slot = self._entries.get(key)
+                if slot is None:
+                    slot = self._allocate_slot()
+                self._entries[key] = slot
+                self._entries.move_to_end(key)
+                slots.append(slot)
+                digests.append(self._key_digest(key))
+
+            self._vectors[slots] = embeddings.astype(self.dtype, copy=False)
+            self._slot_keys[slots] = np.asarray(digests, dtype=np.uint64)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
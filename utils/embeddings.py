@@ -4,8 +4,24 @@ Embedding işlemleri
 import streamlit as st
 from sentence_transformers import SentenceTransformer
 import numpy as np
-from typing import List
+from typing import List, Tuple
+import os
 import time
+from utils.embedding_cache import EmbeddingCache
+from config.settings import (
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_MAX_ENTRIES,
+    EMBEDDING_CACHE_DTYPE,
+    EMBEDDING_MULTIPROCESS_MIN_ROWS
+)
+
+
+# Adaptif batch ayarları
+CHARS_PER_TOKEN = 4             # Kaba token tahmini (karakter / token)
+TOKENS_PER_BATCH = 16_384       # Batch başına hedeflenen (padded) token sayısı
+BYTES_PER_TOKEN = 64 * 1024     # Token başına tahmini aktivasyon belleği
+MEMORY_FRACTION = 0.25          # Boş belleğin kullanılabilecek oranı
+MULTIPROCESS_CHUNK_SIZE = 1000  # Çok işlemli modda worker başına parça boyutu
 
 
 @st.cache_resource
@@ -22,39 +38,251 @@ def load_embedding_model(model_name: str = "all-MiniLM-L6-v2") -> SentenceTransf
     return SentenceTransformer(model_name)
 
 
+@st.cache_resource
+def get_embedding_cache(model_name: str = "all-MiniLM-L6-v2") -> EmbeddingCache:
+    """
+    Model için disk tabanlı embedding önbelleğini açar (cache'lenir).
+    
+    Args:
+        model_name: Model adı (önbellek anahtarının parçası)
+        
+    Returns:
+        EmbeddingCache: Önbellek instance
+    """
+    return EmbeddingCache(
+        EMBEDDING_CACHE_DIR,
+        model_name,
+        max_entries=EMBEDDING_CACHE_MAX_ENTRIES,
+        dtype=EMBEDDING_CACHE_DTYPE
+    )
+
+
+def _available_memory_bytes() -> int:
+    """Sistemde kullanılabilir fiziksel belleği döndürür (bilinmiyorsa 0)."""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+
+def _estimate_tokens(text_length: int, max_seq_length: int) -> int:
+    """Karakter uzunluğundan yaklaşık token sayısını tahmin eder."""
+    return min(text_length // CHARS_PER_TOKEN + 2, max_seq_length)
+
+
+def choose_batch_size(longest_tokens: int, max_batch_size: int, available_memory: int = 0) -> int:
+    """
+    Metin uzunluğuna ve boş belleğe göre batch boyutunu seçer.
+    
+    Args:
+        longest_tokens: Batch'teki en uzun metnin tahmini token sayısı
+        max_batch_size: Üst sınır
+        available_memory: Kullanılabilir bellek (byte, 0 = bilinmiyor)
+        
+    Returns:
+        int: Batch boyutu
+    """
+    longest_tokens = max(longest_tokens, 1)
+    size = min(max_batch_size, TOKENS_PER_BATCH // longest_tokens)
+    
+    if available_memory > 0:
+        memory_budget = available_memory * MEMORY_FRACTION
+        size = min(size, int(memory_budget // (longest_tokens * BYTES_PER_TOKEN)))
+    
+    return max(size, 1)
+
+
+def resolve_worker_count(workers: int) -> int:
+    """
+    Ayardaki worker sayısını gerçek işlem sayısına çevirir.
+    
+    Args:
+        workers: 0 = CPU çekirdek sayısı, 1 = tek işlem, N = N işlem
+        
+    Returns:
+        int: Kullanılacak işlem sayısı
+    """
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
 def create_embeddings_batch(
     texts: List[str], 
     model: SentenceTransformer, 
-    batch_size: int = 100,
-    progress_callback=None
+    batch_size: int = 256,
+    progress_callback=None,
+    workers: int = 1
 ) -> np.ndarray:
     """
     Metinleri batch'ler halinde embedding'lere çevirir.
+    
+    Metinler uzunluğa göre sıralanır (padding israfını azaltır), her batch'in
+    boyutu içindeki en uzun metne ve boş belleğe göre seçilir. Sonuçlar
+    önceden ayrılmış float32 array'e orijinal sırayla yazılır.
+    
+    Args:
+        texts: Metin listesi
+        model: Embedding modeli
+        batch_size: Maksimum batch boyutu
+        progress_callback: (current, total, progress, remaining) alan fonksiyon
+        workers: İşlem sayısı (>1 ve yeterli satır varsa çok işlemli mod)
+        
+    Returns:
+        np.ndarray: (len(texts), dim) boyutunda float32 array
     """
-    embeddings_list = []
+    total = len(texts)
+    dim = model.get_sentence_embedding_dimension()
+    if total == 0:
+        return np.empty((0, dim or 0), dtype=np.float32)
+    
+    if workers > 1 and total >= EMBEDDING_MULTIPROCESS_MIN_ROWS:
+        return create_embeddings_multiprocess(
+            texts, model, workers,
+            batch_size=batch_size,
+            progress_callback=progress_callback
+        )
+    
+    max_seq_length = getattr(model, "max_seq_length", None) or 512
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=total)
+    # En uzun metinler önce: bellek sınırına ilk batch'lerde takılırız
+    order = np.argsort(-lengths, kind="stable")
+    available_memory = _available_memory_bytes()
+    
+    embeddings = np.empty((total, dim), dtype=np.float32) if dim else None
     start_time = time.time()
+    current = 0
+    
+    while current < total:
+        longest_tokens = _estimate_tokens(int(lengths[order[current]]), max_seq_length)
+        size = choose_batch_size(longest_tokens, batch_size, available_memory)
+        batch_idx = order[current:current + size]
+        
+        batch_embeddings = model.encode(
+            [texts[i] for i in batch_idx],
+            batch_size=len(batch_idx),
+            show_progress_bar=False,
+            convert_to_numpy=True
+        )
+        if embeddings is None:
+            embeddings = np.empty((total, batch_embeddings.shape[1]), dtype=np.float32)
+        embeddings[batch_idx] = batch_embeddings
+        current += len(batch_idx)
+        
+        if progress_callback:
+            progress = current / total
+            elapsed = time.time() - start_time
+            remaining = (elapsed * total / current) - elapsed
+            progress_callback(current, total, progress, remaining)
     
-    # Çok küçük batch size kullan
-    safe_batch_size = 32  # 50'den 32'ye düşürdük
+    return embeddings
+
+
+def create_embeddings_multiprocess(
+    texts: List[str],
+    model: SentenceTransformer,
+    workers: int,
+    batch_size: int = 256,
+    progress_callback=None
+) -> np.ndarray:
+    """
+    Metinleri birden çok CPU işlemine dağıtarak embedding'e çevirir.
     
-    for i in range(0, len(texts), safe_batch_size):
-        batch = texts[i:i + safe_batch_size]
+    sentence-transformers'ın multi-process pool'u kullanılır. Metinler
+    uzunluğa göre sıralanıp parçalar halinde işlenir; her parça worker'lara
+    bölünür ve sonuçlar orijinal sıraya göre birleştirilir.
+    
+    Args:
+        texts: Metin listesi
+        model: Embedding modeli
+        workers: İşlem sayısı
+        batch_size: Worker başına encode batch boyutu
+        progress_callback: (current, total, progress, remaining) alan fonksiyon
         
-        # Her batch'i daha da küçük parçalara böl
-        for j in range(0, len(batch), 8):  # 8'er 8'er işle
-            mini_batch = batch[j:j + 8]
-            mini_embeddings = model.encode(
-                mini_batch, 
-                show_progress_bar=False,
-                batch_size=8
+    Returns:
+        np.ndarray: (len(texts), dim) boyutunda float32 array
+    """
+    total = len(texts)
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=total)
+    order = np.argsort(-lengths, kind="stable")
+    # Her parça tüm worker'lara eşit dağıtılır; parça sonunda ilerleme raporlanır
+    shard_size = workers * MULTIPROCESS_CHUNK_SIZE
+    
+    embeddings = None
+    start_time = time.time()
+    pool = model.start_multi_process_pool(target_devices=["cpu"] * workers)
+    try:
+        for start in range(0, total, shard_size):
+            shard_idx = order[start:start + shard_size]
+            shard_embeddings = model.encode_multi_process(
+                [texts[i] for i in shard_idx],
+                pool,
+                batch_size=batch_size,
+                chunk_size=-(-len(shard_idx) // workers)
             )
-            embeddings_list.extend(mini_embeddings)
+            if embeddings is None:
+                embeddings = np.empty((total, shard_embeddings.shape[1]), dtype=np.float32)
+            embeddings[shard_idx] = shard_embeddings
+            
+            if progress_callback:
+                current = start + len(shard_idx)
+                progress = current / total
+                elapsed = time.time() - start_time
+                remaining = (elapsed * total / current) - elapsed
+                progress_callback(current, total, progress, remaining)
+    finally:
+        model.stop_multi_process_pool(pool)
+    
+    return embeddings
+
+
+def create_embeddings_cached(
+    texts: List[str],
+    model: SentenceTransformer,
+    cache: EmbeddingCache,
+    batch_size: int = 256,
+    progress_callback=None,
+    workers: int = 1
+) -> Tuple[np.ndarray, int]:
+    """
+    Önbellekte olmayan metinleri embedding'e çevirir, kalanları önbellekten alır.
+    
+    Args:
+        texts: Metin listesi
+        model: Embedding modeli
+        cache: Embedding önbelleği
+        batch_size: Batch boyutu
+        progress_callback: (current, total, progress, remaining) alan fonksiyon
+        workers: İşlem sayısı (bkz. create_embeddings_batch)
         
+    Returns:
+        Tuple[np.ndarray, int]: (embedding array, önbellekten gelen satır sayısı)
+    """
+    cached, hit_mask = cache.get_many(texts)
+    cached_count = int(hit_mask.sum())
+    missing_idx = np.flatnonzero(~hit_mask)
+    
+    if len(missing_idx) == 0:
         if progress_callback:
-            current = min(i + safe_batch_size, len(texts))
-            progress = current / len(texts)
-            elapsed = time.time() - start_time
-            remaining = (elapsed * len(texts) / current) - elapsed if current > 0 else 0
-            progress_callback(current, len(texts), progress, remaining)
+            progress_callback(len(texts), len(texts), 1.0, 0)
+        return cached, cached_count
+    
+    def cached_progress(current, total, progress, remaining):
+        done = cached_count + current
+        progress_callback(done, len(texts), done / len(texts), remaining)
+    
+    missing_texts = [texts[i] for i in missing_idx]
+    new_embeddings = create_embeddings_batch(
+        missing_texts,
+        model,
+        batch_size=batch_size,
+        progress_callback=cached_progress if progress_callback else None,
+        workers=workers
+    )
+    cache.put_many(missing_texts, new_embeddings)
+    
+    if cached is None:
+        return new_embeddings.astype(np.float32, copy=False), cached_count
     
-    return np.array(embeddings_list)
\ No newline at end of file
+    cached[missing_idx] = new_embeddings
+    return cached, cached_count
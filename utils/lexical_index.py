@@ -0,0 +1,217 @@
+"""
+BM25 sözcüksel (lexical) arama indeksi ve sıralama birleştirme
+"""
+import os
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from utils.column_matcher import TOKEN_PATTERN, fold, stem_variants
+
+
+def tokenize(text: str) -> List[str]:
+    """Metni eşleştirici ile aynı kurallarla (Türkçe küçük harf + ASCII) token'lara ayırır."""
+    return TOKEN_PATTERN.findall(fold(text))
+
+
+class BM25Builder:
+    """
+    BM25 indeksini dökümanları parça parça ekleyerek oluşturur.
+
+    Metinler saklanmaz; her parça için sadece token id'leri ve döküman
+    uzunlukları tutulur, böylece indeks veri seti akış halinde
+    işlenirken kurulabilir.
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.vocabulary: Dict[str, int] = {}
+        self._token_ids: List[np.ndarray] = []
+        self._doc_lengths: List[np.ndarray] = []
+
+    def add(self, ids: List[str], texts: List[str]):
+        """Bir parça dökümanı indekse ekler."""
+        vocabulary = self.vocabulary
+        token_ids, doc_lengths = [], []
+        for text in texts:
+            tokens = tokenize(text)
+            doc_lengths.append(len(tokens))
+            token_ids.extend(vocabulary.setdefault(token, len(vocabulary)) for token in tokens)
+        self.ids.extend(ids)
+        self._token_ids.append(np.asarray(token_ids, dtype=np.int64))
+        self._doc_lengths.append(np.asarray(doc_lengths, dtype=np.int64))
+
+    def build(self, k1: float = 1.5, b: float = 0.75) -> "BM25Index":
+        """Eklenen dökümanlardan BM25Index oluşturur."""
+        return BM25Index.from_builder(self, k1=k1, b=b)
+
+
+class BM25Index:
+    """
+    Döküman metinleri üzerinde BM25 ters indeks (inverted index).
+
+    Posting listeleri CSR düzeninde tutulur: her token için döküman
+    indeksleri ve terim frekansları tek numpy dizilerinde ardışık
+    durur. Sorgu yalnızca sorudaki token'ların posting listelerine
+    dokunur.
+    """
+
+    def __init__(self, ids: List[str], texts: List[str], k1: float = 1.5, b: float = 0.75):
+        builder = BM25Builder()
+        builder.add(ids, texts)
+        self._build(builder, k1, b)
+
+    @classmethod
+    def from_builder(cls, builder: BM25Builder, k1: float = 1.5, b: float = 0.75) -> "BM25Index":
+        """Parça parça beslenmiş bir BM25Builder'dan indeks oluşturur."""
+        index = cls.__new__(cls)
+        index._build(builder, k1, b)
+        return index
+
+    def _build(self, builder: BM25Builder, k1: float, b: float):
+        self.ids = list(builder.ids)
+        self.k1 = k1
+        self.b = b
+
+        vocabulary = builder.vocabulary
+        doc_lengths = (
+            np.concatenate(builder._doc_lengths) if builder._doc_lengths
+            else np.zeros(0, dtype=np.int64)
+        )
+        token_ids = (
+            np.concatenate(builder._token_ids) if builder._token_ids
+            else np.zeros(0, dtype=np.int64)
+        )
+        doc_indices = np.repeat(np.arange(len(doc_lengths), dtype=np.int64), doc_lengths)
+
+        # (token, döküman) çiftlerini say → token'a göre sıralı posting listeleri
+        num_docs = max(len(doc_lengths), 1)
+        pairs = token_ids * num_docs + doc_indices
+        unique_pairs, term_freqs = np.unique(pairs, return_counts=True)
+        posting_tokens = unique_pairs // num_docs
+
+        self.vocabulary = vocabulary
+        self.postings = (unique_pairs % num_docs).astype(np.int32)
+        self.term_freqs = term_freqs.astype(np.float32)
+        self.offsets = np.searchsorted(posting_tokens, np.arange(len(vocabulary) + 1))
+
+        doc_freqs = np.diff(self.offsets).astype(np.float32)
+        self.idf = np.log1p((len(doc_lengths) - doc_freqs + 0.5) / (doc_freqs + 0.5)).astype(np.float32)
+        doc_lengths = doc_lengths.astype(np.float32)
+        average_length = doc_lengths.mean() if len(doc_lengths) else 1.0
+        self.length_norm = (1 - b + b * doc_lengths / max(average_length, 1e-9)).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def save(self, path: str, fingerprint: str):
+        """
+        İndeksi diske atomik olarak yazar (.npz).
+
+        Args:
+            path: Dosya yolu
+            fingerprint: İndekslenen veri setinin içerik parmak izi
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tokens = sorted(self.vocabulary, key=self.vocabulary.get)
+        with open(path + ".tmp", "wb") as f:
+            np.savez(
+                f,
+                fingerprint=np.array(fingerprint),
+                params=np.array([self.k1, self.b], dtype=np.float64),
+                ids=np.array(self.ids, dtype=str),
+                tokens=np.array(tokens, dtype=str),
+                postings=self.postings,
+                term_freqs=self.term_freqs,
+                offsets=self.offsets,
+                idf=self.idf,
+                length_norm=self.length_norm
+            )
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path: str, fingerprint: str, k1: float = 1.5, b: float = 0.75) -> Optional["BM25Index"]:
+        """
+        Kaydedilmiş indeksi açar.
+
+        Args:
+            path: Dosya yolu
+            fingerprint: Beklenen veri seti parmak izi
+            k1, b: Beklenen BM25 parametreleri
+
+        Returns:
+            Optional[BM25Index]: Dosya yoksa veya parmak izi/parametreler
+            tutmuyorsa None
+        """
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            if str(data["fingerprint"]) != fingerprint or not np.allclose(data["params"], [k1, b]):
+                return None
+            index = cls.__new__(cls)
+            index.k1, index.b = k1, b
+            index.ids = data["ids"].tolist()
+            index.vocabulary = {token: i for i, token in enumerate(data["tokens"].tolist())}
+            for key in ("postings", "term_freqs", "offsets", "idf", "length_norm"):
+                setattr(index, key, data[key])
+        return index
+
+    def _query_token_ids(self, query: str) -> List[int]:
+        """Sorgu token'larının indeks karşılıkları (bulunmazsa eki atılmış hali)."""
+        token_ids = []
+        for token in tokenize(query):
+            for stem in stem_variants(token):
+                if stem in self.vocabulary:
+                    token_ids.append(self.vocabulary[stem])
+                    break
+        return list(dict.fromkeys(token_ids))
+
+    def search(self, query: str, top_k: int = 50) -> List[Tuple[int, float]]:
+        """
+        Sorguya en uygun dökümanları BM25 skoruna göre döndürür.
+
+        Args:
+            query: Sorgu metni
+            top_k: Döndürülecek maksimum sonuç sayısı
+
+        Returns:
+            List[Tuple[int, float]]: (döküman indeksi, skor), azalan skor sırasıyla
+        """
+        token_ids = self._query_token_ids(query)
+        if not token_ids or not self.ids:
+            return []
+
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        for token_id in token_ids:
+            start, end = self.offsets[token_id], self.offsets[token_id + 1]
+            docs = self.postings[start:end]
+            tf = self.term_freqs[start:end]
+            scores[docs] += self.idf[token_id] * tf * (self.k1 + 1) / (tf + self.k1 * self.length_norm[docs])
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(i), float(scores[i])) for i in candidates]
+
+    def search_ids(self, query: str, top_k: int = 50) -> List[str]:
+        """search() sonuçlarını döküman id'leri olarak döndürür."""
+        return [self.ids[i] for i, _ in self.search(query, top_k)]
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Birden fazla sıralamayı Reciprocal Rank Fusion ile birleştirir.
+
+    Her listede `r`. sırada olan id'ye `1 / (k + r)` puan eklenir.
+
+    Args:
+        rankings: id listeleri (her biri en iyiden kötüye)
+        k: RRF sabiti
+
+    Returns:
+        List[Tuple[str, float]]: (id, birleşik skor), azalan sırayla
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,285 @@
+"""
+Paylaşılan LLM istemcisi ve sağlayıcıları (OpenAI / yerel stub)
+"""
+import os
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import httpx
+import streamlit as st
+from dotenv import load_dotenv
+from openai import OpenAI
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from config.settings import (
+    LLM_PROVIDER,
+    LLM_STUB_LATENCY_SECONDS,
+    LLM_STUB_TOKEN_LATENCY_SECONDS,
+    LLM_TIMEOUT_SECONDS,
+    LLM_CONNECT_TIMEOUT_SECONDS,
+    LLM_MAX_RETRIES,
+    LLM_MAX_CONNECTIONS,
+    LLM_KEEPALIVE_CONNECTIONS,
+    LLM_KEEPALIVE_EXPIRY_SECONDS
+)
+
+
+# .env dosyası modül yüklenirken bir kez okunur
+load_dotenv()
+
+LLM_PROVIDERS = ("openai", "stub")
+
+
+def get_api_key() -> Optional[str]:
+    """
+    OpenAI API key'ini alır (önce Streamlit Secrets, sonra .env / ortam değişkeni).
+
+    Returns:
+        Optional[str]: API key veya None
+    """
+    try:
+        return st.secrets["OPENAI_API_KEY"]
+    except Exception:
+        pass
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if api_key and api_key != "your_api_key_here":
+        return api_key
+
+    return None
+
+
+@st.cache_resource
+def get_llm_client(api_key: str) -> OpenAI:
+    """
+    API key başına paylaşılan OpenAI istemcisini oluşturur (cache'lenir).
+
+    İstemci keep-alive bağlantı havuzlu tek bir httpx.Client kullanır,
+    böylece ardışık çağrılar TLS/bağlantı kurulumunu tekrar ödemez.
+    Hatalı/geçici cevaplar (429, 5xx, bağlantı hataları) SDK tarafından
+    üstel bekleme ile `LLM_MAX_RETRIES` kez tekrar denenir.
+
+    Args:
+        api_key: OpenAI API key
+
+    Returns:
+        OpenAI: Paylaşılan istemci
+    """
+    timeout = httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=LLM_CONNECT_TIMEOUT_SECONDS)
+    http_client = httpx.Client(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY_SECONDS
+        )
+    )
+    return OpenAI(
+        api_key=api_key,
+        http_client=http_client,
+        timeout=timeout,
+        max_retries=LLM_MAX_RETRIES
+    )
+
+
+class LLMProvider(ABC):
+    """
+    Chat completion sağlayıcı arayüzü.
+
+    `complete` cevabın tamamını, `stream` cevabı parça parça döndürür.
+    Parametreler OpenAI chat completion parametreleriyle aynıdır.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def complete(
+        self,
+        messages: List[Dict],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs
+    ) -> str:
+        """Cevabın tamamını döndürür."""
+
+    @abstractmethod
+    def stream(
+        self,
+        messages: List[Dict],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs
+    ) -> Iterator[str]:
+        """Cevabı parça parça döndürür."""
+
+
+class OpenAIProvider(LLMProvider):
+    """Paylaşılan OpenAI istemcisi üzerinden çalışan sağlayıcı."""
+
+    name = "openai"
+
+    def __init__(self, client: OpenAI):
+        self.client = client
+
+    def complete(self, messages, model, temperature=0.7, max_tokens=1000, **kwargs) -> str:
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+        return response.choices[0].message.content
+
+    def stream(self, messages, model, temperature=0.7, max_tokens=1000, **kwargs) -> Iterator[str]:
+        stream = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            **kwargs
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class StubProvider(LLMProvider):
+    """
+    API çağrısı yapmayan, deterministik yerel sağlayıcı (test / benchmark için).
+
+    Sabit bir cevap (`response`) verilmezse son kullanıcı mesajını en fazla
+    `max_tokens` kelime olarak geri döndürür (echo). `latency_seconds` ilk
+    cevaptan önceki bekleme, `token_latency_seconds` stream'de kelime başına
+    beklemedir.
+    """
+
+    name = "stub"
+
+    def __init__(
+        self,
+        latency_seconds: float = 0.0,
+        token_latency_seconds: float = 0.0,
+        response: Optional[str] = None
+    ):
+        self.latency_seconds = latency_seconds
+        self.token_latency_seconds = token_latency_seconds
+        self.response = response
+
+    def _answer(self, messages: List[Dict], model: str, max_tokens: int) -> List[str]:
+        """Cevabı kelime listesi olarak üretir."""
+        if self.response is not None:
+            text = self.response
+        else:
+            user_messages = [m['content'] for m in messages if m.get('role') == 'user']
+            text = f"[{self.name}:{model}] " + (user_messages[-1] if user_messages else "")
+        return text.split(" ")[:max_tokens]
+
+    def complete(self, messages, model, temperature=0.7, max_tokens=1000, **kwargs) -> str:
+        words = self._answer(messages, model, max_tokens)
+        time.sleep(self.latency_seconds + self.token_latency_seconds * len(words))
+        return " ".join(words)
+
+    def stream(self, messages, model, temperature=0.7, max_tokens=1000, **kwargs) -> Iterator[str]:
+        words = self._answer(messages, model, max_tokens)
+        time.sleep(self.latency_seconds)
+        for i, word in enumerate(words):
+            time.sleep(self.token_latency_seconds)
+            yield word if i == 0 else " " + word
+
+
+def requires_api_key() -> bool:
+    """Seçili sağlayıcının API key'e ihtiyacı olup olmadığını döndürür."""
+    return LLM_PROVIDER != "stub"
+
+
+def get_llm_provider(api_key: Optional[str] = None) -> Optional[LLMProvider]:
+    """
+    Ayarlardaki `LLM_PROVIDER`'a göre sağlayıcıyı döndürür.
+
+    Bilinmeyen bir sağlayıcı adı (ör. yazım hatası) sessizce OpenAI'ye
+    düşmez, ValueError verir.
+
+    Args:
+        api_key: OpenAI API key (stub için gerekmez)
+
+    Returns:
+        Optional[LLMProvider]: Sağlayıcı; OpenAI seçili ve key yoksa None
+    """
+    if LLM_PROVIDER not in LLM_PROVIDERS:
+        raise ValueError(
+            f"Bilinmeyen LLM_PROVIDER: {LLM_PROVIDER!r} (geçerli değerler: {', '.join(LLM_PROVIDERS)})"
+        )
+    if LLM_PROVIDER == "stub":
+        return StubProvider(LLM_STUB_LATENCY_SECONDS, LLM_STUB_TOKEN_LATENCY_SECONDS)
+    if not api_key:
+        return None
+    return OpenAIProvider(get_llm_client(api_key))
+
+
+def complete_as_completed(
+    llm: LLMProvider,
+    requests: List[Dict],
+    concurrency: int = 5
+) -> Iterator[Tuple[int, object]]:
+    """
+    İstekleri sınırlı bir iş parçacığı havuzunda çalıştırır ve cevapları
+    bittikleri sırayla döndürür.
+
+    Aynı anda en fazla `concurrency` çağrı açıktır (rate limit ve bağlantı
+    havuzu için); sağlayıcılar senkron olduğundan her çağrı bir iş
+    parçacığında paylaşılan istemcinin bağlantı havuzunu kullanır. Çağıran
+    taraf (Streamlit script'i) her cevabı geldiği anda gösterebilir; toplam
+    süre en yavaş çağrı kadardır.
+
+    Args:
+        llm: LLM sağlayıcı
+        requests: `llm.complete` parametreleri listesi
+        concurrency: Aynı anda açık maksimum istek
+
+    Yields:
+        Tuple[int, object]: (istek sırası, cevap veya Exception)
+    """
+    if not requests:
+        return
+    with ThreadPoolExecutor(max_workers=max(min(concurrency, len(requests)), 1)) as executor:
+        futures = {
+            executor.submit(llm.complete, **request): index
+            for index, request in enumerate(requests)
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+
+
+def complete_many(
+    llm: LLMProvider,
+    requests: List[Dict],
+    concurrency: int = 5,
+    progress_callback: Optional[Callable[[int, int], None]] = None
+) -> List:
+    """
+    Birden fazla chat completion isteğini eşzamanlı çalıştırır.
+
+    complete_as_completed üzerine kuruludur (aynı eşzamanlılık sınırı ve
+    hata davranışı); cevaplar isteklerin sırasına dizilir.
+
+    Args:
+        llm: LLM sağlayıcı
+        requests: `llm.complete` parametreleri (messages, model, ...) listesi
+        concurrency: Aynı anda açık maksimum istek
+        progress_callback: Her istek bitince (biten, toplam) ile çağrılır
+
+    Returns:
+        List: İsteklerle aynı sırada cevaplar; hata alan isteklerin yerinde Exception
+    """
+    answers = [None] * len(requests)
+    for done, (index, answer) in enumerate(complete_as_completed(llm, requests, concurrency), start=1):
+        answers[index] = answer
+        if progress_callback:
+            progress_callback(done, len(requests))
+    return answers
@@ -0,0 +1,537 @@
+"""
+Küçük/orta veri setleri için saf NumPy (brute-force) vector store
+"""
+import os
+import json
+import shutil
+import threading
+from typing import Dict, List, NamedTuple, Optional, Sequence
+import numpy as np
+
+
+RECORDS_FILE = "records.json"
+INFO_FILE = "collection.json"  # Sadece ad + metadata (listeleme için records.json açılmaz)
+VECTORS_FILE = "vectors.npy"
+QUANTIZATION_TYPES = ("float32", "float16", "int8")
+DEFAULT_INCLUDE = ("documents", "metadatas")
+DEFAULT_QUERY_INCLUDE = ("documents", "metadatas", "distances")
+SCAN_CHUNK_ROWS = 16_384  # Küçültülmüş matris float32'ye bu kadar satırlık bloklarla açılır
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Satırları birim uzunluğa getirir (kosinüs = iç çarpım)."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _similarities(matrix: np.ndarray, queries: np.ndarray) -> np.ndarray:
+    """
+    (q, n) benzerlik matrisini hesaplar.
+
+    float32 dışındaki matrisler bloklar halinde açılır; böylece tam
+    boyutlu float32 kopya oluşmaz.
+    """
+    if matrix.dtype == np.float32:
+        return queries @ matrix.T
+    scores = np.empty((len(queries), len(matrix)), dtype=np.float32)
+    for start in range(0, len(matrix), SCAN_CHUNK_ROWS):
+        block = np.asarray(matrix[start:start + SCAN_CHUNK_ROWS], dtype=np.float32)
+        scores[:, start:start + len(block)] = queries @ block.T
+    return scores
+
+
+def _compare(value, operator: str, target) -> bool:
+    """Tek bir metadata değerini Chroma operatörüyle karşılaştırır."""
+    if operator == "$ne":
+        return value != target
+    if operator == "$nin":
+        return value not in target
+    if value is None:
+        return False
+    try:
+        if operator == "$eq":
+            return value == target
+        if operator == "$in":
+            return value in target
+        if operator == "$gt":
+            return value > target
+        if operator == "$gte":
+            return value >= target
+        if operator == "$lt":
+            return value < target
+        if operator == "$lte":
+            return value <= target
+    except TypeError:
+        return False
+    raise ValueError(f"Desteklenmeyen where operatörü: {operator}")
+
+
+def matches_where(metadata: Optional[Dict], where: Optional[Dict]) -> bool:
+    """
+    Metadata'nın Chroma `where` ifadesini sağlayıp sağlamadığını döndürür.
+
+    Args:
+        metadata: Döküman metadata'sı
+        where: {sütun: değer}, {sütun: {op: değer}}, {'$and': [...]} veya {'$or': [...]}
+
+    Returns:
+        bool: Filtreyi sağlıyorsa True
+    """
+    if not where:
+        return True
+    metadata = metadata or {}
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, clause) for clause in condition):
+                return False
+        else:
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            value = metadata.get(key)
+            if not all(_compare(value, op, target) for op, target in condition.items()):
+                return False
+    return True
+
+
+class NumpyCollection:
+    """
+    Chroma collection arayüzünü taklit eden brute-force vector store.
+
+    Normalize edilmiş embedding'ler tek bir ardışık float32 matriste
+    tutulur; sorgu bir matris-vektör çarpımı ve `argpartition` ile
+    cevaplanır (mesafe = 1 - kosinüs benzerliği). Birkaç on bin satıra
+    kadar bu, Chroma'nın client/SQLite/HNSW katmanlarından hızlıdır ve
+    sonuçlar yaklaşık değil, kesindir.
+
+    `quantization` "float16" veya "int8" ise tarama bellekteki küçültülmüş
+    kopya üzerinde yapılır; en iyi `n_results * rerank_factor` aday tam
+    float32 vektörlerle yeniden puanlanır. Kalıcı modda tam vektörler
+    diskten memory-mapped okunur, böylece RAM'de sadece küçük kopya kalır.
+
+    Kalıcı modda değişiklikler `modify()` veya `persist()` çağrısında
+    diske yazılır (finalize_dataset_collection güncellemenin sonunda
+    modify çağırır); yarıda kalan bir güncelleme diskteki son tutarlı
+    hali bozmaz.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        metadata: Optional[Dict] = None,
+        directory: Optional[str] = None,
+        quantization: str = "float32",
+        rerank_factor: int = 4
+    ):
+        if quantization not in QUANTIZATION_TYPES:
+            raise ValueError(f"Desteklenmeyen quantization: {quantization}")
+        self.name = name
+        self.directory = directory
+        self.quantization = quantization
+        self.rerank_factor = max(int(rerank_factor), 1)
+        self._metadata = dict(metadata or {})
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._documents: List[Optional[str]] = []
+        self._metadatas: List[Optional[Dict]] = []
+        self._vectors: Optional[np.ndarray] = None
+        self._scan_matrix: Optional[np.ndarray] = None
+        self._scan_scales: Optional[np.ndarray] = None
+        if directory and os.path.exists(os.path.join(directory, RECORDS_FILE)):
+            self._load()
+
+    # ───────────────────────────────────────
+    # Disk işlemleri
+    # ───────────────────────────────────────
+    def _load(self):
+        """Kayıtları ve vektörleri diskten açar (vektörler memory-mapped)."""
+        with open(os.path.join(self.directory, RECORDS_FILE), encoding="utf-8") as f:
+            records = json.load(f)
+        self._metadata = records.get("metadata", {})
+        self._ids = records["ids"]
+        self._documents = records["documents"]
+        self._metadatas = records["metadatas"]
+        self._positions = {doc_id: i for i, doc_id in enumerate(self._ids)}
+
+        vectors_path = os.path.join(self.directory, VECTORS_FILE)
+        if self._ids and os.path.exists(vectors_path):
+            self._vectors = np.load(vectors_path, mmap_mode="r")
+
+    def persist(self):
+        """Collection'ı diske atomik olarak yazar (kalıcı modda)."""
+        if not self.directory:
+            return
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            if self._vectors is not None:
+                vectors_path = os.path.join(self.directory, VECTORS_FILE)
+                with open(vectors_path + ".tmp", "wb") as f:
+                    np.save(f, np.ascontiguousarray(self._vectors, dtype=np.float32))
+                os.replace(vectors_path + ".tmp", vectors_path)
+                if self.quantization != "float32":
+                    # Taramada küçük kopya kullanılır; tam vektörler diskten okunur
+                    self._vectors = np.load(vectors_path, mmap_mode="r")
+
+            records_path = os.path.join(self.directory, RECORDS_FILE)
+            with open(records_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({
+                    "name": self.name,
+                    "metadata": self._metadata,
+                    "ids": self._ids,
+                    "documents": self._documents,
+                    "metadatas": self._metadatas
+                }, f, ensure_ascii=False)
+            os.replace(records_path + ".tmp", records_path)
+
+            info_path = os.path.join(self.directory, INFO_FILE)
+            with open(info_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"name": self.name, "metadata": self._metadata}, f, ensure_ascii=False)
+            os.replace(info_path + ".tmp", info_path)
+
+    # ───────────────────────────────────────
+    # Yardımcılar
+    # ───────────────────────────────────────
+    @property
+    def metadata(self) -> Dict:
+        return dict(self._metadata)
+
+    def count(self) -> int:
+        return len(self._ids)
+
+    def _writable_vectors(self) -> Optional[np.ndarray]:
+        """Memory-mapped (salt okunur) matrisi yazılabilir bir kopyaya çevirir."""
+        if isinstance(self._vectors, np.memmap):
+            self._vectors = np.array(self._vectors)
+        return self._vectors
+
+    def _invalidate(self):
+        """Vektörler değişince tarama kopyasını geçersiz kılar."""
+        self._scan_matrix = None
+        self._scan_scales = None
+
+    def _get_scan_matrix(self) -> np.ndarray:
+        """Taramada kullanılan (gerekirse küçültülmüş) matrisi döndürür."""
+        if self._scan_matrix is None:
+            if self.quantization == "float32":
+                self._scan_matrix = self._vectors
+            elif self.quantization == "float16":
+                self._scan_matrix = np.asarray(self._vectors, dtype=np.float16)
+            else:
+                # Satır başına ölçek: en büyük mutlak değer 127'ye eşlenir
+                vectors = np.asarray(self._vectors, dtype=np.float32)
+                scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127.0
+                self._scan_matrix = np.round(vectors / scales[:, None]).astype(np.int8)
+                self._scan_scales = scales.astype(np.float32)
+        return self._scan_matrix
+
+    def _where_positions(self, where: Optional[Dict]) -> Optional[np.ndarray]:
+        """`where` filtresini sağlayan satır pozisyonları (filtre yoksa None)."""
+        if not where:
+            return None
+        return np.fromiter(
+            (i for i, metadata in enumerate(self._metadatas) if matches_where(metadata, where)),
+            dtype=np.int64
+        )
+
+    def _rows(self, positions: Sequence[int], include: Sequence[str]) -> Dict:
+        """Pozisyonlardaki kayıtları Chroma `get` formatında döndürür."""
+        positions = list(positions)
+        result = {"ids": [self._ids[i] for i in positions], "included": list(include)}
+        result["documents"] = [self._documents[i] for i in positions] if "documents" in include else None
+        result["metadatas"] = [self._metadatas[i] for i in positions] if "metadatas" in include else None
+        result["embeddings"] = (
+            np.asarray(self._vectors[positions], dtype=np.float32)
+            if "embeddings" in include and self._vectors is not None else None
+        )
+        return result
+
+    # ───────────────────────────────────────
+    # Yazma
+    # ───────────────────────────────────────
+    def upsert(
+        self,
+        ids: List[str],
+        embeddings,
+        documents: Optional[List[str]] = None,
+        metadatas: Optional[List[Dict]] = None
+    ):
+        """
+        Kayıtları ekler; aynı id'ye sahip olanların yerine yazar.
+
+        Args:
+            ids: Döküman id'leri
+            embeddings: (n, boyut) embedding matrisi
+            documents: Döküman metinleri
+            metadatas: Döküman metadata'ları
+        """
+        vectors = _normalize_rows(np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1))
+        documents = documents if documents is not None else [None] * len(ids)
+        metadatas = metadatas if metadatas is not None else [None] * len(ids)
+
+        with self._lock:
+            if self._vectors is not None and self._vectors.shape[1] != vectors.shape[1]:
+                raise ValueError(
+                    f"Embedding boyutu uyuşmuyor: {vectors.shape[1]} (beklenen {self._vectors.shape[1]})"
+                )
+
+            new_rows, updated_rows, updated_positions = [], [], []
+            for row, doc_id in enumerate(ids):
+                position = self._positions.get(doc_id)
+                if position is None:
+                    self._positions[doc_id] = len(self._ids)
+                    self._ids.append(doc_id)
+                    self._documents.append(documents[row])
+                    self._metadatas.append(metadatas[row])
+                    new_rows.append(row)
+                else:
+                    self._documents[position] = documents[row]
+                    self._metadatas[position] = metadatas[row]
+                    updated_rows.append(row)
+                    updated_positions.append(position)
+
+            if updated_rows:
+                self._writable_vectors()[updated_positions] = vectors[updated_rows]
+            if new_rows:
+                self._vectors = (
+                    vectors[new_rows] if self._vectors is None
+                    else np.concatenate([self._vectors, vectors[new_rows]])
+                )
+            self._invalidate()
+
+    def add(self, ids, embeddings, documents=None, metadatas=None):
+        """upsert() ile aynı (id çakışmasında kayıt güncellenir)."""
+        self.upsert(ids, embeddings, documents, metadatas)
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict] = None):
+        """
+        Kayıtları siler.
+
+        Args:
+            ids: Silinecek id'ler
+            where: Silinecek kayıtların metadata filtresi
+        """
+        with self._lock:
+            remove = {self._positions[doc_id] for doc_id in (ids or []) if doc_id in self._positions}
+            if where:
+                remove.update(self._where_positions(where).tolist())
+            if not remove:
+                return
+
+            keep = [i for i in range(len(self._ids)) if i not in remove]
+            self._ids = [self._ids[i] for i in keep]
+            self._documents = [self._documents[i] for i in keep]
+            self._metadatas = [self._metadatas[i] for i in keep]
+            self._positions = {doc_id: i for i, doc_id in enumerate(self._ids)}
+            self._vectors = np.ascontiguousarray(self._vectors[keep]) if keep else None
+            self._invalidate()
+
+    def modify(self, name: Optional[str] = None, metadata: Optional[Dict] = None):
+        """Collection metadata'sını değiştirir ve kalıcı modda diske yazar."""
+        with self._lock:
+            if name:
+                self.name = name
+            if metadata is not None:
+                self._metadata = dict(metadata)
+            self.persist()
+
+    # ───────────────────────────────────────
+    # Okuma
+    # ───────────────────────────────────────
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include: Sequence[str] = DEFAULT_INCLUDE
+    ) -> Dict:
+        """
+        Kayıtları id ve/veya metadata filtresiyle getirir (Chroma `get` formatında).
+
+        Args:
+            ids: İstenen id'ler
+            where: Metadata filtresi
+            limit: Maksimum kayıt sayısı
+            offset: Atlanacak kayıt sayısı
+            include: "documents", "metadatas", "embeddings"
+
+        Returns:
+            Dict: {'ids', 'documents', 'metadatas', 'embeddings', 'included'}
+        """
+        with self._lock:
+            if ids is not None:
+                positions = [self._positions[doc_id] for doc_id in ids if doc_id in self._positions]
+            else:
+                positions = range(len(self._ids))
+            if where:
+                positions = [i for i in positions if matches_where(self._metadatas[i], where)]
+            start = offset or 0
+            positions = list(positions)[start:start + limit if limit is not None else None]
+            return self._rows(positions, include)
+
+    def query(
+        self,
+        query_embeddings,
+        n_results: int = 10,
+        where: Optional[Dict] = None,
+        include: Sequence[str] = DEFAULT_QUERY_INCLUDE
+    ) -> Dict:
+        """
+        En benzer kayıtları getirir (Chroma `query` formatında).
+
+        Birden fazla sorgu tek matris çarpımıyla cevaplanır.
+
+        Args:
+            query_embeddings: (q, boyut) sorgu embedding'leri
+            n_results: Sorgu başına sonuç sayısı
+            where: Metadata ön filtresi
+            include: "documents", "metadatas", "distances", "embeddings"
+
+        Returns:
+            Dict: Her anahtar sorgu başına bir liste içerir
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        queries = _normalize_rows(queries.reshape(-1, queries.shape[-1]))
+        result = {key: [] for key in ("ids", "documents", "metadatas", "distances", "embeddings")}
+        result["included"] = list(include)
+
+        with self._lock:
+            allowed = self._where_positions(where)
+            if self._vectors is None or (allowed is not None and len(allowed) == 0):
+                for key in ("ids", "documents", "metadatas", "distances", "embeddings"):
+                    result[key] = [[] for _ in queries]
+                return result
+
+            matrix = self._get_scan_matrix()
+            candidates = matrix if allowed is None else matrix[allowed]
+            scores = _similarities(candidates, queries)
+            if self._scan_scales is not None:
+                scales = self._scan_scales if allowed is None else self._scan_scales[allowed]
+                scores *= scales
+
+            k = min(n_results, scores.shape[1])
+            shortlist = min(k * self.rerank_factor, scores.shape[1]) if self.quantization != "float32" else k
+            for query, query_scores in zip(queries, scores):
+                top = np.argpartition(-query_scores, shortlist - 1)[:shortlist]
+                positions = top if allowed is None else allowed[top]
+                if shortlist > k:
+                    # Küçültülmüş puanlarla seçilen adaylar tam vektörlerle yeniden puanlanır
+                    similarities = np.asarray(self._vectors[positions], dtype=np.float32) @ query
+                else:
+                    similarities = query_scores[top]
+                order = np.argsort(-similarities, kind="stable")[:k]
+                positions = positions[order]
+
+                rows = self._rows(positions.tolist(), include)
+                result["ids"].append(rows["ids"])
+                result["documents"].append(rows["documents"])
+                result["metadatas"].append(rows["metadatas"])
+                result["embeddings"].append(rows["embeddings"])
+                result["distances"].append((1.0 - similarities[order]).tolist())
+
+        for key in ("documents", "metadatas", "distances", "embeddings"):
+            if key not in include:
+                result[key] = None
+        return result
+
+
+class CollectionInfo(NamedTuple):
+    """list_collections sonucu: collection'ı yüklemeden ad ve metadata."""
+    name: str
+    metadata: Dict
+
+
+class NumpyVectorClient:
+    """
+    NumpyCollection'lar için Chroma client arayüzü.
+
+    `persist_directory` verilirse her collection bu dizinde kendi alt
+    dizininde saklanır.
+    """
+
+    def __init__(
+        self,
+        persist_directory: Optional[str] = None,
+        quantization: str = "float32",
+        rerank_factor: int = 4
+    ):
+        self.persist_directory = persist_directory
+        self.quantization = quantization
+        self.rerank_factor = rerank_factor
+        self._collections: Dict[str, NumpyCollection] = {}
+        self._lock = threading.Lock()
+
+    def _directory(self, name: str) -> Optional[str]:
+        return os.path.join(self.persist_directory, name) if self.persist_directory else None
+
+    def _open(self, name: str, metadata: Optional[Dict] = None) -> NumpyCollection:
+        return NumpyCollection(
+            name, metadata, self._directory(name), self.quantization, self.rerank_factor
+        )
+
+    def get_collection(self, name: str) -> NumpyCollection:
+        with self._lock:
+            if name not in self._collections:
+                directory = self._directory(name)
+                if not directory or not os.path.exists(os.path.join(directory, RECORDS_FILE)):
+                    raise ValueError(f"Collection {name} does not exist.")
+                self._collections[name] = self._open(name)
+            return self._collections[name]
+
+    def create_collection(self, name: str, metadata: Optional[Dict] = None) -> NumpyCollection:
+        with self._lock:
+            directory = self._directory(name)
+            if name in self._collections or (
+                directory and os.path.exists(os.path.join(directory, RECORDS_FILE))
+            ):
+                raise ValueError(f"Collection {name} already exists.")
+            collection = self._open(name, metadata)
+            collection.persist()
+            self._collections[name] = collection
+            return collection
+
+    def get_or_create_collection(self, name: str, metadata: Optional[Dict] = None) -> NumpyCollection:
+        try:
+            return self.get_collection(name)
+        except ValueError:
+            return self.create_collection(name, metadata)
+
+    def list_collections(self) -> List[CollectionInfo]:
+        """
+        Mevcut collection'ların ad ve metadata'sını döndürür.
+
+        Kayıtlar ve vektörler yüklenmez; diskteki collection'lar için küçük
+        bilgi dosyası okunur.
+
+        Returns:
+            List[CollectionInfo]: (name, metadata) listesi
+        """
+        with self._lock:
+            infos = {
+                name: CollectionInfo(name, collection.metadata)
+                for name, collection in self._collections.items()
+            }
+            if self.persist_directory and os.path.isdir(self.persist_directory):
+                for name in sorted(os.listdir(self.persist_directory)):
+                    directory = self._directory(name)
+                    if name in infos or not os.path.exists(os.path.join(directory, RECORDS_FILE)):
+                        continue
+                    info_path = os.path.join(directory, INFO_FILE)
+                    # Bilgi dosyasından önce yazılmış collection'larda records.json okunur
+                    path = info_path if os.path.exists(info_path) else os.path.join(directory, RECORDS_FILE)
+                    with open(path, encoding="utf-8") as f:
+                        infos[name] = CollectionInfo(name, json.load(f).get("metadata", {}))
+            return list(infos.values())
+
+    def delete_collection(self, name: str):
+        with self._lock:
+            directory = self._directory(name)
+            exists_on_disk = bool(directory) and os.path.exists(directory)
+            if name not in self._collections and not exists_on_disk:
+                raise ValueError(f"Collection {name} does not exist.")
+            self._collections.pop(name, None)
+            if exists_on_disk:
+                shutil.rmtree(directory)
@@ -0,0 +1,554 @@
+"""
+Toplama (aggregate) soruları için kesin sorgu motoru
+"""
+import re
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from utils.data_loader import get_column_types
+from utils.column_matcher import (
+    ColumnMatcher, ASCII_FOLD, TOKEN_PATTERN, build_column_matcher, fold, stem_variants
+)
+
+
+# Toplama fonksiyonu → soru kalıpları (Türkçe kalıplar ekleri de kapsar)
+AGGREGATION_PATTERNS = {
+    'mean': [r'\bortalama\w*', r'\bort\b', r'\baverage\b', r'\bmean\b', r'\bavg\b'],
+    'sum': [r'\btoplam\w*', r'\btotal\b', r'\bsum\b'],
+    'max': [r'\bmaksimum\w*', r'\bmax\b', r'\bmaximum\b', r'\ben (?:yüksek|fazla|büyük)\w*',
+            r'\bhighest\b', r'\blargest\b'],
+    'min': [r'\bminimum\w*', r'\bmin\b', r'\ben (?:düşük|az|küçük)\w*',
+            r'\blowest\b', r'\bsmallest\b'],
+    'median': [r'\bmedyan\w*', r'\bmedian\b'],
+    'std': [r'\bstandart sapma\w*', r'\bsapma\w*', r'\bstd\b', r'\bstandard deviation\b'],
+    'count': [r'\bkaç\b', r'\bsayısı\w*', r'\bcount\b', r'\bhow many\b', r'\bnumber of\b', r'\badet\w*']
+}
+
+AGGREGATION_LABELS = {
+    'mean': 'Ortalama',
+    'sum': 'Toplam',
+    'max': 'Maksimum',
+    'min': 'Minimum',
+    'median': 'Medyan',
+    'std': 'Standart Sapma',
+    'count': 'Kayıt Sayısı'
+}
+
+NUMBER = r'(-?\d+(?:[.,]\d+)?)'
+
+# İngilizce / sembolik karşılaştırmalar: "age > 30", "age over 30"
+COMPARISON_OPERATORS = [
+    (r'>=|≥|at least', '>='),
+    (r'<=|≤|at most', '<='),
+    (r'>|over|above|greater than|more than|higher than', '>'),
+    (r'<|under|below|less than|lower than', '<'),
+    (r'==|=|equal to|equals', '==')
+]
+
+# Türkçe karşılaştırmalar: "yaşı 30'dan büyük", "30 üstü"
+TURKISH_COMPARISON_WORDS = [
+    (r'büyük|fazla|yüksek|üstü|üzeri|üstünde|üzerinde', '>'),
+    (r'küçük|az|düşük|altı|altında', '<'),
+    (r'eşit', '==')
+]
+
+NEGATION_PATTERN = r'\b(?:non|not|no)[\s-]*$'
+NEGATION_SUFFIX_PATTERN = r'^\W*(?:\w+\s+)?(?:\w*(?:mayan|meyen)|değil|yok)'
+
+# İkili değerler ("yes", "no") sütun adının hemen yanında değilse filtre
+# sayılmaz: "smoker: no", "smoker = yes" filtre; "yes, show me ..." değil
+VALUE_ADJACENCY_PATTERN = r"[\s:=’'\"-]*(?:(?:is|olan)\s*)?"
+
+TRUE_VALUES = {'yes', 'true', '1', 'evet', 'var', 'y'}
+FALSE_VALUES = {'no', 'false', '0', 'hayır', 'yok', 'n'}
+
+# Kısıt taşımayan dolgu kelimeleri (katlanmış). Toplama, sütun, filtre ve
+# gruplama kalıplarının tüketmediği bir kelime bunlardan biri değilse
+# (sayı, "vs", "which", "between", "erkeklerin", ...) soru kesin yola alınmaz.
+FILLER_WORDS = {
+    # İngilizce
+    'a', 'an', 'the', 'of', 'for', 'in', 'on', 'at', 'to', 'from', 'with', 'who', 'whose',
+    'that', 'those', 'these', 'there', 'their', 'is', 'are', 'was', 'were', 'be', 'been',
+    'do', 'does', 'did', 'have', 'has', 'had', 'what', 'whats', 'where', 'show', 'me',
+    'tell', 'give', 'find', 'get', 'calculate', 'compute', 'please', 'all', 'overall',
+    'entire', 'whole', 'people', 'person', 'persons', 'individuals', 'records', 'record',
+    'rows', 'row', 'entries', 'entry', 'data', 'dataset', 'value', 'values', 'and', 'or',
+    # Türkçe
+    'ne', 'nedir', 'kadar', 'kadardir', 'mi', 'mu', 'midir', 'kisi', 'kisinin', 'kisiler',
+    'kisilerin', 'insan', 'insanlarin', 'olan', 'olanlar', 'olanlarin', 'olanin', 'deger',
+    'degeri', 'degerleri', 'degerini', 'veri', 'veride', 'verideki', 'seti', 'setinde',
+    'setindeki', 'tum', 'tumu', 'butun', 'genel', 'kayit', 'kayitlar', 'kayitlarin', 'satir',
+    'satirlar', 'satirlarin', 'hesapla', 'bul', 'goster', 'soyle', 'bana', 'lutfen', 'acaba',
+    'var', 'vardir', 've', 'veya'
+}
+
+
+OPERATORS = {
+    '>': lambda s, v: s > v,
+    '>=': lambda s, v: s >= v,
+    '<': lambda s, v: s < v,
+    '<=': lambda s, v: s <= v,
+    '==': lambda s, v: s == v
+}
+
+
+@lru_cache(maxsize=None)
+def _compile(pattern: str) -> re.Pattern:
+    """Kalıbı katlanmış (ASCII) soruyla eşleşecek şekilde derler."""
+    return re.compile(pattern.translate(ASCII_FOLD))
+
+
+def _parse_number(text: str) -> float:
+    """'30', '30.5', '30,5' → float."""
+    return float(text.replace(',', '.'))
+
+
+def _detect_aggregation(question: str) -> Optional[str]:
+    """
+    Sorudaki toplama fonksiyonunu bulur.
+
+    Birden fazla kalıp varsa ilk geçen seçilir; "sayısı" gibi sayma
+    kalıpları başka bir fonksiyonla birlikte geçiyorsa ("ortalama çocuk
+    sayısı") diğer fonksiyon önceliklidir.
+    """
+    found = []
+    for aggregation, patterns in AGGREGATION_PATTERNS.items():
+        positions = [m.start() for p in patterns for m in [_compile(p).search(question)] if m]
+        if positions:
+            found.append((min(positions), aggregation))
+    if not found:
+        return None
+    non_count = [item for item in found if item[1] != 'count']
+    return min(non_count or found)[1]
+
+
+def _aggregation_spans(question: str, aggregation: str) -> List[Tuple[int, int]]:
+    """
+    Seçilen toplama fonksiyonunun (ve ona bağlı sayma kalıplarının) soruda
+    kapladığı aralıklar. Seçilmeyen başka bir fonksiyon ("highest average"
+    içindeki "average") tüketilmiş sayılmaz.
+    """
+    aggregations = {aggregation, 'count'}
+    return [
+        m.span()
+        for name in aggregations
+        for pattern in AGGREGATION_PATTERNS[name]
+        for m in _compile(pattern).finditer(question)
+    ]
+
+
+def _detect_group_by(
+    question: str,
+    mentions: Dict[str, Tuple[int, int]],
+    spans: Optional[List[Tuple[int, int]]] = None
+) -> Optional[str]:
+    """'by X', 'per X', 'her X', 'X'e göre', 'X bazında' kalıplarını arar."""
+    for col, (start, end) in mentions.items():
+        before = _compile(r'\b(?:by|per|each|every|her)\s+$').search(question[:start])
+        after = _compile(r"\s*(?:['’]\w*\s*)?(?:göre|bazında|bazlı|başına)\b").match(question[end:])
+        if before or after:
+            if spans is not None:
+                spans.append(before.span() if before else (end, end + after.end()))
+            return col
+    return None
+
+
+def _detect_numeric_filters(
+    question: str,
+    mentions: Dict[str, Tuple[int, int]],
+    numeric_cols: List[str],
+    spans: Optional[List[Tuple[int, int]]] = None
+) -> List[Tuple[str, str, float]]:
+    """Sayısal sütunlar için karşılaştırma filtrelerini çıkarır."""
+    filters = []
+    for col, (_, end) in mentions.items():
+        if col not in numeric_cols:
+            continue
+        after = question[end:]
+
+        # "age between 30 and 40" / "yaş 30 ile 40 arası"
+        between = (_compile(rf'\s*(?:is\s+)?between\s+{NUMBER}\s+and\s+{NUMBER}').match(after)
+                   or _compile(rf'\s*{NUMBER}\s*(?:-|ile|ve)\s*{NUMBER}\s*(?:arası|arasında)').match(after))
+        if between:
+            low, high = sorted([_parse_number(between.group(1)), _parse_number(between.group(2))])
+            filters += [(col, '>=', low), (col, '<=', high)]
+            if spans is not None:
+                spans.append((end, end + between.end()))
+            continue
+
+        # "age > 30", "age over 30"
+        comparison = None
+        for pattern, op in COMPARISON_OPERATORS:
+            comparison = _compile(rf'\s*(?:is\s+)?(?:{pattern})\s*{NUMBER}').match(after)
+            if comparison:
+                break
+        else:
+            # "yaşı 30'dan büyük", "yaş 30 üstü"
+            for pattern, op in TURKISH_COMPARISON_WORDS:
+                comparison = _compile(
+                    rf"\s*(?:\w+\s+)?{NUMBER}\s*['’]?\w{{0,3}}\s*(?:{pattern})"
+                ).match(after)
+                if comparison:
+                    break
+        if comparison:
+            filters.append((col, op, _parse_number(comparison.group(1))))
+            if spans is not None:
+                spans.append((end, end + comparison.end()))
+    return filters
+
+
+def _boolean_values(values: List) -> Optional[Tuple[object, object]]:
+    """İkili (yes/no, evet/hayır, ...) sütunlar için (doğru, yanlış) değerleri."""
+    if len(values) != 2:
+        return None
+    lowered = {str(v).lower(): v for v in values}
+    true = [v for k, v in lowered.items() if k in TRUE_VALUES]
+    false = [v for k, v in lowered.items() if k in FALSE_VALUES]
+    if len(true) == 1 and len(false) == 1:
+        return true[0], false[0]
+    return None
+
+
+def _next_to_column(
+    question: str,
+    span: Tuple[int, int],
+    column_spans: List[Tuple[int, int]]
+) -> Optional[Tuple[int, int]]:
+    """Değerin hemen önünde/arkasında geçen sütun adının aralığı (yoksa None)."""
+    for col_start, col_end in column_spans:
+        gap = question[col_end:span[0]] if col_end <= span[0] else question[span[1]:col_start]
+        if (col_end <= span[0] or span[1] <= col_start) and _compile(VALUE_ADJACENCY_PATTERN).fullmatch(gap):
+            return col_start, col_end
+    return None
+
+
+def _detect_categorical_filters(
+    question: str,
+    matcher: ColumnMatcher,
+    mentions: Dict[str, Tuple[int, int]],
+    exclude: Optional[List[str]] = None,
+    infer_boolean: bool = True,
+    spans: Optional[List[Tuple[int, int]]] = None
+) -> List[Tuple[str, str, object]]:
+    """
+    Kategorik değer filtrelerini çıkarır.
+
+    Soruda bir sütunun değeri geçiyorsa (ör. "southwest") o değere eşitlik
+    filtresi eklenir. İkili (yes/no) sütunların değerleri her cümlede
+    geçebildiğinden sadece sütun adının hemen yanındaysa ("smoker: no")
+    sayılır. İkili bir sütunun adı geçiyorsa (ör. "smokers") doğru değere,
+    önünde/arkasında olumsuzluk varsa ("non-smokers", "sigara içmeyen")
+    yanlış değere filtrelenir.
+    """
+    exclude = set(exclude or [])
+    filters = []
+    column_spans: Dict[str, List[Tuple[int, int]]] = {}
+    for col, span in matcher.find_column_spans(question):
+        column_spans.setdefault(col, []).append(span)
+
+    matched_values: Dict[str, List] = {}
+    value_spans: Dict[str, List[Tuple[int, int]]] = {}
+    for col, value, span in matcher.find_value_spans(question):
+        if _boolean_values(matcher.value_catalog[col]):
+            column_span = _next_to_column(question, span, column_spans.get(col, []))
+            if column_span is None:
+                continue
+            value_spans.setdefault(col, []).append(column_span)
+        if value not in matched_values.setdefault(col, []):
+            matched_values[col].append(value)
+        value_spans.setdefault(col, []).append(span)
+
+    for col, values in matcher.value_catalog.items():
+        if col in exclude:
+            continue
+
+        matched = matched_values.get(col, [])
+        if matched:
+            filters.append((col, '==', matched[0]) if len(matched) == 1 else (col, 'in', matched))
+            if spans is not None:
+                spans += value_spans[col]
+            continue
+
+        boolean = _boolean_values(values) if infer_boolean else None
+        if boolean and col in mentions:
+            start, end = mentions[col]
+            before = _compile(NEGATION_PATTERN).search(question[:start])
+            after = _compile(NEGATION_SUFFIX_PATTERN).match(question[end:])
+            filters.append((col, '==', boolean[1] if before or after else boolean[0]))
+            if spans is not None:
+                spans.append((start, end))
+                if before:
+                    spans.append(before.span())
+                if after:
+                    spans.append((end, end + after.end()))
+    return filters
+
+
+def _has_unconsumed_constraints(
+    question: str,
+    matcher: ColumnMatcher,
+    used_columns: List[str],
+    spans: List[Tuple[int, int]]
+) -> bool:
+    """
+    Soruda hiçbir toplama/filtre/gruplama kalıbının tüketmediği kısıt
+    kalıp kalmadığını kontrol eder.
+
+    Kullanılan sütunların tüm geçişleri ve `spans` aralıklarıyla örtüşen
+    kelimeler tüketilmiş sayılır. Kalan kelimelerden biri dolgu kelimesi
+    değilse (sayı, karşılaştırma/aralık kelimesi, "vs"/"which"/"hangi",
+    kullanılmayan bir sütun adı, tanınmayan bir değer) True döner.
+    """
+    consumed = list(spans) + [
+        span for col, span in matcher.find_column_spans(question) if col in used_columns
+    ]
+    for m in TOKEN_PATTERN.finditer(question):
+        start, end = m.span()
+        if any(start < span_end and span_start < end for span_start, span_end in consumed):
+            continue
+        token = m.group()
+        if len(token) == 1 and not token.isdigit():
+            continue
+        if not any(stem in FILLER_WORDS for stem in stem_variants(token)):
+            return True
+    return False
+
+
+def parse_query(
+    question: str,
+    df: pd.DataFrame,
+    matcher: Optional[ColumnMatcher] = None
+) -> Optional[Dict]:
+    """
+    Soruyu yapısal bir toplama sorgusuna çevirir.
+
+    Args:
+        question: Kullanıcı sorusu
+        df: Pandas DataFrame
+        matcher: Veri setinin sütun eşleştiricisi (verilmezse derlenir)
+
+    Returns:
+        Optional[Dict]: {'aggregation', 'target', 'filters', 'group_by'};
+        soru bir toplama sorgusu değilse None
+    """
+    question = fold(question)
+    aggregation = _detect_aggregation(question)
+    if aggregation is None:
+        return None
+
+    if matcher is None:
+        matcher = build_column_matcher(df)
+    numeric_cols, _ = get_column_types(df)
+    mentions = matcher.find_columns(question)
+
+    spans = _aggregation_spans(question, aggregation)
+    group_by = _detect_group_by(question, mentions, spans)
+    numeric_filters = _detect_numeric_filters(question, mentions, numeric_cols, spans)
+    filtered_numeric = {col for col, _, _ in numeric_filters}
+
+    # Hedef: filtre/grup olarak kullanılmayan ilk sayısal sütun
+    candidates = [
+        col for col in mentions
+        if col in numeric_cols and col != group_by and col not in filtered_numeric
+    ]
+    target = candidates[0] if candidates else None
+    if target is None and aggregation != 'count':
+        return None
+
+    categorical_filters = _detect_categorical_filters(
+        question, matcher, mentions,
+        exclude=[group_by] if group_by else None,
+        spans=spans
+    )
+
+    # Filtresiz/grupsuz "kaç ..." soruları (ör. "kaç sütun var") satır sayısı değildir
+    if target is None and not (numeric_filters or categorical_filters or group_by):
+        return None
+
+    # Ayrıştırılamayan bir kısıt varsa (ör. "no children", "smokers vs
+    # non-smokers", "which region") yanlış kesin cevap yerine RAG'e bırakılır
+    filters = numeric_filters + categorical_filters
+    used_columns = [target, group_by] + [col for col, _, _ in filters]
+    if _has_unconsumed_constraints(question, matcher, used_columns, spans):
+        return None
+
+    return {
+        'aggregation': aggregation,
+        'target': target,
+        'filters': filters,
+        'group_by': group_by
+    }
+
+
+def is_plain_lookup(
+    question: str,
+    df: pd.DataFrame,
+    matcher: Optional[ColumnMatcher] = None
+) -> bool:
+    """
+    Sorunun tek bir sütun hakkında filtresiz, gruplamasız bir soru olup
+    olmadığını döndürür.
+
+    Hazırlık aşamasında tüm veriden hesaplanan istatistikler filtre
+    uygulayamaz; bu kontrol geçmeyen sorular o kısayola alınmaz.
+
+    Args:
+        question: Kullanıcı sorusu
+        df: Pandas DataFrame
+        matcher: Veri setinin sütun eşleştiricisi (verilmezse derlenir)
+
+    Returns:
+        bool: Soruda tek sütun ve toplama/dolgu kelimeleri dışında kısıt yoksa True
+    """
+    question = fold(question)
+    if matcher is None:
+        matcher = build_column_matcher(df)
+    mentions = matcher.find_columns(question)
+    if len(mentions) != 1:
+        return False
+
+    aggregation = _detect_aggregation(question)
+    spans = _aggregation_spans(question, aggregation) if aggregation else []
+    numeric_cols, _ = get_column_types(df)
+    if (_detect_group_by(question, mentions)
+            or _detect_numeric_filters(question, mentions, numeric_cols)
+            or _detect_categorical_filters(question, matcher, mentions, infer_boolean=False)):
+        return False
+    return not _has_unconsumed_constraints(question, matcher, list(mentions), spans)
+
+
+def extract_filters(
+    question: str,
+    df: pd.DataFrame,
+    matcher: Optional[ColumnMatcher] = None,
+    infer_boolean: bool = True
+) -> List[Tuple[str, str, object]]:
+    """
+    Sorudaki sütun/değer kısıtlarını (filtreleri) çıkarır.
+
+    Args:
+        question: Kullanıcı sorusu
+        df: Pandas DataFrame
+        matcher: Veri setinin sütun eşleştiricisi (verilmezse derlenir)
+        infer_boolean: Sadece adı geçen ikili sütunlar (ör. "smokers") için
+            de filtre üretilsin mi
+
+    Returns:
+        List[Tuple[str, str, object]]: (sütun, operatör, değer) listesi;
+        operatörler: ==, >, >=, <, <=, in
+    """
+    question = fold(question)
+    if matcher is None:
+        matcher = build_column_matcher(df)
+    numeric_cols, _ = get_column_types(df)
+    mentions = matcher.find_columns(question)
+    group_by = _detect_group_by(question, mentions)
+
+    return _detect_numeric_filters(question, mentions, numeric_cols) + _detect_categorical_filters(
+        question, matcher, mentions,
+        exclude=[group_by] if group_by else None,
+        infer_boolean=infer_boolean
+    )
+
+
+def execute_query(query: Dict, df: pd.DataFrame) -> Tuple[object, int]:
+    """
+    Yapısal sorguyu tüm veri üzerinde çalıştırır.
+
+    Args:
+        query: parse_query çıktısı
+        df: Pandas DataFrame
+
+    Returns:
+        Tuple[object, int]: (skaler veya gruplu pd.Series sonuç, filtre sonrası satır sayısı)
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for col, op, value in query['filters']:
+        if op == 'in':
+            mask &= df[col].isin(value).to_numpy()
+        else:
+            mask &= OPERATORS[op](df[col], value).fillna(False).to_numpy(dtype=bool)
+    subset = df[mask]
+
+    aggregation, target, group_by = query['aggregation'], query['target'], query['group_by']
+    if group_by:
+        grouped = subset.groupby(group_by, observed=True)
+        if aggregation == 'count' and target is None:
+            result = grouped.size()
+        else:
+            result = grouped[target].agg(aggregation)
+        result = result.sort_values(ascending=False)
+    elif aggregation == 'count' and target is None:
+        result = len(subset)
+    else:
+        result = subset[target].agg(aggregation)
+    return result, len(subset)
+
+
+def _format_value(value) -> str:
+    """Sayıyı okunabilir biçimde yazar."""
+    if isinstance(value, (int, np.integer)):
+        return f"{int(value):,}"
+    if pd.isna(value):
+        return "—"
+    return f"{float(value):,.2f}"
+
+
+def describe_filters(filters: List[Tuple[str, str, object]]) -> str:
+    """Filtreleri okunabilir metne çevirir."""
+    parts = []
+    for col, op, value in filters:
+        if op == 'in':
+            parts.append(f"{col} ∈ {{{', '.join(map(str, value))}}}")
+        else:
+            parts.append(f"{col} {op} {value}")
+    return ", ".join(parts)
+
+
+def answer_query(
+    question: str,
+    df: pd.DataFrame,
+    matcher: Optional[ColumnMatcher] = None
+) -> Optional[Dict]:
+    """
+    Toplama sorusunu tüm veri üzerinde kesin olarak cevaplar.
+
+    Args:
+        question: Kullanıcı sorusu
+        df: Pandas DataFrame
+        matcher: Veri setinin sütun eşleştiricisi (verilmezse derlenir)
+
+    Returns:
+        Optional[Dict]: {'query', 'result', 'matched_rows', 'markdown'};
+        soru ayrıştırılamazsa None
+    """
+    query = parse_query(question, df, matcher)
+    if query is None:
+        return None
+
+    result, matched_rows = execute_query(query, df)
+    label = AGGREGATION_LABELS[query['aggregation']]
+    title = f"{label} ({query['target']})" if query['target'] else label
+
+    response = f"### 🧮 {title}\n\n"
+    response += f"**Kaynak:** Tüm {len(df):,} kayıttan hesaplandı"
+    if query['filters']:
+        response += f" (filtre sonrası {matched_rows:,} kayıt)"
+    response += "\n\n"
+    if query['filters']:
+        response += f"🔎 **Filtre:** `{describe_filters(query['filters'])}`\n\n"
+
+    if isinstance(result, pd.Series):
+        response += f"📊 **{query['group_by']} bazında:**\n"
+        for key, value in result.items():
+            response += f"- **{key}:** {_format_value(value)}\n"
+    else:
+        response += f"📊 **Sonuç:** {_format_value(result)}\n"
+
+    return {
+        'query': query,
+        'result': result,
+        'matched_rows': matched_rows,
+        'markdown': response
+    }
@@ -0,0 +1,175 @@
+"""
+LLM cevapları için iki katmanlı (bellek + disk) önbellek
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+def request_fingerprint(request: Dict, provider: str = "") -> str:
+    """
+    LLM isteğinin (model, mesajlar, sıcaklık, ...) ve sağlayıcının özetini üretir.
+
+    Prompt, veri özeti veya model ayarlarından biri değişirse özet de değişir.
+
+    Args:
+        request: `llm.complete` parametreleri
+        provider: Sağlayıcı adı (ör. "openai", "stub")
+
+    Returns:
+        str: SHA-1 hex özet
+    """
+    payload = json.dumps({'provider': provider, **request}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Anahtar → LLM cevabı önbelleği.
+
+    Sık kullanılan kayıtlar bellekte LRU sırasıyla tutulur (`max_entries`).
+    `persist_dir` verilirse her kayıt ayrıca diskte ayrı bir JSON dosyası
+    olarak saklanır; bellekten düşen veya yeniden başlatmadan sonra
+    istenen kayıtlar diskten okunup belleğe alınır. Diskte en fazla
+    `max_disk_entries` kayıt kalır; yazma sırasında sınır aşılırsa en uzun
+    süredir kullanılmayan dosyalar (değiştirilme zamanına göre) silinir.
+    `ttl_seconds` verilirse kayıtlar yazıldıktan bu kadar süre sonra
+    geçersiz olur ve diskten silinir.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        persist_dir: Optional[str] = None,
+        max_disk_entries: int = 2000,
+        ttl_seconds: float = 0
+    ):
+        self.max_entries = max_entries
+        self.persist_dir = persist_dir
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    def _path(self, key: str) -> Optional[str]:
+        """Kaydın disk dosyası (disk katmanı kapalıysa None)."""
+        if not self.persist_dir:
+            return None
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.persist_dir, f"{digest}.json")
+
+    def _expired(self, created_at: float) -> bool:
+        """Kaydın süresi dolmuş mu (TTL kapalıysa hiçbir zaman)."""
+        return bool(self.ttl_seconds) and created_at < time.time() - self.ttl_seconds
+
+    def _remember(self, key: str, value: str, created_at: float):
+        """Kaydı belleğe ekler, kapasite aşılırsa en eskisini çıkarır."""
+        self._entries[key] = (value, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Kayıtlı cevabı döndürür (önce bellek, sonra disk).
+
+        Args:
+            key: Önbellek anahtarı
+
+        Returns:
+            Optional[str]: Cevap veya None
+        """
+        with self._lock:
+            if key in self._entries:
+                value, created_at = self._entries[key]
+                if not self._expired(created_at):
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+
+            path = self._path(key)
+            if not path or not os.path.exists(path):
+                return None
+            try:
+                with open(path, encoding="utf-8") as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                return None
+            if record.get('key') != key:
+                return None
+            created_at = record.get('created_at', 0)
+            if self._expired(created_at):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                return None
+            try:
+                # Diskten okunan kayıt en son kullanılan sayılır (bkz. _prune_disk)
+                os.utime(path)
+            except OSError:
+                pass
+            self._remember(key, record['value'], created_at)
+            return record['value']
+
+    def _prune_disk(self):
+        """
+        Disk katmanında süresi dolan kayıtları ve `max_disk_entries`'ten
+        fazlasını (en eskiler) siler.
+        """
+        try:
+            files = [entry for entry in os.scandir(self.persist_dir)
+                     if entry.is_file() and entry.name.endswith(".json")]
+        except OSError:
+            return
+        if self.ttl_seconds:
+            # Dosya en son okunduğunda dokunulur; mtime TTL'i geçtiyse yazılma zamanı da geçmiştir
+            cutoff = time.time() - self.ttl_seconds
+            expired = [entry for entry in files if entry.stat().st_mtime < cutoff]
+            for entry in expired:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+            files = [entry for entry in files if entry.stat().st_mtime >= cutoff]
+        excess = len(files) - self.max_disk_entries
+        if excess <= 0:
+            return
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in files[:excess]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def put(self, key: str, value: str):
+        """
+        Cevabı belleğe ve (açıksa) diske yazar.
+
+        Args:
+            key: Önbellek anahtarı
+            value: LLM cevabı
+        """
+        with self._lock:
+            created_at = time.time()
+            self._remember(key, value, created_at)
+            path = self._path(key)
+            if not path:
+                return
+            try:
+                os.makedirs(self.persist_dir, exist_ok=True)
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({'key': key, 'value': value, 'created_at': created_at}, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except OSError:
+                # Disk katmanı yazılamazsa bellek katmanı yeterli
+                return
+            self._prune_disk()
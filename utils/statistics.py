@@ -0,0 +1,122 @@
+"""
+Sütun bazlı istatistik motoru
+"""
+import warnings
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple
+
+
+NUMERIC_SUMMARY_COLUMNS = ['count', 'missing', 'mean', 'std', 'min', 'q1', 'median', 'q3', 'max']
+
+
+def summarize_numeric(df: pd.DataFrame, numeric_cols: List[str]) -> pd.DataFrame:
+    """
+    Tüm sayısal sütunların istatistiklerini tek blok üzerinde hesaplar.
+
+    Sütunlar tek bir float64 matrisine alınır; ortalama, standart sapma,
+    min/max ve çeyreklikler tüm sütunlar için aynı anda (axis=0) hesaplanır.
+
+    Args:
+        df: Pandas DataFrame
+        numeric_cols: Sayısal sütunlar
+
+    Returns:
+        pd.DataFrame: Index = sütun adları, sütunlar = NUMERIC_SUMMARY_COLUMNS
+    """
+    if not numeric_cols:
+        return pd.DataFrame(columns=NUMERIC_SUMMARY_COLUMNS, dtype=float)
+
+    block = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = ~np.isnan(block)
+    count = valid.sum(axis=0)
+
+    with warnings.catch_warnings(), np.errstate(all='ignore'):
+        # Tamamen boş sütunlar NaN sonuç verir (pandas ile aynı)
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        mean = np.nanmean(block, axis=0)
+        std = np.nanstd(block, axis=0, ddof=1)
+        minimum = np.nanmin(block, axis=0) if len(block) else np.full(len(numeric_cols), np.nan)
+        maximum = np.nanmax(block, axis=0) if len(block) else np.full(len(numeric_cols), np.nan)
+        quantiles = _column_quantiles(block, valid, [0.25, 0.5, 0.75])
+
+    return pd.DataFrame({
+        'count': count,
+        'missing': len(df) - count,
+        'mean': mean,
+        'std': std,
+        'min': minimum,
+        'q1': quantiles[0],
+        'median': quantiles[1],
+        'q3': quantiles[2],
+        'max': maximum
+    }, index=pd.Index(numeric_cols))
+
+
+def _column_quantiles(block: np.ndarray, valid: np.ndarray, probs: List[float]) -> np.ndarray:
+    """Çeyreklikleri hesaplar; eksik değer yoksa tüm blok tek çağrıda işlenir."""
+    if len(block) == 0:
+        return np.full((len(probs), block.shape[1]), np.nan)
+    if valid.all():
+        return np.quantile(block, probs, axis=0)
+
+    result = np.full((len(probs), block.shape[1]), np.nan)
+    for j in range(block.shape[1]):
+        values = block[valid[:, j], j]
+        if len(values):
+            result[:, j] = np.quantile(values, probs)
+    return result
+
+
+def summarize_categorical(df: pd.DataFrame, categorical_cols: List[str]) -> Dict[str, Dict]:
+    """
+    Kategorik sütunların frekanslarını tek `value_counts` çağrısıyla hesaplar.
+
+    Args:
+        df: Pandas DataFrame
+        categorical_cols: Kategorik sütunlar
+
+    Returns:
+        Dict[str, Dict]: {sütun: {'counts': azalan sıralı frekanslar (NaN hariç),
+        'missing': eksik değer sayısı}}
+    """
+    summaries = {}
+    for col in categorical_cols:
+        counts = df[col].value_counts(dropna=False)
+        missing_mask = counts.index.isna()
+        missing = int(counts[missing_mask].sum())
+        counts = counts[~missing_mask]
+        # category dtype'ta gözlenmeyen kategoriler 0 ile gelir
+        counts = counts[counts > 0]
+        summaries[col] = {'counts': counts, 'missing': missing}
+    return summaries
+
+
+def outlier_bounds(q1: float, q3: float) -> Tuple[float, float]:
+    """
+    IQR yöntemine göre aykırı değer sınırlarını hesaplar.
+
+    Args:
+        q1: Birinci çeyreklik
+        q3: Üçüncü çeyreklik
+
+    Returns:
+        Tuple[float, float]: (lower_bound, upper_bound)
+    """
+    iqr = q3 - q1
+    return q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+
+def describe_table(numeric_summary: pd.DataFrame) -> pd.DataFrame:
+    """
+    Motor çıktısını `df.describe().T` formatına çevirir.
+
+    Args:
+        numeric_summary: summarize_numeric çıktısı
+
+    Returns:
+        pd.DataFrame: count, mean, std, min, 25%, 50%, 75%, max sütunları
+    """
+    table = numeric_summary[['count', 'mean', 'std', 'min', 'q1', 'median', 'q3', 'max']]
+    table = table.rename(columns={'q1': '25%', 'median': '50%', 'q3': '75%'})
+    return table.astype(float)
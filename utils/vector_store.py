@@ -1,29 +1,338 @@
 """
-Vector store işlemleri (ChromaDB)
+Vector store işlemleri (ChromaDB / NumPy)
 """
+import hashlib
+import time
 import chromadb
 from chromadb.config import Settings
-from typing import List, Dict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 import numpy as np
+from utils.lexical_index import reciprocal_rank_fusion
+from utils.numpy_store import NumpyVectorClient
 
 
-def create_chroma_client() -> chromadb.Client:
+ROW_HASH_KEY = "_row_hash"     # Artımlı güncelleme için satır hash'i metadata anahtarı
+METADATA_FORMAT = "compact-v1"  # Metadata düzeni değişince eski collection'lar yeniden oluşturulur
+HNSW_PREFIX = "hnsw:"           # Chroma HNSW indeks parametrelerinin metadata öneki
+UPDATED_AT_KEY = "updated_at"   # Collection'ın son güncellenme zamanı (unix saniye)
+
+
+def create_chroma_client(persist_directory: Optional[str] = None) -> chromadb.Client:
     """
     ChromaDB client oluşturur.
     
+    Args:
+        persist_directory: Verilirse collection'lar bu dizinde kalıcı saklanır
+        
     Returns:
         chromadb.Client: Client instance
     """
+    if persist_directory:
+        return chromadb.PersistentClient(
+            path=persist_directory,
+            settings=Settings(anonymized_telemetry=False)
+        )
+    
     return chromadb.Client(Settings(
         anonymized_telemetry=False,
         is_persistent=False
     ))
 
 
+def resolve_vector_backend(row_count: int, backend: str = "auto", max_numpy_rows: int = 50_000) -> str:
+    """
+    Kullanılacak vector store backend'ini seçer.
+    
+    Args:
+        row_count: Veri setindeki döküman sayısı
+        backend: "auto", "chroma" veya "numpy"
+        max_numpy_rows: "auto" modunda NumPy backend'inin seçileceği maksimum satır
+        
+    Returns:
+        str: "chroma" veya "numpy"
+    """
+    if backend != "auto":
+        return backend
+    return "numpy" if row_count <= max_numpy_rows else "chroma"
+
+
+def create_vector_client(
+    backend: str = "chroma",
+    persist_directory: Optional[str] = None,
+    quantization: str = "float32",
+    rerank_factor: int = 4
+):
+    """
+    Seçilen backend için vector store client'ı oluşturur.
+    
+    İki backend de aynı collection arayüzünü (count/upsert/get/delete/
+    query/modify) sunar; bu modüldeki fonksiyonlar ikisiyle de çalışır.
+    
+    Args:
+        backend: "chroma" veya "numpy"
+        persist_directory: Verilirse collection'lar bu dizinde kalıcı saklanır
+        quantization: NumPy backend'inde tarama matrisi tipi (float32 / float16 / int8)
+        rerank_factor: NumPy backend'inde küçültülmüş taramadan sonra yeniden
+            puanlanan aday çarpanı
+        
+    Returns:
+        chromadb.Client veya NumpyVectorClient
+    """
+    if backend == "numpy":
+        return NumpyVectorClient(persist_directory, quantization, rerank_factor)
+    return create_chroma_client(persist_directory)
+
+
+def dataset_collection_name(base_name: str, dataset_key: str) -> str:
+    """
+    Veri setine özel collection adını üretir.
+    
+    Ad içerikten değil veri setinin kimliğinden türetilir; böylece aynı
+    dosyanın düzenlenmiş hali aynı collection'ı artımlı olarak günceller.
+    
+    Args:
+        base_name: Temel collection adı
+        dataset_key: Veri seti kimliği (sahip + yüklenen dosya adı)
+        
+    Returns:
+        str: Collection adı
+    """
+    digest = hashlib.sha1(dataset_key.encode("utf-8")).hexdigest()
+    return f"{base_name}_{digest[:16]}"
+
+
+def open_dataset_collection(
+    client: chromadb.Client,
+    collection_name: str,
+    fingerprint: str,
+    columns: List[str],
+    expected_count: int,
+    description: str = "Dataset embeddings",
+    index_params: Optional[Dict] = None
+) -> Tuple[object, bool]:
+    """
+    Veri setine ait collection'ı açar.
+    
+    Metadata'daki parmak izi ve satır sayısı tutuyorsa collection hazırdır.
+    İçerik değişmiş ama sütunlar aynıysa collection artımlı güncelleme için
+    olduğu gibi döner; sütunlar veya indeks parametreleri değişmişse sıfırlanır.
+    
+    Args:
+        client: ChromaDB client
+        collection_name: Collection adı
+        fingerprint: Veri seti içerik parmak izi
+        columns: Veri setinin sütunları
+        expected_count: Veri setindeki döküman sayısı
+        description: Açıklama
+        index_params: HNSW parametreleri (bkz. hnsw_metadata)
+        
+    Returns:
+        Tuple[Collection, bool]: (collection, zaten güncel mi)
+    """
+    schema = _schema_key(columns, index_params)
+    try:
+        collection = client.get_collection(collection_name)
+        metadata = collection.metadata or {}
+        if metadata.get("schema") == schema:
+            up_to_date = (
+                metadata.get("fingerprint") == fingerprint
+                and collection.count() == expected_count
+            )
+            return collection, up_to_date
+    except Exception:
+        pass
+    
+    collection = create_or_reset_collection(
+        client,
+        collection_name,
+        description,
+        metadata={"schema": schema, UPDATED_AT_KEY: int(time.time())},
+        index_params=index_params
+    )
+    return collection, False
+
+
+def _schema_key(columns: List[str], index_params: Optional[Dict] = None) -> str:
+    """Sütun listesi, metadata düzeni ve indeks parametrelerinden kısa şema anahtarı üretir."""
+    params = [f"{k}={v}" for k, v in sorted((index_params or {}).items())]
+    key = "\x1f".join([METADATA_FORMAT, *params, *map(str, columns)])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def get_collection_row_hashes(collection, page_size: int = 5000) -> Dict[str, str]:
+    """
+    Collection'daki her dökümanın satır hash'ini getirir.
+    
+    Args:
+        collection: ChromaDB collection
+        page_size: Sayfa başına okunacak kayıt
+        
+    Returns:
+        Dict[str, str]: {doc_id: row_hash}
+    """
+    row_hashes = {}
+    offset = 0
+    while True:
+        page = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+        if not page["ids"]:
+            break
+        for doc_id, metadata in zip(page["ids"], page["metadatas"]):
+            row_hashes[doc_id] = (metadata or {}).get(ROW_HASH_KEY)
+        offset += len(page["ids"])
+    return row_hashes
+
+
+def sync_dataset_collection(
+    collection,
+    document_chunks: Iterable[List[Dict]],
+    embed_texts: Callable[[List[str]], np.ndarray],
+    on_chunk: Optional[Callable[[List[Dict], int], None]] = None
+) -> Dict[str, int]:
+    """
+    Döküman parçalarını collection ile akış halinde eşitler.
+    
+    Mevcut satır hash'leri bir kez okunur. Her parçada sadece yeni veya
+    değişen satırlar embedding'e çevrilip hemen yazılır; parçanın metinleri
+    bir sonraki parçaya geçilince bırakılır. Sonda veri setinde artık
+    bulunmayan id'ler silinir.
+    
+    Args:
+        collection: ChromaDB collection
+        document_chunks: Döküman parçaları (bkz. iter_document_chunks)
+        embed_texts: Metin listesini embedding array'ine çeviren fonksiyon
+        on_chunk: Her parçadan sonra (parça, yazılan satır sayısı) ile çağrılır
+        
+    Returns:
+        Dict[str, int]: {'rows', 'upserted', 'deleted'}
+    """
+    # Görülen id'ler sözlükten çıkarılır; sonda kalanlar silinmiş satırlardır
+    remaining = get_collection_row_hashes(collection) if collection.count() > 0 else {}
+    rows = upserted = 0
+    
+    for chunk in document_chunks:
+        changed = [doc for doc in chunk if remaining.pop(doc['id'], None) != doc['row_hash']]
+        if changed:
+            texts = [doc['text'] for doc in changed]
+            add_documents_to_collection(collection, changed, embed_texts(texts), texts)
+        rows += len(chunk)
+        upserted += len(changed)
+        if on_chunk:
+            on_chunk(chunk, len(changed))
+    
+    removed = list(remaining)
+    delete_documents_from_collection(collection, removed)
+    return {'rows': rows, 'upserted': upserted, 'deleted': len(removed)}
+
+
+def finalize_dataset_collection(collection, fingerprint: str):
+    """
+    Güncelleme bittikten sonra collection'a yeni parmak izini ve zamanı yazar.
+    
+    Args:
+        collection: ChromaDB collection
+        fingerprint: Veri seti içerik parmak izi
+    """
+    # HNSW parametreleri oluşturulduktan sonra tekrar gönderilemez
+    metadata = {
+        key: value for key, value in (collection.metadata or {}).items()
+        if not key.startswith(HNSW_PREFIX)
+    }
+    metadata["fingerprint"] = fingerprint
+    metadata[UPDATED_AT_KEY] = int(time.time())
+    collection.modify(metadata=metadata)
+
+
+def delete_superseded_collections(
+    client,
+    base_name: str,
+    keep_name: Optional[str] = None,
+    max_age_seconds: float = 0
+) -> List[str]:
+    """
+    Artık kullanılmayan veri seti collection'larını siler.
+    
+    Parmak izine göre adlandırılmış eski düzendeki collection'lar
+    (metadata'da güncelleme zamanı olmayanlar) her içerik değişikliğinde
+    yenisi açıldığından sahipsiz kalır; bunlar silinir. `max_age_seconds`
+    verilirse bu süredir güncellenmeyen collection'lar da silinir (saklama
+    süresi; satır metinleri collection'larda durur).
+    
+    Args:
+        client: ChromaDB / NumPy client
+        base_name: Temel collection adı
+        keep_name: Kullanımdaki collection (silinmez)
+        max_age_seconds: Saklama süresi (0 = süresiz)
+        
+    Returns:
+        List[str]: Silinen collection adları
+    """
+    cutoff = time.time() - max_age_seconds if max_age_seconds else None
+    deleted = []
+    for info in client.list_collections():
+        if info.name == keep_name or not info.name.startswith(f"{base_name}_"):
+            continue
+        updated_at = (info.metadata or {}).get(UPDATED_AT_KEY)
+        if updated_at is None or (cutoff is not None and updated_at < cutoff):
+            client.delete_collection(info.name)
+            deleted.append(info.name)
+    return deleted
+
+
+def delete_collection_if_exists(client, name: str) -> bool:
+    """Collection varsa siler; silindiyse True döndürür."""
+    try:
+        client.get_collection(name)
+    except Exception:
+        return False
+    client.delete_collection(name)
+    return True
+
+
+def delete_documents_from_collection(collection, ids: List[str], batch_size: int = 5000):
+    """
+    Dökümanları collection'dan siler (batch'ler halinde).
+    
+    Args:
+        collection: ChromaDB collection
+        ids: Silinecek döküman id'leri
+        batch_size: Batch boyutu
+    """
+    for i in range(0, len(ids), batch_size):
+        collection.delete(ids=ids[i:i + batch_size])
+
+
+def hnsw_metadata(
+    space: str = "cosine",
+    m: int = 16,
+    ef_construction: int = 200,
+    ef_search: int = 100
+) -> Dict:
+    """
+    HNSW indeks parametrelerini Chroma collection metadata'sına çevirir.
+    
+    Args:
+        space: Mesafe fonksiyonu ("cosine", "l2", "ip")
+        m: Düğüm başına komşu sayısı (yüksek = daha isabetli, daha fazla bellek)
+        ef_construction: İndeks kurulumunda aday listesi boyutu
+        ef_search: Sorguda aday listesi boyutu (yüksek = daha isabetli, daha yavaş)
+        
+    Returns:
+        Dict: "hnsw:*" anahtarları
+    """
+    return {
+        f"{HNSW_PREFIX}space": space,
+        f"{HNSW_PREFIX}M": m,
+        f"{HNSW_PREFIX}construction_ef": ef_construction,
+        f"{HNSW_PREFIX}search_ef": ef_search
+    }
+
+
 def create_or_reset_collection(
     client: chromadb.Client, 
     collection_name: str,
-    description: str = "Dataset embeddings"
+    description: str = "Dataset embeddings",
+    metadata: Optional[Dict] = None,
+    index_params: Optional[Dict] = None
 ):
     """
     Collection oluşturur veya sıfırlar.
@@ -32,6 +341,8 @@ def create_or_reset_collection(
         client: ChromaDB client
         collection_name: Collection adı
         description: Açıklama
+        metadata: Collection'a eklenecek ek metadata
+        index_params: HNSW parametreleri (bkz. hnsw_metadata)
         
     Returns:
         Collection object
@@ -43,7 +354,7 @@ def create_or_reset_collection(
     
     return client.create_collection(
         name=collection_name,
-        metadata={"description": description}
+        metadata={"description": description, **(index_params or {}), **(metadata or {})}
     )
 
 
@@ -56,6 +367,10 @@ def add_documents_to_collection(
     """
     Dökümanları collection'a ekler (batch'ler halinde).
     
+    Aynı id'ye sahip kayıtlar güncellenir (upsert); satır hash'i metadata'ya
+    eklenir. Embedding'ler Python listesine çevrilmeden numpy dilimleri
+    olarak gönderilir.
+    
     Args:
         collection: ChromaDB collection
         documents: Döküman listesi
@@ -64,22 +379,91 @@ def add_documents_to_collection(
     """
     # ChromaDB için güvenli batch size
     batch_size = 5000
+    embeddings = np.asarray(embeddings, dtype=np.float32)
     
     for i in range(0, len(documents), batch_size):
         end_idx = min(i + batch_size, len(documents))
         
-        collection.add(
+        collection.upsert(
             ids=[doc['id'] for doc in documents[i:end_idx]],
-            embeddings=embeddings[i:end_idx].tolist(),
+            embeddings=embeddings[i:end_idx],
             documents=texts[i:end_idx],
-            metadatas=[doc['metadata'] for doc in documents[i:end_idx]]
+            metadatas=[
+                {**doc['metadata'], ROW_HASH_KEY: doc['row_hash']}
+                for doc in documents[i:end_idx]
+            ]
         )
 
 
+WHERE_OPERATORS = {
+    '==': '$eq',
+    '>': '$gt',
+    '>=': '$gte',
+    '<': '$lt',
+    '<=': '$lte',
+    'in': '$in'
+}
+
+
+def _metadata_value(value):
+    """numpy skalerlerini Chroma'nın kabul ettiği Python tiplerine çevirir."""
+    if isinstance(value, (list, tuple)):
+        return [_metadata_value(v) for v in value]
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def build_where_clause(filters: List[Tuple[str, str, object]]) -> Optional[Dict]:
+    """
+    (sütun, operatör, değer) filtrelerini Chroma `where` ifadesine çevirir.
+    
+    Args:
+        filters: Filtre listesi (operatörler: ==, >, >=, <, <=, in)
+        
+    Returns:
+        Optional[Dict]: Tek filtre için {sütun: {op: değer}}, birden fazlası
+        için {'$and': [...]}; filtre yoksa None
+    """
+    clauses = [
+        {col: {WHERE_OPERATORS[op]: _metadata_value(value)}}
+        for col, op, value in filters
+        if op in WHERE_OPERATORS
+    ]
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {'$and': clauses}
+
+
+def query_collection_batch(
+    collection,
+    query_embeddings: np.ndarray,
+    n_results: int = 5,
+    where: Optional[Dict] = None
+) -> Dict:
+    """
+    Birden fazla sorguyu tek `collection.query` çağrısıyla cevaplar.
+    
+    Args:
+        collection: ChromaDB collection
+        query_embeddings: (q, boyut) sorgu embedding'leri
+        n_results: Sorgu başına döndürülecek sonuç sayısı
+        where: Metadata ön filtresi (Chroma `where` ifadesi, tüm sorgulara uygulanır)
+        
+    Returns:
+        Dict: Sorgu sonuçları (her anahtar sorgu başına bir liste)
+    """
+    query_embeddings = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+    return collection.query(
+        query_embeddings=query_embeddings,
+        n_results=n_results,
+        where=where
+    )
+
+
 def query_collection(
     collection,
     query_embedding: np.ndarray,
-    n_results: int = 5
+    n_results: int = 5,
+    where: Optional[Dict] = None
 ) -> Dict:
     """
     Collection'dan benzer dökümanları sorgular.
@@ -88,11 +472,104 @@ def query_collection(
         collection: ChromaDB collection
         query_embedding: Sorgu embedding'i
         n_results: Döndürülecek sonuç sayısı
+        where: Metadata ön filtresi (Chroma `where` ifadesi)
         
     Returns:
         Dict: Sorgu sonuçları
     """
-    return collection.query(
-        query_embeddings=[query_embedding.tolist()],
-        n_results=n_results
-    )
\ No newline at end of file
+    return query_collection_batch(
+        collection, np.asarray(query_embedding)[None, :], n_results, where=where
+    )
+
+
+def hybrid_query_batch(
+    collection,
+    query_embeddings: np.ndarray,
+    lexical_index,
+    questions: List[str],
+    n_results: int = 20,
+    candidates: int = 50,
+    rrf_k: int = 60,
+    where: Optional[Dict] = None
+) -> Dict:
+    """
+    Birden fazla soru için vektör (dense) ve BM25 (lexical) aramasını
+    Reciprocal Rank Fusion ile birleştirir.
+    
+    Vektör araması tüm sorular için tek sorguda yapılır. Her sorudan iki
+    yöntemle `candidates` sonuç alınır, RRF ile sıralanır ve ilk
+    `n_results` döndürülür. Sadece BM25'in bulduğu satırlar collection'dan
+    tek seferde id ile çekilir; `where` verilirse bu satırlar birleştirmeden
+    önce aynı filtreden geçer, böylece filtreye uymayan adaylar sonuç
+    listesinde yer kaplamaz.
+    
+    Args:
+        collection: ChromaDB collection
+        query_embeddings: (q, boyut) sorgu embedding'leri
+        lexical_index: Aynı dökümanlar üzerinde kurulmuş BM25Index
+        questions: Kullanıcı soruları (BM25 sorguları), embedding'lerle aynı sırada
+        n_results: Soru başına döndürülecek sonuç sayısı
+        candidates: Her yöntemden alınan aday sayısı
+        rrf_k: RRF sabiti
+        where: Metadata ön filtresi (Chroma `where` ifadesi)
+        
+    Returns:
+        Dict: query_collection_batch ile aynı formatta sonuçlar ({'ids', 'documents', 'metadatas'})
+    """
+    dense = query_collection_batch(collection, query_embeddings, candidates, where=where)
+    found = {}
+    for ids, documents, metadatas in zip(dense['ids'], dense['documents'], dense['metadatas']):
+        found.update(zip(ids, zip(documents, metadatas)))
+    
+    lexical_lists = [lexical_index.search_ids(question, candidates) for question in questions]
+    missing = list(dict.fromkeys(
+        doc_id for lexical_ids in lexical_lists for doc_id in lexical_ids if doc_id not in found
+    ))
+    if missing:
+        fetched = collection.get(ids=missing, where=where, include=["documents", "metadatas"])
+        for doc_id, document, metadata in zip(fetched['ids'], fetched['documents'], fetched['metadatas']):
+            found[doc_id] = (document, metadata)
+    
+    results = {'ids': [], 'documents': [], 'metadatas': []}
+    for dense_ids, lexical_ids in zip(dense['ids'], lexical_lists):
+        lexical_ids = [doc_id for doc_id in lexical_ids if doc_id in found]
+        fused = reciprocal_rank_fusion([dense_ids, lexical_ids], k=rrf_k)[:n_results]
+        ids = [doc_id for doc_id, _ in fused]
+        results['ids'].append(ids)
+        results['documents'].append([found[doc_id][0] for doc_id in ids])
+        results['metadatas'].append([found[doc_id][1] for doc_id in ids])
+    return results
+
+
+def hybrid_query(
+    collection,
+    query_embedding: np.ndarray,
+    lexical_index,
+    question: str,
+    n_results: int = 20,
+    candidates: int = 50,
+    rrf_k: int = 60,
+    where: Optional[Dict] = None
+) -> Dict:
+    """
+    Vektör (dense) ve BM25 (lexical) aramasını Reciprocal Rank Fusion ile birleştirir.
+    
+    Tek soruluk hybrid_query_batch.
+    
+    Args:
+        collection: ChromaDB collection
+        query_embedding: Sorgu embedding'i
+        lexical_index: Aynı dökümanlar üzerinde kurulmuş BM25Index
+        question: Kullanıcı sorusu (BM25 sorgusu)
+        n_results: Döndürülecek sonuç sayısı
+        candidates: Her yöntemden alınan aday sayısı
+        rrf_k: RRF sabiti
+        where: Metadata ön filtresi (Chroma `where` ifadesi)
+        
+    Returns:
+        Dict: query_collection ile aynı formatta sonuçlar ({'ids', 'documents', 'metadatas'})
+    """
+    return hybrid_query_batch(
+        collection, np.asarray(query_embedding)[None, :], lexical_index, [question],
+        n_results=n_results, candidates=candidates, rrf_k=rrf_k, where=where
+    )